@@ -31,6 +31,7 @@ export function BottomNavigation({ activeTab, onTabChange }: BottomNavigationPro
         return (
           <button
             key={tab.id}
+            data-testid={`nav-${tab.id}`}
             onClick={() => onTabChange(tab.id)}
             onMouseEnter={() => setHoveredTab(tab.id)}
             onMouseLeave={() => setHoveredTab(null)}
@@ -72,7 +72,7 @@ export function CoinStreakAnimation({ coins, streak, onCoinClick, onStreakClick
   return (
     <div className="grid grid-cols-2 gap-4">
       {/* Coin Card */}
-      <div className="relative bg-gradient-to-br from-yellow-400 to-orange-500 text-white border-0 shadow-xl hover:shadow-2xl transition-all duration-300 cursor-pointer transform hover:scale-105 overflow-hidden rounded-2xl">
+      <div data-testid="home-coin-card" className="relative bg-gradient-to-br from-yellow-400 to-orange-500 text-white border-0 shadow-xl hover:shadow-2xl transition-all duration-300 cursor-pointer transform hover:scale-105 overflow-hidden rounded-2xl">
         {/* Animated background particles */}
         {showCoinParticles && (
           <div className="absolute inset-0 pointer-events-none">
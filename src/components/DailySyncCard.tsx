@@ -53,7 +53,7 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
     if (step === 3) {
       console.log('DailySyncCard: CONDITION MET - step === 3, should show success screen');
       return (
-        <div className="relative">
+        <div className="relative" data-testid="daily-sync-card">
           <div className="absolute -inset-1 bg-gradient-to-r from-purple-600 to-pink-600 rounded-2xl blur opacity-75"></div>
           <div className="relative bg-gradient-to-r from-purple-600 to-pink-600 text-white border-0 shadow-2xl transform transition-all duration-500 scale-105 rounded-2xl p-6">
           <div className="flex flex-col items-center">
@@ -103,7 +103,7 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
   }
 
   return (
-    <div className="relative">
+    <div className="relative" data-testid="daily-sync-card">
       <div className="absolute -inset-1 bg-gradient-to-r from-purple-400 to-pink-400 rounded-2xl blur opacity-30"></div>
       <div className="relative bg-white/90 backdrop-blur-lg border border-white/50 shadow-xl hover:shadow-2xl transition-all duration-300 rounded-2xl p-6">
         <div className="flex items-center justify-between mb-6">
@@ -141,6 +141,7 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
                 {moodEmojis.map((emoji, index) => (
                   <button
                     key={index}
+                    data-testid="daily-sync-option"
                     onClick={() => setMood(index + 1)}
                     className={`text-3xl p-2 rounded-xl transition-all duration-300 transform hover:scale-110 ${
                       mood === index + 1
@@ -165,6 +166,8 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
               <div className="relative">
                 <input
                   type="range"
+                  data-testid="daily-sync-energy"
+                  aria-label="Energy level"
                   min="1"
                   max="10"
                   value={energy}
@@ -185,6 +188,7 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
             </div>
 
             <button
+              data-testid="daily-sync-next"
               onClick={() => setStep(2)}
               className="w-full bg-gradient-to-r from-purple-600 to-pink-600 hover:from-purple-700 hover:to-pink-700 text-white font-semibold py-3 rounded-xl shadow-lg hover:shadow-xl transform hover:scale-105 transition-all duration-200"
             >
@@ -204,6 +208,7 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
                 {availableTags.map((tag) => (
                   <button
                     key={tag}
+                    data-testid="daily-sync-option"
                     onClick={() => handleTagToggle(tag)}
                     className={`px-4 py-2 rounded-full text-sm font-medium transition-all duration-300 transform hover:scale-105 ${
                       selectedTags.includes(tag)
@@ -219,12 +224,14 @@ export function DailySyncCard({ onCompleteSync, onContinueToPlan }: DailySyncCar
 
             <div className="flex gap-3">
               <button
+                data-testid="daily-sync-back"
                 onClick={() => setStep(1)}
                 className="flex-1 border-gray-300 text-gray-700 hover:bg-gray-50 font-semibold py-3 rounded-xl border"
               >
                 Back
               </button>
               <button
+                data-testid="daily-sync-complete"
                 onClick={handleSubmit}
                 disabled={isAnimating}
                 className="flex-1 bg-gradient-to-r from-purple-600 to-pink-600 hover:from-purple-700 hover:to-pink-700 text-white font-semibold py-3 rounded-xl shadow-lg hover:shadow-xl transform hover:scale-105 transition-all duration-200 disabled:opacity-50"
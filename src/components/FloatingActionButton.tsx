@@ -216,6 +216,7 @@ export function FloatingActionButton({
                   whileTap={{ scale: 0.95 }}
                   onClick={action.onClick}
                   aria-label={action.label}
+                  data-testid={`fab-action-${action.id}`}
                   className={`${action.color} w-12 h-12 rounded-full text-white shadow-lg shadow-current/50 hover:shadow-xl hover:shadow-current/70 transition-all duration-200 flex items-center justify-center transform hover:-translate-y-1 focus:outline-none focus:ring-2 focus:ring-white/50`}
                 >
                   <action.icon className="w-5 h-5 transform transition-transform duration-200" />
@@ -233,6 +234,7 @@ export function FloatingActionButton({
         onClick={() => setIsOpen(!isOpen)}
         aria-label="Toggle actions"
         aria-expanded={isOpen}
+        data-testid="fab-toggle"
         className="bg-gradient-to-r from-purple-600 to-pink-600 w-16 h-16 rounded-full text-white shadow-2xl flex items-center justify-center relative overflow-hidden"
       >
         {/* Animated background effect */}
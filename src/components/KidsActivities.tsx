@@ -1517,7 +1517,7 @@ export function KidsActivities() {
               {/* Progress Summary - Condensed */}
               <div className="grid grid-cols-2 gap-4">
                 <div className="bg-gradient-to-r from-pink-200 to-rose-200 rounded-xl p-4 text-center border border-pink-300">
-                  <div className="text-2xl font-bold text-pink-600 mb-1">{totalKindnessPoints}</div>
+                  <div className="text-2xl font-bold text-pink-600 mb-1" data-testid="kids-kindness-stars">{totalKindnessPoints}</div>
                   <div className="text-sm text-pink-700 font-semibold">Kindness Stars ⭐</div>
                 </div>
                 <div className="bg-white/80 backdrop-blur-sm rounded-xl p-3 text-center border border-orange-200">
@@ -1679,6 +1679,7 @@ export function KidsActivities() {
                     disabled={isLoading}
                     className="bg-gradient-to-r from-emerald-500 to-teal-500 hover:from-emerald-600 hover:to-teal-600 text-white shadow-lg transform hover:scale-105 transition-all duration-300 rounded-xl text-base py-3 px-6 font-semibold min-h-[48px] w-full sm:w-auto touch-manipulation"
                     aria-label="Add your kind act for today"
+                    data-testid="kids-kind-act"
                   >
                     {isLoading ? (
                       <div className="flex items-center gap-2">
@@ -2267,6 +2268,7 @@ export function KidsActivities() {
                 <Button 
                   className="bg-gradient-to-r from-blue-500 to-purple-500 hover:from-blue-600 hover:to-purple-600 text-white shadow-lg transform hover:scale-105 transition-all duration-200 rounded-xl"
                   onClick={startDevelopmentTracking}
+                  data-testid="kids-see-progress"
                 >
                   📈 See My Progress!
                 </Button>
@@ -2415,6 +2417,7 @@ export function KidsActivities() {
                 <div className="grid grid-cols-1 sm:grid-cols-2 gap-3">
                   <Button 
                     className="bg-gradient-to-r from-pink-400 to-rose-400 hover:from-pink-500 hover:to-rose-500 text-white rounded-2xl p-6 h-auto flex flex-col items-center gap-3 shadow-lg transform hover:scale-105 transition-all duration-300 active:scale-95"
+                    data-testid="kids-ask-leela-feelings"
                     onClick={async () => {
                       try {
                         setIsLoading(true);
@@ -2880,6 +2883,7 @@ export function KidsActivities() {
               
               {/* Celebration Button */}
               <Button 
+                data-testid="kids-celebrate"
                 className="bg-gradient-to-r from-yellow-500 to-orange-500 hover:from-yellow-600 hover:to-orange-600 text-white shadow-xl transform hover:scale-105 transition-all duration-300 rounded-2xl text-lg py-4 px-8 font-bold"
                 onClick={async () => {
                   try {
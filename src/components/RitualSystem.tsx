@@ -315,7 +315,7 @@ export function RitualSystem() {
       {/* Active Ritual Modal */}
       {activeRitual && (
         <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/50 backdrop-blur-sm">
-          <div className="w-full max-w-md mx-4 bg-white/95 backdrop-blur-lg border-0 shadow-2xl rounded-2xl">
+          <div role="dialog" aria-label="Active ritual" data-testid="ritual-session" className="w-full max-w-md mx-4 bg-white/95 backdrop-blur-lg border-0 shadow-2xl rounded-2xl">
             <div className="p-6">
               {(() => {
                 const ritual = rituals.find(r => r.id === activeRitual);
@@ -354,12 +354,14 @@ export function RitualSystem() {
                         variant="outline" 
                         onClick={() => setActiveRitual(null)}
                         className="flex-1"
+                        data-testid="ritual-session-pause"
                       >
                         <Pause className="w-4 h-4 mr-1" />
                         Pause
                       </Button>
                       <Button 
                         onClick={completeRitualStep}
+                        data-testid="ritual-session-next"
                         className="flex-1 bg-gradient-to-r from-purple-600 to-pink-600 hover:from-purple-700 hover:to-pink-700 text-white"
                       >
                         {currentStep < ritual.steps.length - 1 ? 'Next Step' : 'Complete Ritual'}
@@ -600,6 +602,7 @@ export function RitualSystem() {
                   <Button 
                     size="sm"
                     onClick={() => startRitual(ritual.id)}
+                    data-testid={`ritual-start-${ritual.id}`}
                     className={`flex-1 ${
                       ritual.completed 
                         ? 'bg-gradient-to-r from-green-500 to-emerald-500 hover:from-green-600 hover:to-emerald-600 text-white'
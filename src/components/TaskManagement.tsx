@@ -549,6 +549,7 @@ export function TaskManagement() {
                         variant="outline"
                         className="border-gray-300 text-gray-700 hover:bg-gray-50"
                         onClick={() => editTask(task.id)}
+                        data-testid="task-edit"
                       >
                         Edit
                       </Button>
@@ -556,6 +557,7 @@ export function TaskManagement() {
                         size="sm"
                         className="bg-gradient-to-r from-green-500 to-emerald-500 hover:from-green-600 hover:to-emerald-600 text-white"
                         onClick={() => startTask(task.id)}
+                        data-testid="task-start"
                       >
                         Start Task
                       </Button>
@@ -669,7 +671,7 @@ export function TaskManagement() {
       {/* Add/Edit Task Modal */}
       {showAddTask && (
         <div className="fixed inset-0 bg-black/50 flex items-center justify-center z-50 p-4">
-          <div className="bg-white rounded-2xl p-6 w-full max-w-md space-y-4">
+          <div role="dialog" aria-label="Add New Task" data-testid="task-dialog" className="bg-white rounded-2xl p-6 w-full max-w-md space-y-4">
             <div className="flex items-center justify-between">
               <h3 className="text-lg font-semibold">Add New Task</h3>
               <Button variant="ghost" size="sm" onClick={() => setShowAddTask(false)}>
@@ -762,12 +764,14 @@ export function TaskManagement() {
                 variant="outline"
                 className="flex-1"
                 onClick={() => setShowAddTask(false)}
+                data-testid="task-dialog-cancel"
               >
                 Cancel
               </Button>
               <Button
                 className="flex-1 bg-gradient-to-r from-purple-600 to-pink-600 hover:from-purple-700 hover:to-pink-700 text-white"
                 onClick={addNewTask}
+                data-testid="task-dialog-save"
               >
                 Add Task
               </Button>
@@ -1,35 +1,25 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.session import standalone_context
+from harness.steps import Steps
+
+# Start signed in (see harness.auth) instead of logging in inside the test
+STORAGE_STATE = "arjun-onboarded"
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -45,38 +35,9 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # Complete onboarding step 1 by clicking 'Next Step' button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click the 'Next Step' button to proceed with onboarding step 2.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Select moods and click 'Complete Sync' to finish onboarding including Balance Compass.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # Onboarding and Daily Sync are already done in the arjun-onboarded snapshot.
         # Click the '+' button at the bottom right to start creating a new micro-offer.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Scroll down to find the Weekly Yagna Loop Plan stage or relevant section to create a micro-offer.
@@ -88,63 +49,39 @@ async def run_test():
         
 
         # Click on the 'Tasks' tab at the bottom navigation to check if Weekly Yagna Loop Plan stage is accessible there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.tasks")
         
 
         # Click on the 'Rituals' tab to check if the Weekly Yagna Loop Plan stage is accessible there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.rituals")
         
 
         # Click the '+' button at the bottom right to check if it allows creating a micro-offer or navigating to Weekly Yagna Loop Plan stage.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the '+' button at the bottom right to open creation options again and look for micro-offer creation or Weekly Yagna Loop Plan navigation.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click on the 'Goals' tab to check if the Weekly Yagna Loop Plan stage or micro-offer creation is accessible there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.goals")
         
 
         # Click the '+' button at the bottom right to open creation options and check if micro-offer creation or Weekly Yagna Loop Plan stage is accessible.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the 'Daily Sync' button (index 27) to check if it leads to Weekly Yagna Loop Plan stage or micro-offer creation.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.daily_sync")
         
 
         # Click the '+' button at the bottom right (index 27) to open creation options and check for micro-offer creation or Weekly Yagna Loop Plan stage.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         assert False, 'Test plan execution failed: micro-offer creation or visibility could not be verified.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
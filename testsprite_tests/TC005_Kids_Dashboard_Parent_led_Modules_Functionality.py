@@ -1,35 +1,26 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.budgets import Budget
+from harness.session import standalone_context
+from harness.steps import Steps
+
+# Kids Dashboard tabs should switch without waiting on the server
+BUDGET = Budget(journey_ms=20_000, step_server_ms=800, lcp_ms=2_500)
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,60 +37,42 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Click on the 'Kids' navigation button to access the Kids Dashboard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("sync.option", nth=1)
         
 
         # Click the button at index 23 to navigate to Kids Dashboard.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[5]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.kids")
         
 
         # Identify and navigate to each of the six parent-led modules within the Kids Dashboard.
         await page.mouse.wheel(0, window.innerHeight)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.tab.todays_fun")
         
 
         # Perform a representative action in 'Today's Fun' module, such as adding a kind act, then verify usage tracking and event logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div[2]/div[2]/div/div/div[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.todays_fun.kind_act")
         
 
         # Navigate to the next parent-led module tab 'My Growth' and perform representative actions to verify functionality and logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.tab.my_growth")
         
 
         # Perform a representative action in 'My Growth' module, such as clicking 'See My Progress!' to verify functionality and event logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div[3]/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.my_growth.see_progress")
         
 
         # Navigate to the next parent-led module tab 'Ask Leela' and perform representative actions to verify functionality and event logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.tab.ask_leela")
         
 
         # Perform a representative action in 'Ask Leela' by clicking the 'Understanding Feelings' button to verify functionality and event logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div[4]/div/div/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.ask_leela.understanding_feelings")
         
 
         # Navigate to the next parent-led module tab 'My Stars' and perform representative actions to verify functionality and event logging.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/main/div/div/div/div[2]/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("kids.tab.my_stars")
         
 
         # Navigate to the next parent-led module tab 'Rituals' or equivalent and perform representative actions to verify functionality and event logging.
@@ -107,30 +80,23 @@ async def run_test():
         
 
         # Perform a representative action in the 'Rituals' module to verify functionality and event logging, then complete the test.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.rituals")
         
 
         # Click the 'Repeat' button for 'Morning Connection' ritual to perform a representative action and verify event logging and UI update.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div[2]/div[2]/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("rituals.morning_connection.repeat", until="rituals.session")
         
 
         # Verify that the ritual action is logged and usage tracked, then complete the task.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div/div/div[4]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("rituals.session.complete")
         
 
         # Verify that all actions across the six parent-led modules are logged and usage tracked, then complete the task.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Assert that the 'Kids Dashboard' page is loaded by checking the presence of the six parent-led modules tabs.
+        frame = context.pages[-1]
         parent_led_modules = ["Today's Fun", "My Growth", "Ask Leela", "My Stars", "Rituals", "Sacred Rituals"]
         for module_name in parent_led_modules:
             module_tab = frame.locator(f"text={module_name}")
@@ -156,15 +122,7 @@ async def run_test():
         coins_earned = frame.locator("xpath=//div[contains(text(),'Sacred Rituals')]/following-sibling::div[contains(text(),'coins earned')]")
         assert await day_streak.is_visible(), "Day streak should be visible in Sacred Rituals section."
         assert await coins_earned.is_visible(), "Coins earned should be visible in Sacred Rituals section."
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
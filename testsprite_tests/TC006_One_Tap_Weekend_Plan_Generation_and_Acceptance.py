@@ -1,35 +1,22 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.session import standalone_context
+from harness.steps import Steps
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,39 +33,23 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Click the button to trigger One-Tap Weekend Planner to generate a weekend plan.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("sync.option")
         
 
         # Try clicking the 'Try Now' button at index 15 to see if it triggers the One-Tap Weekend Planner.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[6]/div[2]/div[2]/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("home.weekend_try_now")
         
 
         # Send the current weekend plan to partner for acceptance.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the option to send the weekend plan to the partner for acceptance.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.add_memory")
         
 
         assert False, 'Test failed: Expected result unknown, forcing failure.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,22 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.session import standalone_context
+from harness.steps import Steps
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,51 +33,31 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Navigate to privacy settings in the app.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("sync.option", nth=2)
         
 
         # Try clicking the 'Profile' button at index 24 to access privacy settings or find another relevant navigation element.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.profile")
         
 
         # Click the Settings button (index 1) to access privacy settings.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div/div[8]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("profile.settings")
         
 
         # Try clicking the Edit Profile button (index 0) to check if privacy or data controls are accessible there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div/div[8]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("profile.edit")
         
 
         # Close Edit Profile modal and look for privacy settings or data sharing controls elsewhere on the Profile page or app.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[5]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("dialog.close")
         
 
         # Click the Settings button (index 1) again to check if privacy settings or data sharing controls are accessible now.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div/div[8]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("profile.settings")
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
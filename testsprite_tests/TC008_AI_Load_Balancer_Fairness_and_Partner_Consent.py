@@ -1,35 +1,26 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.budgets import Budget
+from harness.session import standalone_context
+from harness.steps import Steps
+
+# Task edits and the load balancer are core journeys; keep them snappy
+BUDGET = Budget(journey_ms=30_000, step_server_ms=800, lcp_ms=2_500)
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,63 +37,39 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Navigate to the Tasks section to assign chores unevenly between partners.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("home.coin_card")
         
 
         # Click the 'Tasks' button (index 20) to navigate to the Tasks section.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.tasks")
         
 
         # Assign multiple chores unevenly between partners by editing tasks to create imbalance.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div[2]/div[3]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("tasks.edit", until="tasks.dialog")
         
 
         # Change 'Assigned To' dropdown to 'You' to create uneven chore distribution and save the task.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("tasks.dialog.save", gone="tasks.dialog")
         
 
         # Invoke the Load Balancer to suggest chore reassignment.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the 'AI Coach' button (index 22) to invoke the AI-driven load balancer for chore reassignment suggestions.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.ai_coach")
         
 
         # Click the '+' button (index 20) to open additional actions or options that might include the load balancer or chore reassignment feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the 'AI Coach' button (index 22) to invoke the AI-driven load balancer for chore reassignment suggestions.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.ai_coach")
         
 
         assert False, 'Test plan execution failed: Expected result unknown, generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,25 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.session import standalone_context
+from harness.steps import Steps
+
+# Start signed in (see harness.auth) instead of logging in inside the test
+STORAGE_STATE = "arjun-onboarded"
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -45,28 +35,13 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # Navigate to the 'Together' or 'Couple Loop' section to enable Secret Couple Loop feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click the 'Next Step' button (index 10) to try to complete Daily Sync step 1 of 2 and unlock further navigation options.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
+        # Daily Sync is already done in the arjun-onboarded snapshot.
         # Click on the 'Together' button (index 29) to access the Secret Couple Loop feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.profile")
         
 
         # Click the 'Home' button (index 9) to explore if the Secret Couple Loop feature is accessible from the Home page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.home")
         
 
         # Scroll down to reveal more elements and check if the 'Together' button or Secret Couple Loop feature is accessible further down the page.
@@ -74,57 +49,35 @@ async def run_test():
         
 
         # Click the '+' floating action button (index 19) to check if it opens options for Secret Couple Loop, nudges, or challenges.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Click the 'Add Memory' button (index 20) to check if it leads to Secret Couple Loop or related private intimacy features like nudges or challenges.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.add_memory")
         
 
         # Click the 'Rituals' button (index 22) to check if the Secret Couple Loop feature or related nudges and challenges are accessible there.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.rituals")
         
 
         # Click the 'Start Ritual' button (index 12) for the 'Evening Unwind' ritual to check if it leads to Secret Couple Loop or related private intimacy features.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div[2]/div[2]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("rituals.evening_unwind.start", until="rituals.session")
         
 
         # Close the ritual modal by clicking the 'Pause' button (index 3) to return to the Rituals page and continue searching for Secret Couple Loop feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("rituals.session.pause", gone="rituals.session")
         
 
         # Click the 'Profile' button (index 21) to check for any settings or options to enable or access the Secret Couple Loop feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.profile")
         
 
         # Click the 'Settings' button (index 1) to check for any options related to enabling or accessing the Secret Couple Loop feature.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[2]/div/div[8]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("profile.settings")
         
 
         assert False, 'Test plan execution failed: Secret Couple Loop feature verification failed.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
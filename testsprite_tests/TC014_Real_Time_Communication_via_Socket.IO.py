@@ -1,35 +1,22 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.session import standalone_context
+from harness.steps import Steps
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,124 +33,86 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Open a new tab to log in as the second client (partner) to simulate two clients connected.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[6]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.profile")
         
 
         # Open a new tab and log in as second client with provided credentials.
-        await page.goto('http://localhost:3000/login', timeout=10000)
+        await page.goto('/login', timeout=10000)
         
 
         # Input email and password for second client and click Sign In.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('6304132880')
+        await steps.fill("login.email", '6304132880')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1Snkb@5582')
+        await steps.fill("login.password", '1Snkb@5582')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("login.submit")
         
 
         # Clear invalid email input and enter valid email 'priya@example.com' and password 'password123', then click Sign In.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await steps.fill("login.email", '')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('priya@example.com')
+        await steps.fill("login.email", 'priya@example.com')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await steps.fill("login.password", '')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await steps.fill("login.password", 'password123')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("login.submit", api='/api/auth/callback/credentials')
         
 
         # Use 'Demo Login (Arjun & Priya)' button to log in both clients as partners for testing real-time updates.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("login.demo", api='/api/auth/callback/credentials')
         
 
         # Try 'Skip Sign In (Demo Mode)' button to enter demo mode and simulate two clients connected for real-time update testing.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("login.skip")
         
 
         # Open a new tab and navigate to the app URL to simulate second client in demo mode.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Open a new tab and navigate to the app URL to simulate second client in demo mode.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Open a new tab to simulate second client session in demo mode and navigate to the app URL.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Open a new tab to simulate second client session in demo mode and navigate to the app URL.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Open a new tab to simulate second client session in demo mode and navigate to the app URL.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Open a new tab or window to simulate second client session in demo mode and navigate to the app URL.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await page.goto('/login', timeout=10000)
         
 
         # Input email 'arjun@example.com' and password 'password123' for first client and click Sign In.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('arjun@example.com')
+        await steps.fill("login.email", 'arjun@example.com')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await steps.fill("login.password", 'password123')
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("login.submit", api='/api/auth/callback/credentials')
         
 
         assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,35 +1,37 @@
 import asyncio
 from playwright import async_api
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+from harness.checks import Checks
+from harness.matrix import LANDSCAPE, PORTRAIT, Viewport
+from harness.session import standalone_context
+from harness.steps import Steps
+
+COMPONENTS = ("#home-hub", "#balance-compass", "#dashboards")
+
+
+async def check_viewport(page, viewport):
+    """Primary components visible and interactive; stacked on phones held upright, side by side otherwise.
+
+    Also run on every device profile at once by ``python -m harness matrix``.
+    """
+    buttons = tuple(f"{component} button" for component in COMPONENTS)
+    axis = "y" if viewport.is_mobile and not viewport.landscape else "x"
+    await Checks(page).visible(*COMPONENTS).enabled(*buttons).no_overlap(*COMPONENTS, axis=axis).verify()
+
+
+async def run_test(context=None):
+    # Use the runner's pooled context, or launch a private browser when run directly
+    async with standalone_context(context) as context:
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+
+        # Drive every action through condition-based waits instead of fixed sleeps
+        steps = Steps(page)
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto("/", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,132 +48,75 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         await page.mouse.wheel(0, window.innerHeight)
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.tasks")
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.home")
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.goals")
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
         # Simulate mobile portrait orientation and verify UI components render and respond correctly.
-        await page.goto('http://localhost:3000/', timeout=10000)
+        await page.goto('/', timeout=10000)
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("nav.home")
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("fab.toggle")
         
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[2]/div/div/div[3]/div/div[2]/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click("sync.energy")
         
 
         # Assert that primary UI components are visible and interactive on desktop resolution
-        await expect(page.locator('#home-hub')).to_be_visible()
-        await expect(page.locator('#balance-compass')).to_be_visible()
-        await expect(page.locator('#dashboards')).to_be_visible()
-        await expect(page.locator('#home-hub button')).to_be_enabled()
-        await expect(page.locator('#balance-compass button')).to_be_enabled()
-        await expect(page.locator('#dashboards button')).to_be_enabled()
-        # Assert layout is correct by checking bounding boxes do not overlap
-        home_hub_box = await page.locator('#home-hub').bounding_box()
-        balance_compass_box = await page.locator('#balance-compass').bounding_box()
-        dashboards_box = await page.locator('#dashboards').bounding_box()
-        assert home_hub_box is not None and balance_compass_box is not None and dashboards_box is not None
-        assert home_hub_box['x'] + home_hub_box['width'] <= balance_compass_box['x'] or balance_compass_box['x'] + balance_compass_box['width'] <= home_hub_box['x']
-        assert balance_compass_box['x'] + balance_compass_box['width'] <= dashboards_box['x'] or dashboards_box['x'] + dashboards_box['width'] <= balance_compass_box['x']
+        await check_viewport(page, Viewport("desktop", PORTRAIT, 1280, 720, is_mobile=False))
         # Simulate mobile portrait orientation and verify UI components render and respond correctly
         await page.set_viewport_size({'width': 375, 'height': 667})
-        await page.reload()
-        await expect(page.locator('#home-hub')).to_be_visible()
-        await expect(page.locator('#balance-compass')).to_be_visible()
-        await expect(page.locator('#dashboards')).to_be_visible()
-        await expect(page.locator('#home-hub button')).to_be_enabled()
-        await expect(page.locator('#balance-compass button')).to_be_enabled()
-        await expect(page.locator('#dashboards button')).to_be_enabled()
-        # Check layout adaptation by verifying components stack vertically
-        home_hub_box_mobile = await page.locator('#home-hub').bounding_box()
-        balance_compass_box_mobile = await page.locator('#balance-compass').bounding_box()
-        dashboards_box_mobile = await page.locator('#dashboards').bounding_box()
-        assert home_hub_box_mobile is not None and balance_compass_box_mobile is not None and dashboards_box_mobile is not None
-        assert home_hub_box_mobile['y'] + home_hub_box_mobile['height'] <= balance_compass_box_mobile['y'] or balance_compass_box_mobile['y'] + balance_compass_box_mobile['height'] <= home_hub_box_mobile['y']
-        assert balance_compass_box_mobile['y'] + balance_compass_box_mobile['height'] <= dashboards_box_mobile['y'] or dashboards_box_mobile['y'] + dashboards_box_mobile['height'] <= balance_compass_box_mobile['y']
+        async with steps.profile("home.reload@375x667"):
+            await page.reload()
+        await check_viewport(page, Viewport("mobile", PORTRAIT, 375, 667, is_mobile=True))
         # Simulate mobile landscape orientation and verify UI components render and respond correctly
         await page.set_viewport_size({'width': 667, 'height': 375})
-        await page.reload()
-        await expect(page.locator('#home-hub')).to_be_visible()
-        await expect(page.locator('#balance-compass')).to_be_visible()
-        await expect(page.locator('#dashboards')).to_be_visible()
-        await expect(page.locator('#home-hub button')).to_be_enabled()
-        await expect(page.locator('#balance-compass button')).to_be_enabled()
-        await expect(page.locator('#dashboards button')).to_be_enabled()
-        # Check layout adaptation by verifying components stack horizontally or adapt properly
-        home_hub_box_landscape = await page.locator('#home-hub').bounding_box()
-        balance_compass_box_landscape = await page.locator('#balance-compass').bounding_box()
-        dashboards_box_landscape = await page.locator('#dashboards').bounding_box()
-        assert home_hub_box_landscape is not None and balance_compass_box_landscape is not None and dashboards_box_landscape is not None
-        # They should not overlap horizontally
-        assert home_hub_box_landscape['x'] + home_hub_box_landscape['width'] <= balance_compass_box_landscape['x'] or balance_compass_box_landscape['x'] + balance_compass_box_landscape['width'] <= home_hub_box_landscape['x']
-        assert balance_compass_box_landscape['x'] + balance_compass_box_landscape['width'] <= dashboards_box_landscape['x'] or dashboards_box_landscape['x'] + dashboards_box_landscape['width'] <= balance_compass_box_landscape['x']
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        async with steps.profile("home.reload@667x375"):
+            await page.reload()
+        await check_viewport(page, Viewport("mobile", LANDSCAPE, 667, 375, is_mobile=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
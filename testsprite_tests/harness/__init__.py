@@ -0,0 +1,46 @@
+"""Shared harness for the TestSprite TC scripts.
+
+Run the whole suite from ``testsprite_tests/`` with ``python -m harness run``.
+Signed-in storage-state snapshots are kept under ``testsprite_tests/.auth/``.
+"""
+
+from .auth import PROFILES, AuthProfile, AuthStore
+from .checks import Checks, ChecksFailed
+from .locators import LOCATORS, LocatorRegistry, LocatorSpec, StaleLocatorError
+from .plan import PlanExecutor, PlanStepRegistry, load_plan
+from .pool import BrowserPool
+from .redis_standin import RedisStandIn
+from .runner import Backend, TestCase, TestResult, discover, run_suite
+from .session import BASE_URL, standalone_context
+from .sio import SocketClient
+from .steps import BudgetExceeded, Steps
+from .trace import TraceWriter, summarize_lines
+
+__all__ = [
+    "BASE_URL",
+    "LOCATORS",
+    "PROFILES",
+    "AuthProfile",
+    "AuthStore",
+    "Backend",
+    "BrowserPool",
+    "BudgetExceeded",
+    "Checks",
+    "ChecksFailed",
+    "LocatorRegistry",
+    "LocatorSpec",
+    "PlanExecutor",
+    "PlanStepRegistry",
+    "RedisStandIn",
+    "SocketClient",
+    "StaleLocatorError",
+    "Steps",
+    "TestCase",
+    "TestResult",
+    "TraceWriter",
+    "discover",
+    "load_plan",
+    "run_suite",
+    "standalone_context",
+    "summarize_lines",
+]
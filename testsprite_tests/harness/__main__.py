@@ -0,0 +1,1013 @@
+"""Command line entry point: ``python -m harness <command>`` from ``testsprite_tests/``."""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .accounts import FAULTS, AccountConfig, Timing, run_accounts, summarize_timings
+from .auth import PROFILES as AUTH_PROFILES
+from .bundles import THROTTLING, BundleConfig, run_bundles
+from .bundles import compare as compare_bundles
+from .couples import BenchConfig, capacity, load_roster, redis_cost, run_stage
+from .databases import DatabaseClone, clone_all, default_database_url, template_for
+from .drain import PRIORITIES, DrainConfig, parse_mix, run_drain
+from .impact import IMPACT_PATH, ImpactIndex, changed_files, default_since
+from .lighthouse import LIGHTHOUSE_BUDGET, LighthouseBudget
+from .load import MIXES, LoadConfig, run_load
+from .locators import LOCATORS
+from .matrix import DEVICES, ORIENTATIONS, matrix_cases, run_matrix, select_devices, write_report
+from .plan import PLAN_PATH, PlanCase, PlanExecutor, load_plan
+from .plan_steps import EXCLUDED, PLAN_STEPS
+from .pool import BrowserPool
+from .proxy import FAULT_PROFILES, FaultProxy, load_profile
+from .pwa import DEFAULT_ROUTES, DEFAULT_SW, PHASES, PwaConfig, run_pwa
+from .pwa import compare as compare_pwa
+from .redis_standin import RedisStandIn
+from .render import RenderProfiler
+from .redis_standin import serve as serve_redis
+from .runner import FAILURES_DIR, RECORD, REPLAY, Backend, TestCase, TestResult, discover, run_suite
+from .session import BASE_URL
+from .shards import (DURATIONS_PATH, load_durations, merge_results, parse_shard, plan_shards, update_durations,
+                     write_results)
+from .soak import SoakConfig, run_soak
+from .stack import LocalStack, local_stack
+from .stats import format_table
+from .synth import SynthConfig, parse_rates, synthesize
+from .trace import SUMMARY_FILE, TraceWriter, compare
+
+
+def _split_ids(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _print_results(results: List[TestResult]) -> int:
+    """Print one line per result plus a summary; return the exit code."""
+    for result in results:
+        print(f"{result.case.id:<6} {result.status:<7} {result.duration:7.2f}s  {result.case.name}")
+        if result.error:
+            print("       " + result.error.strip().replace("\n", "\n       "))
+        elif result.details.get("over_budget"):
+            print("       over budget (not enforced): " + "; ".join(result.details["over_budget"]))
+        if result.details.get("cassette_misses"):
+            print("       not in cassette: " + ", ".join(sorted(set(result.details["cassette_misses"]))))
+    failed = sum(1 for result in results if not result.ok)
+    print(f"\n{len(results) - failed} passed, {failed} failed")
+    return 1 if failed else 0
+
+
+def _print_lighthouse(budget: Optional[LighthouseBudget], results: List[TestResult]) -> None:
+    if budget is None:
+        return
+    states = [state for result in results for state in result.details.get("lighthouse", {}).get("states", [])]
+    over = sum(1 for state in states if state["violations"])
+    print(f"\n{budget.source}: {len(states)} states checked, {over} over budget")
+    if budget.unsupported():
+        print("  not measured by the harness: " + ", ".join(budget.unsupported()))
+
+
+def _print_stale_locators(report_path: Optional[str]) -> None:
+    stale = LOCATORS.stale()
+    if stale:
+        print("\nStale locators:")
+        for name, reason in stale.items():
+            print(f"  {name:<40} {reason}")
+    if report_path:
+        with open(report_path, "w") as fh:
+            json.dump({"resolutions": LOCATORS.report(), "stale": stale}, fh, indent=2)
+
+
+def _print_trace(trace_dir: Optional[str], top: int = 5) -> None:
+    if not trace_dir:
+        return
+    with open(Path(trace_dir) / SUMMARY_FILE) as fh:
+        summary = json.load(fh)
+    print(f"\nTrace written to {trace_dir}/")
+    for title, rows in (("Slowest steps", summary["steps"]), ("Slowest API routes", summary["api_routes"])):
+        if rows:
+            print(f"  {title} (total ms):")
+            for name, row in list(rows.items())[:top]:
+                print(f"    {row['total_ms']:>10.0f}  {name}")
+
+
+def _select_changed(cases: List[TestCase], index: ImpactIndex, since: Optional[str]) -> List[TestCase]:
+    since = since or default_since()
+    changed = changed_files(since)
+    reasons = index.select([case.id for case in cases], changed)
+    print(f"{len(changed)} file(s) changed since {since}; {len(reasons)} of {len(cases)} case(s) affected")
+    for case_id, reason in reasons.items():
+        print(f"  {case_id:<6} {reason}")
+    uncovered = index.uncovered(changed)
+    if uncovered:
+        print(f"  no case covers: {', '.join(uncovered[:5])}" + (" ..." if len(uncovered) > 5 else ""))
+    return [case for case in cases if case.id in reasons]
+
+
+def _print_render(report: Dict[str, Any], directory: str, top: int = 10) -> None:
+    print(f"\nRender profile written to {directory}/ (CPU throttle {report['cpu_throttle']:g}x)")
+    print(f"  {'step':<40} {'runs':>4} {'long':>5} {'TBT ms':>8} {'script':>8} {'style':>7} {'layout':>7} {'dropped':>7}")
+    for step, row in list(report["steps"].items())[:top]:
+        print(f"  {step[:40]:<40} {row['runs']:>4} {row['long_tasks']:>5} {row['max_blocking_ms']:>8.0f} "
+              f"{row['scripting_ms']:>8.0f} {row['style_ms']:>7.0f} {row['layout_ms']:>7.0f} {row['dropped_frames']:>7}")
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cases = discover(select=_split_ids(args.select))
+    index = ImpactIndex.load(Path(args.impact_index)) if args.impact or args.changed else None
+    if args.changed:
+        try:
+            cases = _select_changed(cases, index, args.since)
+        except RuntimeError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        if not cases:
+            return 0
+    if args.shard:
+        try:
+            shard, shards = parse_shard(args.shard)
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        plan = plan_shards(cases, shards, load_durations(Path(args.durations)))
+        cases = plan[shard - 1].cases
+        print(f"Shard {shard}/{shards}: {', '.join(case.id for case in cases) or 'nothing'} "
+              f"(~{plan[shard - 1].seconds:.0f}s expected)")
+    if not cases and args.shard:
+        if args.results:
+            write_results(Path(args.results), [], shard=args.shard)
+        return 0  # more shards than cases
+    if not cases:
+        print("No test cases matched.", file=sys.stderr)
+        return 2
+
+    try:
+        lighthouse = LighthouseBudget.load(Path(args.lighthouse)) if args.lighthouse else None
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Cannot read Lighthouse budget {args.lighthouse}: {exc}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    render = RenderProfiler(_split_ids(args.render_steps) or ["*"], args.cpu_throttle) if args.render else None
+    results = asyncio.run(_run_suite(
+        args,
+        cases,
+        workers=args.workers,
+        browsers=args.browsers,
+        headless=not args.headed,
+        use_auth=not args.no_auth,
+        trace_dir=Path(args.trace) if args.trace else None,
+        enforce_budgets=not args.no_budgets,
+        cassettes=RECORD if args.record else REPLAY if args.replay else None,
+        failures_dir=Path(args.failures),
+        full_trace=args.full_trace,
+        impact=index,
+        render=render,
+        lighthouse=lighthouse,
+    ))
+
+    code = _print_results(results)
+    dumped = [result.case.id for result in results if not result.ok and (Path(args.failures) / result.case.id).exists()]
+    if dumped:
+        print(f"Last steps of {', '.join(dumped)} written to {args.failures}/")
+    _print_trace(args.trace)
+    if render is not None:
+        _print_render(render.write(Path(args.render)), args.render)
+    _print_lighthouse(lighthouse, results)
+    _print_stale_locators(args.locator_report)
+    if args.results:
+        write_results(Path(args.results), results, shard=args.shard or "", wall_clock=time.perf_counter() - started)
+    return code
+
+
+async def _run_suite(args: argparse.Namespace, cases: List[TestCase], **options) -> List[TestResult]:
+    """:func:`run_suite`; with ``--fresh-db`` every worker gets a server of its own on its own clone."""
+    if not args.fresh_db:
+        return await run_suite(cases, **options)
+    template = template_for(args.database_url)
+    ports = [args.port + worker for worker in range(max(1, min(options["workers"], len(cases))))]
+    async with AsyncExitStack() as stack:
+        auth_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="tc-auth-")))
+        workers = [await stack.enter_async_context(AsyncExitStack()) for _ in ports]
+
+        async def start(worker: AsyncExitStack, port: int) -> Backend:
+            clone = await worker.enter_async_context(template.lease(f"run-{port}"))
+            log = f"{args.server_log}.{port}" if args.server_log else None
+            env = {"DATABASE_URL": clone.url, "NEXTAUTH_URL": f"http://127.0.0.1:{port}"}
+            local = await worker.enter_async_context(local_stack(port=port, env=env, log_path=log))
+            return Backend(local.base_url, clone, auth_dir / str(port))
+
+        # Let every server finish starting before a failure unwinds them all.
+        started = await asyncio.gather(*(start(worker, port) for worker, port in zip(workers, ports)),
+                                       return_exceptions=True)
+        for outcome in started:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return await run_suite(cases, backends=started, **options)
+
+
+def cmd_matrix(args: argparse.Namespace) -> int:
+    cases = matrix_cases(discover(select=_split_ids(args.select)))
+    try:
+        devices = select_devices(_split_ids(args.devices))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    if not cases:
+        print("No test cases define check_viewport.", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(run_matrix(
+        cases,
+        devices,
+        orientations=_split_ids(args.orientations),
+        workers=args.workers,
+        browsers=args.browsers,
+        headless=not args.headed,
+        use_auth=not args.no_auth,
+        base_url=args.base_url,
+    ))
+    wall_clock = time.perf_counter() - started
+    for result in results:
+        overflow = f"  scrolls sideways by {result.overflow_x}px" if result.overflow_x else ""
+        print(f"{result.case:<6} {result.status:<7} {result.duration:6.2f}s  {result.viewport.label:<30}"
+              f" {result.viewport.orientation}{overflow}")
+        if result.error:
+            print("       " + result.error.strip().replace("\n", "\n       "))
+    failed = sum(1 for result in results if not result.ok)
+    print(f"\n{len(results) - failed} passed, {failed} failed; "
+          f"wall clock {wall_clock:.1f}s (serial {sum(result.duration for result in results):.1f}s)")
+    if args.json:
+        write_report(Path(args.json), results, wall_clock)
+    return 1 if failed else 0
+
+
+def cmd_impact(args: argparse.Namespace) -> int:
+    index = ImpactIndex.load(Path(args.impact_index))
+    try:
+        _select_changed(discover(), index, args.since)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    return 0
+
+
+def cmd_merge(args: argparse.Namespace) -> int:
+    cases = [case.id for case in discover(select=_split_ids(args.select))]
+    try:
+        results, wall_clocks = merge_results([Path(path) for path in args.results], args.shards or len(args.results),
+                                             cases)
+    except ValueError as exc:
+        print(f"merge: {exc}", file=sys.stderr)
+        return 2
+    code = _print_results(results)
+    for shard, seconds in sorted(wall_clocks.items()):
+        print(f"  shard {shard:<8} {seconds:8.1f}s")
+    if wall_clocks:
+        print(f"Wall clock {max(wall_clocks.values()):.1f}s (serial {sum(r.duration for r in results):.1f}s)")
+    if args.json:
+        write_results(Path(args.json), results, wall_clock=max(wall_clocks.values(), default=0.0))
+    if not args.no_update:
+        update_durations(results, Path(args.durations))
+    return code
+
+
+async def _run_plan(cases: List[PlanCase], args: argparse.Namespace) -> List[TestResult]:
+    async with BrowserPool(args.browsers, headless=not args.headed) as pool:
+        trace = TraceWriter(Path(args.trace), started=time.time()) if args.trace else None
+        executor = PlanExecutor(pool, PLAN_STEPS, trace=trace)
+        results = await executor.run(cases, workers=args.workers)
+    if trace is not None:
+        trace.close()
+    return results
+
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    cases = load_plan(Path(args.plan), select=_split_ids(args.select))
+    for case in cases:
+        if case.id in EXCLUDED:
+            print(f"{case.id:<6} left to its TC script: {EXCLUDED[case.id]}", file=sys.stderr)
+    cases = [case for case in cases if case.id not in EXCLUDED]
+    if args.check:
+        missing = PLAN_STEPS.unmatched(cases)
+        for case_id, step in missing:
+            print(f"{case_id:<6} {step.type:<9} {step.description}")
+        print(f"\n{len(missing)} step(s) without an implementation")
+        return 1 if missing else 0
+    if not cases:
+        print("No test cases matched.", file=sys.stderr)
+        return 2
+
+    code = _print_results(asyncio.run(_run_plan(cases, args)))
+    _print_trace(args.trace)
+    _print_stale_locators(args.locator_report)
+    return code
+
+
+async def _spawn(stack: AsyncExitStack, args: argparse.Namespace, env: Optional[Dict[str, str]] = None) -> LocalStack:
+    """Start ``server.ts`` for ``--spawn-server``, on its own database clone with ``--fresh-db``."""
+    env = dict(env or {})
+    if args.fresh_db:
+        clone = await stack.enter_async_context(template_for(args.database_url).lease(f"bench-{args.port}"))
+        env["DATABASE_URL"] = args.database_url = clone.url
+    return await stack.enter_async_context(local_stack(port=args.port, env=env, log_path=args.server_log))
+
+
+async def _server(stack: AsyncExitStack, args: argparse.Namespace, config: Union[BenchConfig, LoadConfig]) -> Optional[RedisStandIn]:
+    """Point ``config`` at ``--base-url``, or at a spawned server whose Redis stand-in is returned."""
+    if not args.spawn_server:
+        return None
+    local = await _spawn(stack, args)
+    config.base_url, config.secret = local.base_url, local.secret
+    return local.redis
+
+
+async def _run_sockets(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    couples = load_roster(Path(args.roster))
+    config = BenchConfig(
+        base_url=args.base_url,
+        rounds=args.rounds,
+        interval=args.interval,
+        timeout=args.timeout,
+        connect_concurrency=args.connect_concurrency,
+    )
+    stages = []
+    async with AsyncExitStack() as stack:
+        redis = await _server(stack, args, config)
+        for size in [int(item) for item in _split_ids(args.couples)]:
+            if size > len(couples):
+                print(f"roster has {len(couples)} complete couples; running {len(couples)} instead of {size}",
+                      file=sys.stderr)
+                size = len(couples)
+            if redis is not None:
+                redis.reset_counters()
+            stage = await run_stage(config, couples[:size])
+            if redis is not None:
+                stage["redis_per_event"] = redis_cost(redis.commands, stage)
+            stages.append(stage)
+            print(f"\n{stage['couples']} couples ({stage['joined']} joined) in {stage['elapsed_s']:.1f}s")
+            print(format_table(stage["events"]))
+    return stages
+
+
+def cmd_sockets(args: argparse.Namespace) -> int:
+    stages = asyncio.run(_run_sockets(args))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"stages": stages}, fh, indent=2)
+    best = capacity(stages, args.max_p99_ms)
+    if best is None:
+        print(f"\nNo stage kept every event under p99 {args.max_p99_ms:g} ms without errors")
+        return 1
+    print(f"\nLargest clean stage under p99 {args.max_p99_ms:g} ms: {best} couples")
+    return 0
+
+
+async def _run_soak(args: argparse.Namespace) -> Dict[str, Any]:
+    couples = load_roster(Path(args.roster))[:args.couples]
+    config = SoakConfig(
+        base_url=args.base_url,
+        timeout=args.timeout,
+        connect_concurrency=args.connect_concurrency,
+        heartbeat_interval=args.heartbeat_interval,
+        warmup=args.warmup,
+        storms=args.storms,
+        storm_interval=args.storm_interval,
+        drop_fraction=args.drop_fraction,
+        drop_mode=args.drop_mode,
+        reconnect_jitter=args.reconnect_jitter,
+        settle=args.settle,
+        seed=args.seed,
+    )
+    async with AsyncExitStack() as stack:
+        redis = await _server(stack, args, config)
+        return await run_soak(config, couples, redis)
+
+
+def cmd_soak(args: argparse.Namespace) -> int:
+    report = asyncio.run(_run_soak(args))
+    print(f"{report['connected']}/{report['sockets']} sockets connected")
+    for storm in report["storms"]:
+        print(f"\nStorm {storm['storm']}: {storm['rejoined']}/{storm['dropped']} rejoined in {storm['elapsed_s']:.1f}s")
+        print(format_table(storm["events"]))
+        redis = storm.get("redis")
+        if redis:
+            writes = ", ".join(f"{name}={count}" for name, count in redis["hash_writes"].items())
+            print(f"hash writes: {writes or 'none'}")
+            print(f"hash sizes: {redis['sizes_before']} -> {redis['sizes_after']}; "
+                  f"room mismatches: {redis['room_mismatches']}")
+    print("\nWhole run:")
+    print(format_table(report["events"]))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    failed = any(entry.get("errors") for entry in report["events"].values()) or any(
+        storm.get("redis", {}).get("room_mismatches") for storm in report["storms"])
+    return 1 if failed else 0
+
+
+async def _run_load(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    config = LoadConfig(
+        base_url=args.base_url,
+        duration=args.duration,
+        couples=args.couples,
+        max_connections=args.connections,
+        max_inflight=args.max_inflight,
+        timeout=args.timeout,
+        mix=list(MIXES[args.mix]),
+        seed=args.seed,
+    )
+    stages = []
+    async with AsyncExitStack() as stack:
+        await _server(stack, args, config)
+        for rate in [float(item) for item in _split_ids(args.rate)]:
+            config.rate = rate
+            stage = await run_load(config)
+            stages.append(stage)
+            print(f"\n{rate:g} req/s offered: {stage['throughput_rps']:g} req/s ok, "
+                  f"error rate {stage['error_rate']:.2%} over {stage['elapsed_s']:.1f}s"
+                  + (f", {stage['skipped']} skipped with nothing to send" if stage["skipped"] else ""))
+            print(format_table(stage["routes"]))
+    return stages
+
+
+def cmd_load(args: argparse.Namespace) -> int:
+    stages = asyncio.run(_run_load(args))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"mix": args.mix, "stages": stages}, fh, indent=2)
+    failed = [stage for stage in stages if stage["error_rate"] > args.max_error_rate]
+    return 1 if failed else 0
+
+
+async def _run_db(args: argparse.Namespace) -> None:
+    template = template_for(args.database_url)
+    try:
+        if args.action == "build":
+            print(await template.build())
+        elif args.action == "drop":
+            for name in args.names:
+                await DatabaseClone(name, "", template).drop()
+        else:
+            # Cloning over an existing clone is its reset.
+            for name, clone in (await clone_all(template, args.names)).items():
+                print(f"{name}\t{clone.url}")
+    finally:
+        await template.close()
+
+
+def cmd_db(args: argparse.Namespace) -> int:
+    if args.action != "build" and not args.names:
+        print(f"db {args.action} needs at least one clone name", file=sys.stderr)
+        return 2
+    asyncio.run(_run_db(args))
+    return 0
+
+
+async def _run_synth(args: argparse.Namespace, config: SynthConfig, **options) -> Dict[str, Any]:
+    """Fill ``--database-url``, or a fresh clone of the seeded template under .databases/."""
+    if args.database_url is not None or args.dry_run:
+        return await synthesize(config, args.database_url or "", **options)
+    template = template_for(default_database_url())
+    try:
+        clone = await template.clone(f"synth-{args.prefix}")
+    finally:
+        await template.close()
+    print(f"Filling {clone.url}", flush=True)
+    return await synthesize(config, clone.url, scratch=True, **options)
+
+
+def cmd_synth(args: argparse.Namespace) -> int:
+    try:
+        rates = parse_rates(args.rate or [])
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    config = SynthConfig(couples=args.couples, years=args.years, heavy_share=args.heavy_share, rates=rates,
+                         batch=args.batch, seed=args.seed, start=args.start, prefix=args.prefix)
+
+    def progress(state: Dict[str, Any]) -> None:
+        print(f"  {state['couples']:>10} couples {state['rows']:>12} rows {state['rows_per_s']:>9} rows/s", flush=True)
+
+    roster = open(args.roster, "w") if args.roster else None
+    try:
+        report = asyncio.run(_run_synth(args, config, roster=roster, dry_run=args.dry_run, progress=progress))
+    finally:
+        if roster is not None:
+            roster.close()
+    for table, count in report["tables"].items():
+        print(f"  {table:<22} {count:>12}")
+    for skipped in report["skipped"]:
+        print(f"  skipped {skipped}")
+    size = f", database now {report['size_bytes'] / 2**20:.0f} MiB" if report["size_bytes"] is not None else ""
+    print(f"{report['rows']} rows for {report['couples']} couples in {report['elapsed_s']:.1f}s "
+          f"({report['rows_per_s']} rows/s){size}")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+def _print_timing(timing: Timing) -> None:
+    ttfb = f"{timing.ttfb_ms:>9.0f}" if timing.ttfb_ms is not None else f"{'-':>9}"
+    total = f"{timing.total_ms:>9.0f}" if timing.total_ms is not None else f"{'-':>9}"
+    growth = f"{timing.rss_growth_mb:>8.1f}" if timing.rss_growth_mb is not None else f"{'-':>8}"
+    print(f"  {timing.years:>5g}y {timing.rows:>9} {timing.operation:<24} {timing.fault or '-':<5} "
+          f"{timing.outcome:<10} {ttfb} {total} {timing.bytes:>11} {growth}", flush=True)
+
+
+async def _run_accounts(args: argparse.Namespace) -> List[Timing]:
+    config = AccountConfig(
+        base_url=args.base_url,
+        database_url=args.database_url,
+        years=[float(item) for item in _split_ids(args.years)],
+        repeats=args.repeats,
+        faults=_split_ids(args.faults),
+        fault_after=args.fault_after,
+        fault_hold=args.fault_hold,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    async with AsyncExitStack() as stack:
+        if args.spawn_server:
+            env = {"NODE_OPTIONS": f"--max-old-space-size={args.server_heap_mb}"} if args.server_heap_mb else {}
+            local = await _spawn(stack, args, env)
+            config.base_url, config.secret, config.server_pid = local.base_url, local.secret, local.process.pid
+            config.database_url = args.database_url
+        print("POST /api/user/delete only queues the deletion for now, so its timings do not depend on account size.")
+        print(f"  {'size':>6} {'rows':>9} {'operation':<24} {'fault':<5} {'outcome':<10} "
+              f"{'TTFB ms':>9} {'total ms':>9} {'bytes':>11} {'RSS +MB':>8}")
+        return await run_accounts(config, progress=_print_timing)
+
+
+def cmd_accounts(args: argparse.Namespace) -> int:
+    unknown = [fault for fault in _split_ids(args.faults) if fault not in FAULTS]
+    if unknown:
+        print(f"unknown fault(s) {', '.join(unknown)}; known: {', '.join(FAULTS)}", file=sys.stderr)
+        return 2
+    try:
+        timings = asyncio.run(_run_accounts(args))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except sqlite3.Error as exc:
+        print(f"cannot grow the accounts in {args.database_url}: {exc}", file=sys.stderr)
+        return 2
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"timings": summarize_timings(timings)}, fh, indent=2)
+    # Faults are expected to fail requests; a clean run that fails, or any crash, is a finding.
+    broken = [timing for timing in timings
+              if timing.outcome == "crash" or (timing.fault is None and timing.outcome != "ok")]
+    return 1 if broken else 0
+
+
+def cmd_drain(args: argparse.Namespace) -> int:
+    try:
+        mix = parse_mix(args.mix or [])
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    config = DrainConfig(actions=args.actions, mix=mix, rounds=args.rounds, offline_for=args.offline_for,
+                         reconnect_wait=args.reconnect_wait, kick=args.kick, app_ids=args.app_ids,
+                         settle=args.settle, timeout=args.timeout, seed=args.seed, base_url=args.base_url,
+                         headless=not args.headed)
+
+    def progress(result: Dict[str, Any]) -> None:
+        if "error" in result:
+            print(f"round {result['round']}: {result['error']}", flush=True)
+            return
+        how = "itself" if result["self_reconnected"] else "when told"
+        print(f"round {result['round']}: {result['received']}/{result['actions']} received, {result['lost']} lost, "
+              f"{result['duplicates']} duplicate(s), {result['id_collisions']} id collision(s); reconnected {how} "
+              f"in {result['reconnect_ms']} ms, first item {result['first_item_ms']} ms, drain {result['drain_ms']} ms "
+              f"({result['items_per_s']}/s), {result['priority_inversions']} priority inversion(s)", flush=True)
+
+    report = asyncio.run(run_drain(config, progress))
+    if report["worker"]["load_error"]:
+        print(f"{report['worker']['path']} does not load in the browser ({report['worker']['load_error']}); "
+              f"measured a type-stripped copy")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    summary = report["summary"]
+    # Anything posted offline that never arrives, or arrives twice, is a finding.
+    return 1 if summary["lost"] or summary["duplicates"] or len(report["rounds"]) > summary["self_reconnected"] else 0
+
+
+def cmd_pwa(args: argparse.Namespace) -> int:
+    if args.profile and args.profile not in AUTH_PROFILES:
+        print(f"unknown auth profile {args.profile!r}; known: {', '.join(AUTH_PROFILES)}", file=sys.stderr)
+        return 2
+    config = PwaConfig(routes=_split_ids(args.routes) or list(DEFAULT_ROUTES),
+                       service_worker=None if args.sw == "none" else args.sw, profile=args.profile,
+                       sw_timeout=args.sw_timeout, base_url=args.base_url, headless=not args.headed)
+
+    def progress(result: Dict[str, Any]) -> None:
+        sw = result["phases"]["cold"].get("service_worker") or {}
+        print(f"{result['route']}  service worker: {sw.get('state') or 'none'}"
+              f"{' (registered by ' + sw['by'] + ')' if sw.get('by') else ''}"
+              f"{', ' + sw['error'] if sw.get('error') else ''}")
+        for phase in PHASES:
+            load = result["phases"][phase]
+            interactive = (load.get("timing") or {}).get("interactive_ms")
+            share = load.get("cached_share")
+            print(f"  {phase:<9} {'ok' if load.get('ok') else 'FAILED':<6} "
+                  f"interactive {interactive if interactive is not None else '-':>8} ms  "
+                  f"network {load['network_bytes'] / 1024:>8.1f} KiB  "
+                  f"cached {share * 100 if share is not None else 0:>5.1f}%  "
+                  f"cache storage {sum(((load.get('cache_storage') or {}).get('entries') or {}).values()):>4} entries",
+                  flush=True)
+
+    report = asyncio.run(run_pwa(config, progress))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as fh:
+        findings = compare_pwa(json.load(fh), report)
+    for line in findings:
+        print(line)
+    print(f"\n{len(findings)} regression(s) against {args.baseline}")
+    return 1 if findings else 0
+
+
+def cmd_bundles(args: argparse.Namespace) -> int:
+    if args.profile and args.profile not in AUTH_PROFILES:
+        print(f"unknown auth profile {args.profile!r}; known: {', '.join(AUTH_PROFILES)}", file=sys.stderr)
+        return 2
+    config = BundleConfig(routes=_split_ids(args.routes) or [], workers=args.workers, browsers=args.browsers,
+                          profile=args.profile, throttle=args.throttle, base_url=args.base_url,
+                          headless=not args.headed)
+
+    def progress(result: Dict[str, Any]) -> None:
+        script, css = result["totals"]["script"], result["totals"]["stylesheet"]
+        landed = f" -> {result['final_path']}" if result.get("final_path", result["route"]) != result["route"] else ""
+        hydrated = result.get("hydrated_ms")
+        print(f"{result['route'] + landed:<32} {'ok' if result.get('ok') else 'FAILED':<6} "
+              f"js {script['transferred'] / 1024:>7.1f} KiB ({script['decoded'] / 1024:>7.1f} decoded, "
+              f"{script['files']:>3} files)  css {css['transferred'] / 1024:>6.1f} KiB  "
+              f"hydrated {hydrated if hydrated is not None else '-':>8} ms"
+              f"{'  ' + result['error'] if result.get('error') else ''}", flush=True)
+
+    report = asyncio.run(run_bundles(config, progress))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as fh:
+        findings = compare_bundles(json.load(fh), report, bytes_threshold=args.threshold, min_bytes=args.min_bytes)
+    for line in findings:
+        print(line)
+    print(f"\n{len(findings)} regression(s) against {args.baseline}")
+    return 1 if findings else 0
+
+
+def cmd_trace_diff(args: argparse.Namespace) -> int:
+    summaries = []
+    for path in (args.baseline, args.current):
+        path = Path(path)
+        with open(path / SUMMARY_FILE if path.is_dir() else path) as fh:
+            summaries.append(json.load(fh))
+    findings = compare(*summaries, threshold=args.threshold, min_ms=args.min_ms)
+    for line in findings:
+        print(line)
+    print(f"\n{len(findings)} regression(s)")
+    return 1 if findings else 0
+
+
+async def _run_proxy(args: argparse.Namespace, proxy_box: List[FaultProxy]) -> None:
+    profile = load_profile(args.profile)
+    if args.seed is not None:
+        profile.seed = args.seed
+    async with AsyncExitStack() as stack:
+        upstream = (await _spawn(stack, args)).base_url if args.spawn_server else args.upstream
+        host, _, port = args.listen.rpartition(":")
+        proxy = await stack.enter_async_context(FaultProxy(profile, upstream, host or "127.0.0.1", int(port)))
+        proxy_box.append(proxy)
+        print(f"{proxy.url} -> {upstream} with {profile.name} ({len(profile.rules)} rule(s)); Ctrl-C to stop",
+              flush=True)
+        await asyncio.Event().wait()
+
+
+def cmd_proxy(args: argparse.Namespace) -> int:
+    if not args.spawn_server and not args.upstream:
+        print("give --upstream or --spawn-server", file=sys.stderr)
+        return 2
+    proxies: List[FaultProxy] = []
+    try:
+        asyncio.run(_run_proxy(args, proxies))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    if proxies:
+        report = proxies[0].report()
+        for name, stats in report["rules"].items():
+            applied = ", ".join(f"{kind} {stats[kind]}" for kind in ("latency", "paced", "status", "reset", "dropped")
+                                if stats[kind])
+            print(f"{name:<28} matched {stats['matched']:>6}  {applied or 'nothing applied'}; "
+                  f"{stats['injected_ms']:.0f}ms injected")
+        if args.json:
+            with open(args.json, "w") as fh:
+                json.dump(report, fh, indent=2)
+    return 0
+
+
+def cmd_redis(args: argparse.Namespace) -> int:
+    try:
+        asyncio.run(serve_redis(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _add_socket_server_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--roster", required=True, help="couples JSON (see harness.couples)")
+    parser.add_argument("--connect-concurrency", type=int, default=50, help="handshakes in flight (default: 50)")
+    parser.add_argument("--base-url", default=BASE_URL, help="server to connect to (default: %(default)s)")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="start server.ts on --port against an in-process Redis stand-in")
+    parser.add_argument("--port", type=int, default=3100, help="port for --spawn-server (default: 3100)")
+    parser.add_argument("--server-log", metavar="PATH", help="write the spawned server's output here")
+    parser.add_argument("--fresh-db", action="store_true",
+                        help="give the spawned server its own clone of the seeded template database")
+    parser.add_argument("--database-url", default=default_database_url(),
+                        help="database the template is built from (default: $DATABASE_URL or prisma/dev.db)")
+    parser.add_argument("--json", metavar="PATH", help="write the full report as JSON")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="harness", description="TestSprite TC suite harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run TC scripts concurrently on a shared browser pool")
+    run.add_argument("-k", "--select", help="comma-separated test ids, e.g. TC001,TC003")
+    run.add_argument("-w", "--workers", type=int, default=4, help="tests in flight at once (default: 4)")
+    run.add_argument("-b", "--browsers", type=int, default=1, help="browsers in the pool (default: 1)")
+    run.add_argument("--headed", action="store_true", help="show the browser windows")
+    run.add_argument("--no-auth", action="store_true", help="ignore STORAGE_STATE and start every test signed out")
+    run.add_argument("--no-budgets", action="store_true", help="report BUDGET overruns without failing the case")
+    run.add_argument("--trace", metavar="DIR", help="write per-step timings to DIR/steps.jsonl and DIR/summary.json")
+    run.add_argument("--locator-report", metavar="PATH", help="write locator resolution counts as JSON")
+    run.add_argument("--failures", default=str(FAILURES_DIR), metavar="DIR",
+                     help="where failing cases leave their last steps and screenshots (default: %(default)s)")
+    run.add_argument("--full-trace", action="store_true",
+                     help="also keep a Playwright trace of failing cases (recorded for every case)")
+    run.add_argument("--render", metavar="DIR", help="profile render cost of chosen steps into DIR/render.json")
+    run.add_argument("--render-steps", metavar="PATTERNS",
+                     help="comma-separated locator globs to profile, e.g. 'kids.tab.*,fab.toggle' (default: all)")
+    run.add_argument("--cpu-throttle", type=float, default=1.0,
+                     help="CPU slowdown while profiling; 4 approximates a mid-range phone (default: 1)")
+    run.add_argument("--lighthouse", nargs="?", const=str(LIGHTHOUSE_BUDGET), metavar="BUDGET_JSON",
+                     help="check every route and UI state a case reaches against a Lighthouse budget "
+                          f"(default: {LIGHTHOUSE_BUDGET.name})")
+    run.add_argument("--impact", action="store_true", help="record which source files each case exercises")
+    run.add_argument("--changed", action="store_true",
+                     help="run only cases whose recorded files changed since --since (implies --impact)")
+    run.add_argument("--since", help="git ref to diff against for --changed (default: the upstream branch, else HEAD~1)")
+    run.add_argument("--impact-index", default=str(IMPACT_PATH), help="coverage index (default: %(default)s)")
+    run.add_argument("--shard", metavar="I/K", help="run only the I-th of K duration-balanced shards")
+    run.add_argument("--durations", default=str(DURATIONS_PATH), help="durations history (default: %(default)s)")
+    run.add_argument("--results", metavar="PATH", help="write the results as JSON for merge")
+    run.add_argument("--fresh-db", action="store_true",
+                     help="give every worker its own server.ts on --port, --port+1, ... and its own clone of the "
+                          "seeded template database, reset before each case")
+    run.add_argument("--port", type=int, default=3100, help="first --fresh-db server port (default: 3100)")
+    run.add_argument("--database-url", default=default_database_url(),
+                     help="database the template is built from (default: $DATABASE_URL or prisma/dev.db)")
+    run.add_argument("--server-log", metavar="PATH", help="write each --fresh-db server's output to PATH.<port>")
+    tapes = run.add_mutually_exclusive_group()
+    tapes.add_argument("--record", action="store_true", help="save each passing case's /api/* and Socket.IO traffic")
+    tapes.add_argument("--replay", action="store_true",
+                       help="serve /api/* and Socket.IO from recorded cassettes; only the frontend must be running")
+    run.set_defaults(func=cmd_run)
+
+    matrix = commands.add_parser("matrix", help="run check_viewport of the TC scripts on many devices at once")
+    matrix.add_argument("-k", "--select", help="comma-separated test ids, e.g. TC016")
+    matrix.add_argument("-d", "--devices", help=f"comma-separated device profiles (default: all of {', '.join(DEVICES)})")
+    matrix.add_argument("--orientations", default=",".join(ORIENTATIONS),
+                        help="comma-separated orientations for phones (default: %(default)s)")
+    matrix.add_argument("-w", "--workers", type=int, default=16, help="contexts open at once (default: 16)")
+    matrix.add_argument("-b", "--browsers", type=int, default=1, help="browsers in the pool (default: 1)")
+    matrix.add_argument("--headed", action="store_true", help="show the browser windows")
+    matrix.add_argument("--no-auth", action="store_true", help="ignore STORAGE_STATE and start every test signed out")
+    matrix.add_argument("--base-url", default=BASE_URL, help="app to open (default: %(default)s)")
+    matrix.add_argument("--json", metavar="PATH", help="write every viewport's result as one JSON report")
+    matrix.set_defaults(func=cmd_matrix)
+
+    plan = commands.add_parser("plan", help="execute testsprite_frontend_test_plan.json step by step")
+    plan.add_argument("-k", "--select", help="comma-separated test ids, e.g. TC001,TC003")
+    plan.add_argument("--plan", default=str(PLAN_PATH), help="test plan JSON (default: %(default)s)")
+    plan.add_argument("-w", "--workers", type=int, default=4, help="cases in flight at once (default: 4)")
+    plan.add_argument("-b", "--browsers", type=int, default=1, help="browsers in the pool (default: 1)")
+    plan.add_argument("--headed", action="store_true", help="show the browser windows")
+    plan.add_argument("--check", action="store_true", help="only list steps without an implementation")
+    plan.add_argument("--trace", metavar="DIR", help="write per-step timings to DIR/steps.jsonl and DIR/summary.json")
+    plan.add_argument("--locator-report", metavar="PATH", help="write locator resolution counts as JSON")
+    plan.set_defaults(func=cmd_plan)
+
+    sockets = commands.add_parser("sockets", help="benchmark couple-room Socket.IO fan-out latency")
+    sockets.add_argument("-c", "--couples", default="10,50,100", help="comma-separated stage sizes (default: %(default)s)")
+    sockets.add_argument("-r", "--rounds", type=int, default=10, help="event sequences per couple (default: 10)")
+    sockets.add_argument("--interval", type=float, default=0.0, help="seconds between events of one couple")
+    sockets.add_argument("--timeout", type=float, default=5.0, help="seconds to wait for each broadcast")
+    sockets.add_argument("--max-p99-ms", type=float, default=250.0, help="p99 that counts as keeping up")
+    _add_socket_server_args(sockets)
+    sockets.set_defaults(func=cmd_sockets)
+
+    soak = commands.add_parser("soak", help="heartbeat soak with reconnection storms")
+    soak.add_argument("-c", "--couples", type=int, default=500, help="couples from the roster (default: 500)")
+    soak.add_argument("--heartbeat-interval", type=float, default=5.0, help="seconds between heartbeats (default: 5)")
+    soak.add_argument("--warmup", type=float, default=10.0, help="steady-state seconds before the first storm")
+    soak.add_argument("--storms", type=int, default=1, help="number of storms (default: 1)")
+    soak.add_argument("--storm-interval", type=float, default=30.0, help="steady-state seconds between storms")
+    soak.add_argument("--drop-fraction", type=float, default=0.25, help="share of sockets dropped per storm")
+    soak.add_argument("--drop-mode", choices=("abort", "close"), default="abort",
+                      help="abort the TCP connection or send a clean close frame (default: abort)")
+    soak.add_argument("--reconnect-jitter", type=float, default=0.0, help="spread reconnects over this many seconds")
+    soak.add_argument("--settle", type=float, default=2.0, help="seconds to wait after the last rejoin")
+    soak.add_argument("--timeout", type=float, default=10.0, help="seconds to wait for acks and rejoins")
+    soak.add_argument("--seed", type=int, help="seed for choosing which sockets drop")
+    _add_socket_server_args(soak)
+    soak.set_defaults(func=cmd_soak)
+
+    impact = commands.add_parser("impact", help="list the cases a diff affects, from the coverage index")
+    impact.add_argument("--since", help="git ref to diff against (default: the upstream branch, else HEAD~1)")
+    impact.add_argument("--impact-index", default=str(IMPACT_PATH), help="coverage index (default: %(default)s)")
+    impact.set_defaults(func=cmd_impact)
+
+    merge = commands.add_parser("merge", help="combine the --results files of sharded runs into one result")
+    merge.add_argument("results", nargs="+", help="result JSON files written by run --results")
+    merge.add_argument("--shards", type=int, help="K of the I/K shards that ran (default: one per results file)")
+    merge.add_argument("-k", "--select", help="comma-separated test ids the shards ran together (default: all)")
+    merge.add_argument("--durations", default=str(DURATIONS_PATH), help="durations history to update")
+    merge.add_argument("--no-update", action="store_true", help="leave the durations history unchanged")
+    merge.add_argument("--json", metavar="PATH", help="write the merged results as JSON")
+    merge.set_defaults(func=cmd_merge)
+
+    load = commands.add_parser("load", help="open-loop HTTP load on the task and Daily Sync APIs")
+    load.add_argument("-r", "--rate", default="20,50,100", help="comma-separated arrivals per second (default: %(default)s)")
+    load.add_argument("-d", "--duration", type=float, default=30.0, help="seconds per stage (default: 30)")
+    load.add_argument("--mix", choices=sorted(MIXES), default="daily", help="operation mix (default: daily)")
+    load.add_argument("-c", "--couples", type=int, default=100, help="simulated couples (default: 100)")
+    load.add_argument("--connections", type=int, default=100, help="connection pool size (default: 100)")
+    load.add_argument("--max-inflight", type=int, default=1000, help="shed arrivals beyond this many open requests")
+    load.add_argument("--timeout", type=float, default=30.0, help="seconds before a request counts as timed out")
+    load.add_argument("--max-error-rate", type=float, default=0.01, help="stage error rate that fails the run")
+    load.add_argument("--seed", type=int, help="seed for arrivals and request bodies")
+    load.add_argument("--base-url", default=BASE_URL, help="server to load (default: %(default)s)")
+    load.add_argument("--spawn-server", action="store_true",
+                      help="start server.ts on --port against an in-process Redis stand-in")
+    load.add_argument("--port", type=int, default=3100, help="port for --spawn-server (default: 3100)")
+    load.add_argument("--server-log", metavar="PATH", help="write the spawned server's output here")
+    load.add_argument("--fresh-db", action="store_true",
+                      help="give the spawned server its own clone of the seeded template database")
+    load.add_argument("--database-url", default=default_database_url(),
+                      help="database the template is built from (default: $DATABASE_URL or prisma/dev.db)")
+    load.add_argument("--json", metavar="PATH", help="write every stage, with histograms, as JSON")
+    load.set_defaults(func=cmd_load)
+
+    db = commands.add_parser("db", help="build the seeded template database and manage per-worker clones")
+    db.add_argument("action", choices=("build", "clone", "reset", "drop"),
+                    help="build the template, or clone/reset/drop the named clones")
+    db.add_argument("names", nargs="*", help="clone names, e.g. w1 w2 w3 w4; clone and reset print their DATABASE_URL")
+    db.add_argument("--database-url", default=default_database_url(),
+                    help="database the template is built from (default: $DATABASE_URL or prisma/dev.db)")
+    db.set_defaults(func=cmd_db)
+
+    accounts = commands.add_parser("accounts", help="time export and deletion of heavy accounts, with DB faults")
+    accounts.add_argument("--years", default="0.5,2,5", help="comma-separated history per account (default: %(default)s)")
+    accounts.add_argument("--repeats", type=int, default=3, help="clean runs per operation and size (default: 3)")
+    accounts.add_argument("--faults", default="lock",
+                          help=f"comma-separated faults to inject, of {', '.join(FAULTS)} (default: %(default)s)")
+    accounts.add_argument("--fault-after", type=float, default=0.05, help="seconds into the request (default: 0.05)")
+    accounts.add_argument("--fault-hold", type=float, default=10.0, help="seconds a lock is held (default: 10)")
+    accounts.add_argument("--timeout", type=float, default=60.0, help="seconds before a request times out")
+    accounts.add_argument("--seed", type=int, default=0, help="seed for the generated accounts (default: 0)")
+    accounts.add_argument("--base-url", default=BASE_URL, help="server to measure (default: %(default)s)")
+    accounts.add_argument("--database-url", default=default_database_url(),
+                          help="database the server uses; accounts are written here (default: $DATABASE_URL or prisma/dev.db)")
+    accounts.add_argument("--spawn-server", action="store_true",
+                          help="start server.ts on --port, which also enables memory sampling")
+    accounts.add_argument("--fresh-db", action="store_true",
+                          help="give the spawned server its own clone of the seeded template database")
+    accounts.add_argument("--server-heap-mb", type=int, help="cap the spawned server's Node heap, like a container")
+    accounts.add_argument("--port", type=int, default=3100, help="port for --spawn-server (default: 3100)")
+    accounts.add_argument("--server-log", metavar="PATH", help="write the spawned server's output here")
+    accounts.add_argument("--json", metavar="PATH", help="write every timing as JSON")
+    accounts.set_defaults(func=cmd_accounts)
+
+    synth = commands.add_parser("synth", help="stream synthetic couples with years of history into a database")
+    synth.add_argument("-c", "--couples", type=int, default=1000, help="couples to generate (default: 1000)")
+    synth.add_argument("--years", type=float, default=3.0, help="history of the oldest couples (default: 3)")
+    synth.add_argument("--heavy-share", type=float, default=0.1,
+                       help="share of couples with the full history; the rest skew recent (default: 0.1)")
+    synth.add_argument("--rate", action="append", metavar="TABLE=PER_WEEK",
+                       help="mean rows per couple per week, e.g. tasks=20 (repeatable)")
+    synth.add_argument("--batch", type=int, default=5000, help="rows per bulk insert (default: 5000)")
+    synth.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    synth.add_argument("--start", type=int, default=0, help="first couple index, for parallel fills (default: 0)")
+    synth.add_argument("--prefix", default="syn", help="id and email prefix of generated rows (default: syn)")
+    synth.add_argument("--database-url",
+                       help="database to fill (default: a new clone of the seeded template under .databases/, "
+                            "never the shared dev database)")
+    synth.add_argument("--roster", metavar="PATH", help="also write a .jsonl roster of the users for the socket benchmarks")
+    synth.add_argument("--dry-run", action="store_true", help="generate without writing, to measure the generator")
+    synth.add_argument("--json", metavar="PATH", help="write the row counts and throughput as JSON")
+    synth.set_defaults(func=cmd_synth)
+
+    drain = commands.add_parser("drain", help="queue sync-worker actions offline and time the drain on reconnect")
+    drain.add_argument("-n", "--actions", type=int, default=300, help="actions queued per round (default: 300)")
+    drain.add_argument("--mix", action="append", metavar="PRIORITY=WEIGHT",
+                       help=f"share of {', '.join(PRIORITIES)} actions, e.g. high=2 (repeatable; default 1/3/6)")
+    drain.add_argument("-r", "--rounds", type=int, default=3, help="offline/online cycles (default: 3)")
+    drain.add_argument("--offline-for", type=float, default=5.0, help="seconds without signal (default: 5)")
+    drain.add_argument("--reconnect-wait", type=float, default=10.0,
+                       help="seconds the worker gets to reconnect by itself before it is told to (default: 10)")
+    drain.add_argument("--kick", action="store_true", help="send PROCESS_QUEUE on reconnect instead of waiting for the timer")
+    drain.add_argument("--app-ids", action="store_true", help="make ids the way useSync does, sync-<Date.now()>")
+    drain.add_argument("--settle", type=float, default=7.0, help="quiet seconds that end a drain (default: 7)")
+    drain.add_argument("--timeout", type=float, default=120.0, help="longest a drain may take (default: 120)")
+    drain.add_argument("--seed", type=int, default=0, help="seed for the priority draw (default: 0)")
+    drain.add_argument("--base-url", default=BASE_URL, help="app the worker is loaded from (default: %(default)s)")
+    drain.add_argument("--headed", action="store_true", help="show the browser")
+    drain.add_argument("--json", metavar="PATH", help="write every round as JSON")
+    drain.set_defaults(func=cmd_drain)
+
+    pwa = commands.add_parser("pwa", help="cold, warm, relaunch and offline loads with the service worker caches")
+    pwa.add_argument("--routes", help=f"comma-separated routes (default: {','.join(DEFAULT_ROUTES)})")
+    pwa.add_argument("--sw", default=DEFAULT_SW,
+                     help="service worker to register when the app does not, or 'none' (default: %(default)s)")
+    pwa.add_argument("--profile", help="harness.auth profile to sign in as, e.g. arjun-onboarded")
+    pwa.add_argument("--sw-timeout", type=float, default=15.0, help="seconds to wait for the worker to activate")
+    pwa.add_argument("--base-url", default=BASE_URL, help="app to measure (default: %(default)s)")
+    pwa.add_argument("--headed", action="store_true", help="show the browser")
+    pwa.add_argument("--json", metavar="PATH", help="write every load as JSON, to compare a later build against")
+    pwa.add_argument("--baseline", metavar="PATH", help="report of an earlier build; exit 1 on regressions")
+    pwa.set_defaults(func=cmd_pwa)
+
+    bundles = commands.add_parser("bundles", help="JavaScript and CSS each route ships, per chunk, against a baseline")
+    bundles.add_argument("--routes", help="comma-separated routes (default: every static page route in src/app)")
+    bundles.add_argument("-w", "--workers", type=int, default=4, help="routes loaded at once (default: 4)")
+    bundles.add_argument("-b", "--browsers", type=int, default=1, help="browsers in the pool (default: 1)")
+    bundles.add_argument("--profile", help="harness.auth profile to sign in as, e.g. arjun-onboarded")
+    bundles.add_argument("--throttle", choices=sorted(THROTTLING), default="none",
+                         help="network to load over; 4g is Lighthouse's mobile profile (default: none)")
+    bundles.add_argument("--base-url", default=BASE_URL, help="app to measure (default: %(default)s)")
+    bundles.add_argument("--headed", action="store_true", help="show the browser")
+    bundles.add_argument("--json", metavar="PATH", help="write every route and chunk as JSON, to compare a later build")
+    bundles.add_argument("--baseline", metavar="PATH", help="report of an earlier build; exit 1 on regressions")
+    bundles.add_argument("--threshold", type=float, default=0.05,
+                         help="relative growth of a route or chunk that counts (default: 0.05)")
+    bundles.add_argument("--min-bytes", type=int, default=2048,
+                         help="ignore growth of fewer transferred bytes than this (default: 2048)")
+    bundles.set_defaults(func=cmd_bundles)
+
+    trace_diff = commands.add_parser("trace-diff", help="compare two trace summaries and list regressions")
+    trace_diff.add_argument("baseline", help="summary.json (or its directory) of the earlier build")
+    trace_diff.add_argument("current", help="summary.json (or its directory) of the build under test")
+    trace_diff.add_argument("--threshold", type=float, default=0.2, help="relative slowdown to flag (default: 0.2)")
+    trace_diff.add_argument("--min-ms", type=float, default=50.0, help="ignore slowdowns smaller than this")
+    trace_diff.set_defaults(func=cmd_trace_diff)
+
+    proxy = commands.add_parser("proxy", help="forward to the app through injected latency, bandwidth caps and errors")
+    proxy.add_argument("--profile", default="flaky-mobile",
+                       help=f"a JSON profile, or one of {', '.join(FAULT_PROFILES)} (default: %(default)s)")
+    proxy.add_argument("--listen", default="127.0.0.1:3000", help="address the TC scripts reach (default: %(default)s)")
+    proxy.add_argument("--upstream", help="the app behind the proxy, e.g. http://localhost:3100")
+    proxy.add_argument("--seed", type=int, help="random seed, overriding the profile's")
+    proxy.add_argument("--spawn-server", action="store_true", help="start server.ts on --port as the upstream")
+    proxy.add_argument("--port", type=int, default=3100, help="port for --spawn-server (default: 3100)")
+    proxy.add_argument("--server-log", metavar="PATH", help="write the spawned server's output here")
+    proxy.add_argument("--fresh-db", action="store_true",
+                       help="give the spawned server its own clone of the seeded template database")
+    proxy.add_argument("--database-url", default=default_database_url(),
+                       help="database the template is built from (default: $DATABASE_URL or prisma/dev.db)")
+    proxy.add_argument("--json", metavar="PATH", help="write the faults per rule and route as JSON on exit")
+    proxy.set_defaults(func=cmd_proxy)
+
+    redis = commands.add_parser("redis", help="run the Redis stand-in until interrupted")
+    redis.add_argument("--host", default="127.0.0.1")
+    redis.add_argument("--port", type=int, default=6379)
+    redis.set_defaults(func=cmd_redis)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""Export and deletion timings for heavy accounts, with database faults.
+
+``python -m harness accounts`` grows one couple per ``--years`` value with
+:mod:`harness.synth` (tasks, syncs, memories and the rest over that much
+history). It then signs in as that couple's partner with an ADMIN session,
+since both routes require one, and measures:
+
+- ``GET /api/user/export``: time to first byte, total time to stream the
+  body (read in chunks, never held whole), and response size
+- ``POST /api/user/delete``: the same. The route only queues the deletion
+  and sends an email through placeholders, so it never reads or removes the
+  account's rows; its timings do not depend on account size, nor on the
+  database faults, until it really deletes data.
+- server memory: resident set size of the spawned server's process group,
+  sampled every 50 ms while the request runs. Growth is the peak minus the
+  value before the request.
+
+Each operation then runs once more with a database fault injected
+``--fault-after`` seconds into the request:
+
+- ``lock`` holds an exclusive lock for ``--fault-hold`` seconds. SQLite gets
+  ``BEGIN EXCLUSIVE`` on the file. PostgreSQL gets ``LOCK TABLE`` on users,
+  couples and the history tables.
+- ``kill`` (PostgreSQL only) terminates the server's database connections,
+  as a failover or restart would.
+
+A request that outlives ``--timeout`` counts as a timeout. One during which
+the server exits counts as a crash, the usual face of an out-of-memory kill,
+and ``--server-heap-mb`` caps the Node heap the way production containers
+do. Memory is only measured for a server this process spawned
+(``--spawn-server``), on Linux. Data is written to ``--database-url``, so
+spawn the server with ``--fresh-db`` to keep it out of the shared database.
+Account ids carry a per-run prefix, so runs against the same database do
+not collide. Both operations run on the same grown account.
+"""
+
+import asyncio
+import os
+import secrets
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .databases import sqlite_path
+from .synth import SynthConfig, synthesize
+from .tokens import session_cookie
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+EXPORT = ("GET", "/api/user/export")
+DELETE = ("POST", "/api/user/delete")
+LOCK = "lock"
+KILL = "kill"
+FAULTS = (LOCK, KILL)
+LOCKED_TABLES = ("users", "couples", "tasks", "memories", "sync_entries", "ritual_sessions")
+RSS_INTERVAL = 0.05
+
+
+@dataclass
+class AccountConfig:
+    base_url: str
+    database_url: str
+    years: List[float]
+    repeats: int = 3
+    faults: List[str] = field(default_factory=list)
+    fault_after: float = 0.05
+    fault_hold: float = 10.0
+    timeout: float = 60.0
+    secret: Optional[str] = None
+    server_pid: Optional[int] = None   # process group to sample; None when the server is not ours
+    seed: int = 0
+    run_id: str = field(default_factory=lambda: secrets.token_hex(3))  # keeps account ids unique per run
+
+
+@dataclass
+class Timing:
+    years: float
+    rows: int
+    operation: str
+    fault: Optional[str]
+    outcome: str                     # "ok", "http <status>", "timeout", "crash" or the client error
+    status: Optional[int] = None
+    ttfb_ms: Optional[float] = None
+    total_ms: Optional[float] = None
+    bytes: int = 0
+    rss_before_mb: Optional[float] = None
+    rss_peak_mb: Optional[float] = None
+
+    @property
+    def rss_growth_mb(self) -> Optional[float]:
+        if self.rss_before_mb is None or self.rss_peak_mb is None:
+            return None
+        return round(self.rss_peak_mb - self.rss_before_mb, 1)
+
+
+def group_rss_mb(pgid: int) -> Optional[float]:
+    """Resident memory of every process in group ``pgid``, from ``/proc``; None off Linux."""
+    total_pages = 0
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                fields = fh.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue  # exited while we looked
+        if int(fields[2]) == pgid:       # pgrp, the 5th field of stat
+            total_pages += int(fields[21])  # rss, the 24th
+    return round(total_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+
+
+class RssSampler:
+    """Peak resident memory of a process group while a block runs."""
+
+    def __init__(self, pgid: Optional[int]):
+        self.pgid = pgid
+        self.before: Optional[float] = None
+        self.peak: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "RssSampler":
+        if self.pgid is not None:
+            self.before = self.peak = group_rss_mb(self.pgid)
+            self._task = asyncio.ensure_future(self._sample())
+        return self
+
+    async def _sample(self) -> None:
+        while True:
+            await asyncio.sleep(RSS_INTERVAL)
+            value = group_rss_mb(self.pgid)
+            if value is not None and (self.peak is None or value > self.peak):
+                self.peak = value
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class DatabaseFault:
+    """Inject one fault into the app's database after a delay."""
+
+    def __init__(self, database_url: str, kind: str, after: float, hold: float):
+        if kind == KILL and not database_url.startswith(("postgres://", "postgresql://")):
+            raise ValueError("the kill fault needs a PostgreSQL database")
+        if database_url.startswith(("postgres://", "postgresql://")) and asyncpg is None:
+            raise RuntimeError("harness.accounts needs the 'asyncpg' package for PostgreSQL faults: pip install asyncpg")
+        self.database_url = database_url
+        self.kind = kind
+        self.after = after
+        self.hold = hold
+
+    async def run(self) -> None:
+        await asyncio.sleep(self.after)
+        if self.database_url.startswith("file:"):
+            await asyncio.to_thread(self._lock_sqlite)
+        elif self.kind == LOCK:
+            await self._lock_postgres()
+        else:
+            await self._kill_postgres()
+
+    def _lock_sqlite(self) -> None:
+        connection = sqlite3.connect(sqlite_path(self.database_url), isolation_level=None, timeout=self.hold)
+        try:
+            connection.execute("BEGIN EXCLUSIVE")
+            time.sleep(self.hold)
+            connection.execute("ROLLBACK")
+        finally:
+            connection.close()
+
+    async def _lock_postgres(self) -> None:
+        connection = await asyncpg.connect(self.database_url)
+        try:
+            async with connection.transaction():
+                tables = ", ".join(f'"{table}"' for table in LOCKED_TABLES)
+                await connection.execute(f"LOCK TABLE {tables} IN ACCESS EXCLUSIVE MODE")
+                await asyncio.sleep(self.hold)
+        finally:
+            await connection.close()
+
+    async def _kill_postgres(self) -> None:
+        connection = await asyncpg.connect(self.database_url)
+        try:
+            await connection.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND pid <> pg_backend_pid()")
+        finally:
+            await connection.close()
+
+
+def _server_alive(pgid: Optional[int]) -> bool:
+    if pgid is None:
+        return True
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def time_request(session: "aiohttp.ClientSession", config: AccountConfig, operation: tuple, cookie: str,
+                       fault: Optional[str], years: float, rows: int) -> Timing:
+    method, path = operation
+    timing = Timing(years, rows, f"{method} {path}", fault, "ok")
+    injector = asyncio.ensure_future(
+        DatabaseFault(config.database_url, fault, config.fault_after, config.fault_hold).run()) if fault else None
+    started = time.perf_counter()
+    async with RssSampler(config.server_pid) as rss:
+        try:
+            async with session.request(method, config.base_url + path, headers={"Cookie": cookie},
+                                       timeout=aiohttp.ClientTimeout(total=config.timeout)) as response:
+                timing.ttfb_ms = round((time.perf_counter() - started) * 1000, 1)
+                timing.status = response.status
+                async for chunk in response.content.iter_chunked(1 << 16):
+                    timing.bytes += len(chunk)
+            timing.total_ms = round((time.perf_counter() - started) * 1000, 1)
+            if timing.status >= 400:
+                timing.outcome = f"http {timing.status}"
+        except asyncio.TimeoutError:
+            timing.outcome = "timeout"
+        except aiohttp.ClientError as exc:
+            timing.outcome = type(exc).__name__
+    if not _server_alive(config.server_pid):
+        timing.outcome = "crash"
+    timing.rss_before_mb, timing.rss_peak_mb = rss.before, rss.peak
+    if injector is not None:
+        await injector  # let the lock go before the next request
+    return timing
+
+
+async def run_accounts(config: AccountConfig, progress=None) -> List[Timing]:
+    """Grow one account per size and time export and deletion on it, clean and under each fault."""
+    if aiohttp is None:
+        raise RuntimeError("harness.accounts needs the 'aiohttp' package: pip install aiohttp")
+    for fault in config.faults:
+        DatabaseFault(config.database_url, fault, config.fault_after, config.fault_hold)  # fail before seeding
+    timings: List[Timing] = []
+
+    async with aiohttp.ClientSession() as session:
+        for number, years in enumerate(config.years):
+            prefix = f"acct{config.run_id}n{number}"
+            synth = SynthConfig(couples=1, years=years, heavy_share=1.0, seed=config.seed + number, prefix=prefix)
+            rows = (await synthesize(synth, config.database_url))["rows"]
+            user_id, couple_id = f"{prefix}-0-ua", f"{prefix}-0-c"
+            cookie = session_cookie(user_id, name="Account Bench", couple_id=couple_id, role="ADMIN",
+                                    email=f"{user_id}@example.com", secret=config.secret)
+            for operation in (EXPORT, DELETE):
+                for fault in [None] * config.repeats + config.faults:
+                    timing = await time_request(session, config, operation, cookie, fault, years, rows)
+                    timings.append(timing)
+                    if progress is not None:
+                        progress(timing)
+                    if timing.outcome == "crash":
+                        return timings  # nothing left to measure
+    return timings
+
+
+def summarize_timings(timings: List[Timing]) -> List[Dict[str, Any]]:
+    return [{**asdict(timing), "rss_growth_mb": timing.rss_growth_mb} for timing in timings]
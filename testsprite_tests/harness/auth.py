@@ -0,0 +1,151 @@
+"""Per-role storage-state snapshots so tests start signed in.
+
+Each profile (a demo partner, optionally with Daily Sync already done) logs
+in once through the real ``/login`` form. The resulting cookies and
+localStorage are written to ``.auth/<profile>-<build>.json`` and every later
+context for that profile is created from the file. Snapshots are keyed by
+the app build, so a new build logs in again and the old files are removed.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+from urllib.request import urlopen
+
+from playwright import async_api
+
+from .flows import complete_daily_sync, log_in
+from .pool import BrowserPool
+from .session import BASE_URL, open_app
+from .steps import Steps
+from .flight import CURRENT_FLIGHT
+from .lighthouse import CURRENT_STATES
+from .render import CURRENT_RENDER
+from .trace import CURRENT_TRACE
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+AUTH_DIR = TESTS_DIR / ".auth"
+REPO_DIR = TESTS_DIR.parent
+
+_STATIC_ASSET = re.compile(r"/_next/static/[^\"'\s)]+")
+
+
+@dataclass(frozen=True)
+class AuthProfile:
+    name: str
+    email: str
+    password: str
+    onboarded: bool = False
+
+
+PROFILES: Dict[str, AuthProfile] = {
+    profile.name: profile
+    for profile in (
+        AuthProfile("arjun", "arjun@example.com", "password123"),
+        AuthProfile("priya", "priya@example.com", "password123"),
+        AuthProfile("arjun-onboarded", "arjun@example.com", "password123", onboarded=True),
+        AuthProfile("priya-onboarded", "priya@example.com", "password123", onboarded=True),
+    )
+}
+
+
+def build_id(base_url: str = BASE_URL) -> str:
+    """Identify the app build under test.
+
+    ``TC_BUILD_ID`` wins, then ``.next/BUILD_ID`` from a local ``next build``;
+    a dev server has neither, so fall back to hashing the static asset URLs
+    in the served HTML, which change whenever the bundles do.
+    """
+    explicit = os.environ.get("TC_BUILD_ID")
+    if explicit:
+        return explicit
+    build_file = REPO_DIR / ".next" / "BUILD_ID"
+    if build_file.exists():
+        return build_file.read_text().strip()
+    with urlopen(base_url, timeout=10) as response:
+        html = response.read().decode("utf-8", "replace")
+    assets = sorted(set(_STATIC_ASSET.findall(html)))
+    return hashlib.sha1("\n".join(assets).encode()).hexdigest()[:12]
+
+
+class AuthStore:
+    def __init__(self, pool: BrowserPool, *, directory: Path = AUTH_DIR, base_url: str = BASE_URL):
+        self.pool = pool
+        self.directory = directory
+        self.base_url = base_url
+        self._build: Optional[str] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def build(self) -> str:
+        if self._build is None:
+            self._build = await asyncio.to_thread(build_id, self.base_url)
+        return self._build
+
+    async def storage_state(self, profile: str) -> Path:
+        """Return the snapshot file for ``profile``, creating it on first use."""
+        if profile not in PROFILES:
+            raise KeyError(f"unknown auth profile '{profile}'")
+        path = self.directory / f"{profile}-{await self.build()}.json"
+        lock = self._locks.setdefault(profile, asyncio.Lock())
+        async with lock:
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._prune(profile)
+                await self._snapshot(PROFILES[profile], path)
+            return path
+
+    def _prune(self, profile: str) -> None:
+        """Drop snapshots of ``profile`` taken against other builds."""
+        longer = [other for other in PROFILES if other.startswith(f"{profile}-")]
+        for stale in self.directory.glob(f"{profile}-*.json"):
+            if not any(stale.name.startswith(f"{other}-") for other in longer):
+                stale.unlink()
+
+    async def _snapshot(self, profile: AuthProfile, path: Path) -> None:
+        # Logging in is shared set-up, not part of whichever case asked first.
+        token, flight, render = CURRENT_TRACE.set(None), CURRENT_FLIGHT.set(None), CURRENT_RENDER.set(None)
+        states = CURRENT_STATES.set(None)
+        try:
+            await self._log_in(profile, path)
+        finally:
+            CURRENT_STATES.reset(states)
+            CURRENT_RENDER.reset(render)
+            CURRENT_FLIGHT.reset(flight)
+            CURRENT_TRACE.reset(token)
+
+    async def _log_in(self, profile: AuthProfile, path: Path) -> None:
+        async with self.pool.context() as context:
+            context.set_default_timeout(5000)
+            page = await context.new_page()
+            steps = Steps(page)
+            await log_in(steps, profile.email, profile.password, self.base_url)
+            if profile.onboarded:
+                await open_app(page, self.base_url)
+                await complete_daily_sync(steps)
+            await context.storage_state(path=str(path))
+
+    @asynccontextmanager
+    async def context(self, profile: str, **options) -> AsyncIterator[async_api.BrowserContext]:
+        """Lease a pool context that starts signed in as ``profile``."""
+        path = await self.storage_state(profile)
+        async with self.pool.context(storage_state=str(path), **options) as context:
+            yield context
+
+    async def apply(self, context: async_api.BrowserContext, profile: str) -> None:
+        """Load ``profile``'s snapshot into an already open context."""
+        with open(await self.storage_state(profile)) as fh:
+            state = json.load(fh)
+        if state.get("cookies"):
+            await context.add_cookies(state["cookies"])
+        for origin in state.get("origins", []):
+            items = {item["name"]: item["value"] for item in origin.get("localStorage", [])}
+            await context.add_init_script(
+                "if (location.origin === %s) { for (const [k, v] of Object.entries(%s)) localStorage.setItem(k, v); }"
+                % (json.dumps(origin["origin"]), json.dumps(items))
+            )
@@ -0,0 +1,152 @@
+"""Performance budgets a TC script can declare next to its functional checks.
+
+A script sets a module-level ``BUDGET``::
+
+    BUDGET = Budget(journey_ms=30_000, step_server_ms=800, lcp_ms=2_500)
+
+and the runner measures the run against it:
+
+- ``journey_ms``: from the page opening to the end of the last step, i.e.
+  the time a user spends in the journey
+- ``step_server_ms``: the slowest API request of each step, counted from
+  request sent to first response byte (Resource Timing)
+- ``lcp_ms`` / ``cls``: Largest Contentful Paint and Cumulative Layout
+  Shift from ``PerformanceObserver``
+- ``ttfb_ms`` / ``dom_content_loaded_ms`` / ``load_ms``: Navigation Timing
+  of the document
+
+The worst page of the case counts. A case over budget fails even when its
+functional assertions pass.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from playwright import async_api
+
+from .trace import TraceCollector
+
+# Installed before any page script; one observer set per document.
+VITALS_SCRIPT = """
+(() => {
+  const vitals = (window.__tcVitals = {
+    lcp: null, cls: 0, longTaskMs: 0, longTaskEnd: 0, blockingMs: 0, longestTaskMs: 0,
+  });
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry)).observe({ type, buffered: true });
+    } catch (e) {}
+  };
+  observe('largest-contentful-paint', (entry) => { vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+  observe('longtask', (entry) => {
+    vitals.longTaskMs += entry.duration;
+    vitals.blockingMs += Math.max(0, entry.duration - 50);
+    vitals.longestTaskMs = Math.max(vitals.longestTaskMs, entry.duration);
+    vitals.longTaskEnd = Math.max(vitals.longTaskEnd, entry.startTime + entry.duration);
+  });
+})();
+"""
+
+READ_VITALS = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+  const vitals = window.__tcVitals || {};
+  return {
+    fcp: fcp ? fcp.startTime : null,
+    lcp: vitals.lcp,
+    cls: vitals.cls,
+    longTaskMs: vitals.longTaskMs,
+    longTaskEnd: vitals.longTaskEnd,
+    blockingMs: vitals.blockingMs,
+    longestTaskMs: vitals.longestTaskMs,
+    ttfb: nav ? nav.responseStart : null,
+    domContentLoaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+  };
+}
+"""
+
+
+@dataclass(frozen=True)
+class Budget:
+    journey_ms: Optional[float] = None
+    step_server_ms: Optional[float] = None
+    lcp_ms: Optional[float] = None
+    cls: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    dom_content_loaded_ms: Optional[float] = None
+    load_ms: Optional[float] = None
+
+    def check(self, measured: "Measurements") -> List[str]:
+        """One message per limit the measurements exceed."""
+        violations = []
+        for name in ("journey_ms", "lcp_ms", "cls", "ttfb_ms", "dom_content_loaded_ms", "load_ms"):
+            limit, value = getattr(self, name), getattr(measured, name)
+            if limit is not None and value is not None and value > limit:
+                violations.append(f"{name} {value:g} > {limit:g}")
+        if self.step_server_ms is not None:
+            for step, ms in measured.step_server_ms.items():
+                if ms > self.step_server_ms:
+                    violations.append(f"step_server_ms {ms:g} > {self.step_server_ms:g} in {step}")
+        return violations
+
+
+@dataclass
+class Measurements:
+    journey_ms: Optional[float] = None
+    lcp_ms: Optional[float] = None
+    cls: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    dom_content_loaded_ms: Optional[float] = None
+    load_ms: Optional[float] = None
+    long_task_ms: Optional[float] = None
+    step_server_ms: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def install_vitals(context: async_api.BrowserContext) -> None:
+    await context.add_init_script(VITALS_SCRIPT)
+
+
+async def read_vitals(context: async_api.BrowserContext) -> List[Dict[str, Any]]:
+    """Vitals of every page still open in ``context``."""
+    readings = []
+    for page in context.pages:
+        try:
+            readings.append(await page.evaluate(READ_VITALS))
+        except async_api.Error:
+            pass  # page closed or crashed; its functional failure is reported elsewhere
+    return readings
+
+
+def _worst(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return round(max(present), 3) if present else None
+
+
+def measure(collector: TraceCollector, vitals: List[Dict[str, Any]]) -> Measurements:
+    """Combine the case's step traces with the pages' vitals."""
+    measured = Measurements(
+        lcp_ms=_worst([reading.get("lcp") for reading in vitals]),
+        cls=_worst([reading.get("cls") for reading in vitals]),
+        ttfb_ms=_worst([reading.get("ttfb") for reading in vitals]),
+        dom_content_loaded_ms=_worst([reading.get("domContentLoaded") for reading in vitals]),
+        load_ms=_worst([reading.get("load") for reading in vitals]),
+        long_task_ms=_worst([reading.get("longTaskMs") for reading in vitals]),
+    )
+    journeys = []
+    for page_no, trace in enumerate(collector.pages):
+        last = trace.steps[-1]
+        journeys.append(last.start_ms + last.duration_ms)
+        for step in trace.steps:
+            server = [request.server_ms for request in step.requests
+                      if request.route.startswith("/api/") and request.server_ms is not None]
+            if server:
+                label = f"page {page_no} step {step.index} ({step.action} {step.target})".replace(" )", ")")
+                measured.step_server_ms[label] = round(max(server), 3)
+    measured.journey_ms = _worst(journeys)
+    return measured
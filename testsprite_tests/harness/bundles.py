@@ -0,0 +1,263 @@
+"""JavaScript and CSS each route ships, per chunk, diffed build to build.
+
+``python -m harness bundles`` loads every page route of ``src/app`` (the
+static ones, from :class:`harness.impact.RouteTable`, or ``--routes``) in a
+fresh context with an empty cache, ``--workers`` at a time. Each route
+reports:
+
+- every script and stylesheet it loaded, up to network idle after
+  hydration, so chunks imported on mount count too. Each comes with
+  ``transferred`` bytes (over the wire, compressed) and ``decoded`` bytes
+  (what the browser parses), read over CDP.
+- totals of both per kind
+- ``hydrated_ms``: time from navigation start to React's first commit,
+  which on a server-rendered page is the end of hydration.
+  ``react_ms`` is when React itself loaded, and ``hydration_ms`` is the
+  time between the two. Both come from a stub of the React DevTools hook
+  that the production build reports to as well. Timings of concurrent
+  loads skew each other, so compare them from ``--workers 1`` runs.
+
+Chunks are keyed by path with the content hash and build id taken out
+(``/_next/static/chunks/app/page-<hash>.js`` is ``.../app/page.js``), so
+the same chunk lines up across builds. Files named by their hash alone,
+such as Next's CSS, line up only while their content is unchanged. A
+changed file shows up as one dropped and one new file.
+
+:func:`compare` diffs two reports per route and per chunk: routes that
+ship more JavaScript or CSS, chunks that grew or appeared, routes that
+stopped loading and routes that hydrate slower. ``--throttle 4g`` loads
+over Lighthouse's mobile network, as DevTools throttling applies it
+(562 ms per request, 1.4 Mbps down), so the timings are what a phone on
+4G sees.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from .auth import AuthStore
+from .impact import RouteTable
+from .pool import BrowserPool
+from .session import BASE_URL
+
+KINDS = {"Script": "script", "Stylesheet": "stylesheet"}
+# Lighthouse's mobile throttling as DevTools applies it (its simulated 150 ms RTT and 1.6 Mbps, adjusted).
+THROTTLING = {
+    "none": None,
+    "4g": {"offline": False, "latency": 150 * 3.75, "downloadThroughput": 1.6 * 1024 * 0.9 * 1024 / 8,
+           "uploadThroughput": 750 * 0.9 * 1024 / 8},
+}
+
+_BUILD_ID = re.compile(r"^/_next/static/(?!chunks/|css/|media/)[^/]+/")
+_HASH = re.compile(r"[-.](?:[0-9a-f]{8,}|[0-9A-Za-z_]{20,})(?=\.(?:m?js|css)$)")
+
+# React reports to the DevTools hook in production builds too; a stub records when it loads and first commits.
+HYDRATION_SCRIPT = """(() => {
+  if (window.__REACT_DEVTOOLS_GLOBAL_HOOK__) return;
+  const marks = window.__harnessHydration = { react: null, committed: null };
+  window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+    supportsFiber: true,
+    renderers: new Map(),
+    inject(renderer) {
+      if (marks.react === null) marks.react = performance.now();
+      const id = this.renderers.size + 1;
+      this.renderers.set(id, renderer);
+      return id;
+    },
+    onCommitFiberRoot() { if (marks.committed === null) marks.committed = performance.now(); },
+    onCommitFiberUnmount() {},
+    onPostCommitFiberRoot() {},
+    onScheduleFiberRoot() {},
+    checkDCE() {},
+  };
+})();"""
+HYDRATED_JS = "() => window.__harnessHydration && window.__harnessHydration.committed !== null"
+READ_HYDRATION_JS = "() => window.__harnessHydration || { react: null, committed: null }"
+
+
+@dataclass
+class BundleConfig:
+    routes: List[str] = field(default_factory=list)   # empty: every static page route in src/app
+    workers: int = 4
+    browsers: int = 1
+    profile: Optional[str] = None                      # harness.auth profile to sign in as
+    throttle: str = "none"
+    hydration_timeout: float = 15.0
+    idle_timeout: float = 10.0
+    base_url: str = BASE_URL
+    headless: bool = True
+
+
+def app_routes(routes: Optional[RouteTable] = None) -> List[str]:
+    """URL paths of the page routes without dynamic segments."""
+    table = routes or RouteTable()
+    paths = {"/" + "/".join(route.segments) for route in table.routes
+             if route.file.rsplit("/", 1)[-1].startswith("page.")
+             and not any(segment.startswith("[") for segment in route.segments)}
+    return sorted(paths)
+
+
+def chunk_key(url: str, origin: str) -> str:
+    """A name for the file at ``url`` that stays the same across builds."""
+    parsed = urlparse(url)
+    path = _HASH.sub("", _BUILD_ID.sub("/_next/static/<build>/", parsed.path))
+    return path if f"{parsed.scheme}://{parsed.netloc}" == origin else f"{parsed.netloc}{path}"
+
+
+class ChunkLog:
+    """Scripts and stylesheets a page loads, from the CDP Network domain."""
+
+    def __init__(self, origin: str):
+        self.origin = origin
+        self.chunks: Dict[str, Dict[str, Any]] = {}   # request id -> chunk
+        self._ids: Dict[str, str] = {}                # request id -> key
+
+    async def attach(self, page: async_api.Page, throttle: Optional[Dict[str, Any]]) -> None:
+        session = await page.context.new_cdp_session(page)
+        session.on("Network.requestWillBeSent", self._on_request)
+        session.on("Network.dataReceived", self._on_data)
+        session.on("Network.loadingFinished", self._on_finished)
+        await session.send("Network.enable")
+        if throttle is not None:
+            await session.send("Network.emulateNetworkConditions", throttle)
+
+    def _on_request(self, event: Dict[str, Any]) -> None:
+        kind = KINDS.get(event.get("type"))
+        if kind is not None:
+            url = event["request"]["url"]
+            self.chunks[event["requestId"]] = {"kind": kind, "url": url, "transferred": 0, "decoded": 0}
+            self._ids[event["requestId"]] = chunk_key(url, self.origin)
+
+    def _on_data(self, event: Dict[str, Any]) -> None:
+        if event["requestId"] in self.chunks:
+            self.chunks[event["requestId"]]["decoded"] += event.get("dataLength", 0)
+
+    def _on_finished(self, event: Dict[str, Any]) -> None:
+        if event["requestId"] in self.chunks:
+            self.chunks[event["requestId"]]["transferred"] = int(event.get("encodedDataLength", 0))
+
+    def by_key(self) -> Dict[str, Dict[str, Any]]:
+        merged: Dict[str, Dict[str, Any]] = {}
+        for request_id, chunk in self.chunks.items():
+            key = self._ids[request_id]
+            if key in merged:  # fetched twice, e.g. a preload the page did not reuse
+                merged[key]["transferred"] += chunk["transferred"]
+                merged[key]["decoded"] += chunk["decoded"]
+                continue
+            merged[key] = dict(chunk)
+        return dict(sorted(merged.items()))
+
+
+def totals(chunks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    table = {kind: {"files": 0, "transferred": 0, "decoded": 0} for kind in KINDS.values()}
+    for chunk in chunks.values():
+        row = table[chunk["kind"]]
+        row["files"] += 1
+        row["transferred"] += chunk["transferred"]
+        row["decoded"] += chunk["decoded"]
+    return table
+
+
+async def measure_route(context: async_api.BrowserContext, route: str, config: BundleConfig) -> Dict[str, Any]:
+    """Load ``route`` once in ``context`` and record what it shipped."""
+    origin = "{0.scheme}://{0.netloc}".format(urlparse(config.base_url))
+    await context.add_init_script(HYDRATION_SCRIPT)
+    page = await context.new_page()
+    log = ChunkLog(origin)
+    await log.attach(page, THROTTLING[config.throttle])
+    result: Dict[str, Any] = {"route": route}
+    try:
+        response = await page.goto(config.base_url.rstrip("/") + route, wait_until="load", timeout=60000)
+        result["status"] = response.status if response is not None else None
+        result["ok"] = response is None or response.ok
+        result["final_path"] = urlparse(page.url).path  # a signed-out visit may land on /login
+    except async_api.Error as exc:
+        result.update(ok=False, status=None, error=str(exc).splitlines()[0])
+    try:
+        await page.wait_for_function(HYDRATED_JS, timeout=config.hydration_timeout * 1000)
+    except async_api.Error:
+        result.setdefault("error", "no React commit before the hydration timeout")
+    try:
+        await page.wait_for_load_state("networkidle", timeout=config.idle_timeout * 1000)
+    except async_api.Error:
+        pass
+    try:
+        marks = await page.evaluate(READ_HYDRATION_JS)
+    except async_api.Error:
+        marks = {"react": None, "committed": None}
+    react, committed = marks["react"], marks["committed"]
+    result.update(
+        react_ms=round(react, 1) if react is not None else None,
+        hydrated_ms=round(committed, 1) if committed is not None else None,
+        hydration_ms=round(committed - react, 1) if react is not None and committed is not None else None,
+    )
+    result["chunks"] = log.by_key()
+    result["totals"] = totals(result["chunks"])
+    await page.close()
+    return result
+
+
+async def run_bundles(config: BundleConfig, progress=None) -> Dict[str, Any]:
+    """Measure every route, ``config.workers`` at a time, each in a context of its own."""
+    if config.throttle not in THROTTLING:
+        raise ValueError(f"unknown throttle {config.throttle!r}; known: {', '.join(THROTTLING)}")
+    routes = config.routes or app_routes()
+    semaphore = asyncio.Semaphore(max(1, config.workers))
+    async with BrowserPool(config.browsers, headless=config.headless) as pool:
+        auth = AuthStore(pool, base_url=config.base_url) if config.profile else None
+
+        async def bounded(route: str) -> Dict[str, Any]:
+            async with semaphore:
+                lease = auth.context(config.profile) if auth is not None else pool.context()
+                async with lease as context:
+                    result = await measure_route(context, route, config)
+            if progress is not None:
+                progress(result)
+            return result
+
+        results = list(await asyncio.gather(*(bounded(route) for route in routes)))
+    return {"base_url": config.base_url, "profile": config.profile, "throttle": config.throttle, "routes": results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, bytes_threshold: float = 0.05,
+            min_bytes: int = 2048, time_threshold: float = 0.5, min_ms: float = 100.0) -> List[str]:
+    """Lines describing routes and chunks that ship more, or hydrate slower, than in ``baseline``.
+
+    A change counts when it exceeds both ``min_bytes`` (transferred) and
+    ``bytes_threshold`` of the old size; a new chunk when it exceeds
+    ``min_bytes``.
+    """
+    before = {route["route"]: route for route in baseline.get("routes", [])}
+    findings = []
+    for route in current.get("routes", []):
+        old = before.get(route["route"])
+        if old is None:
+            continue
+        label = route["route"]
+        if old.get("ok") and not route.get("ok"):
+            findings.append(f"{label}: loaded before, now {route.get('error') or route.get('status')}")
+            continue
+        for kind in KINDS.values():
+            was = old["totals"][kind]["transferred"]
+            now = route["totals"][kind]["transferred"]
+            if now - was > min_bytes and now - was > was * bytes_threshold:
+                findings.append(f"{label}: {kind} {was / 1024:.1f} KiB -> {now / 1024:.1f} KiB transferred "
+                                f"({route['totals'][kind]['decoded'] / 1024:.1f} KiB decoded)")
+        for key, chunk in route["chunks"].items():
+            previous = old["chunks"].get(key)
+            if previous is None:
+                if chunk["transferred"] > min_bytes:
+                    findings.append(f"{label}: new {chunk['kind']} {key} {chunk['transferred'] / 1024:.1f} KiB")
+                continue
+            grew = chunk["transferred"] - previous["transferred"]
+            if grew > min_bytes and grew > previous["transferred"] * bytes_threshold:
+                findings.append(f"{label}: {key} {previous['transferred'] / 1024:.1f} KiB -> "
+                                f"{chunk['transferred'] / 1024:.1f} KiB")
+        old_ms, new_ms = old.get("hydrated_ms"), route.get("hydrated_ms")
+        if old_ms and new_ms and new_ms - old_ms > min_ms and new_ms > old_ms * (1 + time_threshold):
+            findings.append(f"{label}: hydrated at {old_ms:.0f} ms -> {new_ms:.0f} ms")
+    return findings
@@ -0,0 +1,294 @@
+"""Record a case's ``/api/*`` responses and Socket.IO frames, then replay them.
+
+``python -m harness run --record`` runs against the full stack (``server.ts``
+with Prisma, Redis and Socket.IO) and writes what each case's pages got from
+the backend to ``.cassettes/<case>.json.gz``. ``--replay`` serves those
+responses through Playwright routing instead, so UI-only cases need nothing
+but the Next.js frontend (``npx next dev``) and finish in seconds.
+
+A cassette keeps every response body once, however many requests returned
+it. Replay matches requests on method, path and query, then body. Repeated
+requests get the recorded responses in order, and the last one repeats after
+that. A request recorded with another body falls back to the first response
+for its method and path. Unknown requests get a 404 and are reported as
+misses.
+
+Socket.IO is replayed over the ``websocket`` transport. Each socket a page
+opens gets the frames of the matching recorded socket: the Engine.IO
+handshake, the replies to every event or connect packet the client sends,
+and the server pushes recorded after it, with heartbeats kept alive. Clients
+that start on long-polling find no server in replay; ``useSocket`` and
+``use-socket`` connect over ``websocket`` first and are unaffected.
+
+Playwright's ``route_from_har`` covers HTTP only and stores every body in
+full, which is why cassettes have their own format.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from .auth import TESTS_DIR
+from .frames import SOCKET_PATH
+
+CASSETTE_DIR = TESTS_DIR / ".cassettes"
+VERSION = 1
+KEPT_HEADERS = ("content-type", "cache-control", "location", "set-cookie")
+
+_API = re.compile(r"^https?://[^/]+/api/")
+_SOCKET = re.compile(re.escape(SOCKET_PATH))
+
+
+def _path(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+
+def _digest(data: Optional[bytes]) -> Optional[str]:
+    return hashlib.sha1(data).hexdigest()[:16] if data else None
+
+
+def _packet_key(frame: str) -> str:
+    """What a client frame asks for: ``42`` events by name, other packets by type."""
+    if frame.startswith("42"):
+        body = frame[2:]
+        if body.startswith("/"):
+            body = body.partition(",")[2]
+        body = body.lstrip("0123456789")
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return "42"
+        return f"42 {data[0]}" if isinstance(data, list) and data and isinstance(data[0], str) else "42"
+    return frame[:2]
+
+
+@dataclass
+class Exchange:
+    method: str
+    path: str
+    request_body: Optional[str]  # digest of the POST data
+    status: int
+    headers: Dict[str, str]
+    body: Optional[str]          # key into Cassette.bodies
+
+
+@dataclass
+class Cassette:
+    case: str
+    exchanges: List[Exchange] = field(default_factory=list)
+    sockets: List[List[Tuple[str, str]]] = field(default_factory=list)  # ("s"|"r", frame) per socket
+    bodies: Dict[str, str] = field(default_factory=dict)                 # digest -> base64
+
+    @staticmethod
+    def path_for(case: str, directory: Path = CASSETTE_DIR) -> Path:
+        return directory / f"{case}.json.gz"
+
+    @classmethod
+    def load(cls, case: str, directory: Path = CASSETTE_DIR) -> Optional["Cassette"]:
+        path = cls.path_for(case, directory)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt") as fh:
+            data = json.load(fh)
+        if data.get("version") != VERSION:
+            return None
+        return cls(
+            case=data["case"],
+            exchanges=[Exchange(**entry) for entry in data["exchanges"]],
+            sockets=[[tuple(frame) for frame in frames] for frames in data["sockets"]],
+            bodies=data["bodies"],
+        )
+
+    def save(self, directory: Path = CASSETTE_DIR) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(self.case, directory)
+        data = {
+            "version": VERSION,
+            "case": self.case,
+            "exchanges": [asdict(exchange) for exchange in self.exchanges],
+            "sockets": self.sockets,
+            "bodies": self.bodies,
+        }
+        with gzip.open(path, "wt") as fh:
+            json.dump(data, fh, separators=(",", ":"))
+        return path
+
+    def add_body(self, data: bytes) -> Optional[str]:
+        key = _digest(data)
+        if key is not None:
+            self.bodies.setdefault(key, base64.b64encode(data).decode("ascii"))
+        return key
+
+
+class Recorder:
+    """Capture ``/api/*`` exchanges and Socket.IO frames of every page in a context."""
+
+    def __init__(self, case: str):
+        self.cassette = Cassette(case)
+        self._pending: List[asyncio.Task] = []
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        context.on("request", self._on_request)
+        context.on("page", self._on_page)
+        for page in context.pages:
+            self._on_page(page)
+
+    def _on_page(self, page: async_api.Page) -> None:
+        page.on("websocket", self._on_websocket)
+
+    def _on_websocket(self, ws: async_api.WebSocket) -> None:
+        if not _SOCKET.search(ws.url):
+            return
+        frames: List[Tuple[str, str]] = []
+        self.cassette.sockets.append(frames)
+        # Binary frames do not occur with the default Socket.IO parser.
+        ws.on("framesent", lambda payload: isinstance(payload, str) and frames.append(("s", payload)))
+        ws.on("framereceived", lambda payload: isinstance(payload, str) and frames.append(("r", payload)))
+
+    def _on_request(self, request: async_api.Request) -> None:
+        if _API.match(request.url) and not _SOCKET.search(request.url):
+            # Reserve the slot when the request is sent, so exchanges stay in request order
+            # however their responses interleave; _capture fills it once the body is in.
+            slot = len(self.cassette.exchanges)
+            self.cassette.exchanges.append(None)
+            self._pending.append(asyncio.ensure_future(self._capture(slot, request)))
+
+    async def _capture(self, slot: int, request: async_api.Request) -> None:
+        try:
+            response = await request.response()
+            if response is None:
+                return
+            body = await response.body()
+            headers = {name: value for name, value in (await response.all_headers()).items() if name in KEPT_HEADERS}
+        except async_api.Error:
+            return  # page closed before the body could be read
+        self.cassette.exchanges[slot] = Exchange(
+            method=request.method,
+            path=_path(request.url),
+            request_body=_digest(request.post_data_buffer),
+            status=response.status,
+            headers=headers,
+            body=self.cassette.add_body(body),
+        )
+
+    async def finish(self) -> Cassette:
+        await asyncio.gather(*self._pending)
+        self.cassette.exchanges = [exchange for exchange in self.cassette.exchanges if exchange is not None]
+        return self.cassette
+
+
+class _SocketReplay:
+    """Answer one client socket from a recorded frame sequence."""
+
+    def __init__(self, ws: async_api.WebSocketRoute, frames: List[Tuple[str, str]]):
+        self.ws = ws
+        # Heartbeats are generated live rather than replayed.
+        self.frames = [(side, frame) for side, frame in frames
+                       if not (side == "r" and frame == "2") and not (side == "s" and frame == "3")]
+        self.cursor = 0
+        self._heartbeat: Optional[asyncio.Task] = None
+        ws.on_message(self._on_message)
+        ws.on_close(lambda code, reason: self._stop())
+        self._flush()
+
+    def _flush(self) -> None:
+        """Send recorded server frames up to the next client frame."""
+        while self.cursor < len(self.frames) and self.frames[self.cursor][0] == "r":
+            frame = self.frames[self.cursor][1]
+            self.ws.send(frame)
+            if frame.startswith("0") and self._heartbeat is None:
+                self._start_heartbeat(frame)
+            self.cursor += 1
+
+    def _start_heartbeat(self, open_packet: str) -> None:
+        try:
+            interval = json.loads(open_packet[1:]).get("pingInterval", 25000) / 1000
+        except ValueError:
+            interval = 25.0
+
+        async def beat() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                self.ws.send("2")
+
+        self._heartbeat = asyncio.ensure_future(beat())
+
+    def _stop(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+
+    def _on_message(self, message: Any) -> None:
+        if not isinstance(message, str) or message == "3":
+            return
+        if message == "2probe":
+            self.ws.send("3probe")
+            return
+        key = _packet_key(message)
+        for index in range(self.cursor, len(self.frames)):
+            side, frame = self.frames[index]
+            if side == "s" and _packet_key(frame) == key:
+                self.cursor = index + 1
+                self._flush()
+                return
+
+
+class Player:
+    """Serve a cassette to a context through ``route`` and ``route_web_socket``."""
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self.misses: List[str] = []
+        self._by_body: Dict[Tuple[str, str, Optional[str]], List[Exchange]] = defaultdict(list)
+        self._by_path: Dict[Tuple[str, str], Exchange] = {}
+        self._served: Dict[Tuple[str, str, Optional[str]], int] = defaultdict(int)
+        self._sockets = 0
+        for exchange in cassette.exchanges:
+            self._by_body[(exchange.method, exchange.path, exchange.request_body)].append(exchange)
+            self._by_path.setdefault((exchange.method, exchange.path), exchange)
+
+    async def attach(self, context: async_api.BrowserContext) -> None:
+        await context.route(_API, self._on_route)
+        await context.route_web_socket(_SOCKET, self._on_socket)
+
+    def _match(self, request: async_api.Request) -> Optional[Exchange]:
+        key = (request.method, _path(request.url), _digest(request.post_data_buffer))
+        recorded = self._by_body.get(key)
+        if recorded:
+            index = min(self._served[key], len(recorded) - 1)
+            self._served[key] += 1
+            return recorded[index]
+        return self._by_path.get(key[:2])
+
+    async def _on_route(self, route: async_api.Route) -> None:
+        request = route.request
+        if _SOCKET.search(request.url):
+            await route.abort("connectionrefused")  # long-polling has no stand-in
+            return
+        exchange = self._match(request)
+        if exchange is None:
+            self.misses.append(f"{request.method} {_path(request.url)}")
+            await route.fulfill(status=404, json={"error": "not in cassette"})
+            return
+        body = base64.b64decode(self.cassette.bodies[exchange.body]) if exchange.body else b""
+        await route.fulfill(status=exchange.status, headers=exchange.headers, body=body)
+
+    def _on_socket(self, ws: async_api.WebSocketRoute) -> None:
+        recorded = self.cassette.sockets
+        if not recorded:
+            self.misses.append(f"socket {_path(ws.url)}")
+            asyncio.ensure_future(ws.close(code=1011, reason="not in cassette"))
+            return
+        frames = recorded[min(self._sockets, len(recorded) - 1)]
+        self._sockets += 1
+        _SocketReplay(ws, frames)
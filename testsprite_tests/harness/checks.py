@@ -0,0 +1,195 @@
+"""Batched in-page assertions: one browser round trip for a group of checks.
+
+Each ``await expect(locator)...`` or ``bounding_box()`` is a round trip to
+the browser. A :class:`Checks` group is collected in Python, sent to the
+page once and evaluated there::
+
+    checks = Checks(page)
+    checks.visible("#home-hub", "#balance-compass", "#dashboards")
+    checks.enabled("#home-hub button", "#balance-compass button")
+    checks.no_overlap("#home-hub", "#balance-compass", "#dashboards", axis="x")
+    checks.text("h1", contains="Task Management")
+    await checks.verify()
+
+:meth:`Checks.verify` polls the whole group inside the page on every
+animation frame until all checks pass, the way ``expect`` retries. A passing
+group costs one call. On timeout a final evaluation collects a structured
+diff, and :class:`ChecksFailed` lists every failing check with what it
+expected and what the page had.
+
+Selectors are CSS, evaluated with ``querySelectorAll``. Visibility and
+enabled state follow Playwright's definitions: a non-empty box and not
+``visibility: hidden``; no ``disabled`` on the element or an enclosing
+fieldset, and no ``aria-disabled="true"``. ``visible``, ``enabled`` and
+``hidden`` apply to every match and fail when nothing matches. ``text``
+passes when any match does. Boxes come from the first match.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from playwright import async_api
+
+DEFAULT_TIMEOUT_MS = 5000
+
+EVALUATE_CHECKS = """
+(checks) => {
+  const all = (selector) => Array.from(document.querySelectorAll(selector));
+  const isVisible = (el) => {
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+  };
+  const isEnabled = (el) => !(el.disabled || el.closest('fieldset[disabled]')
+    || el.getAttribute('aria-disabled') === 'true');
+  const box = (selector) => {
+    const el = document.querySelector(selector);
+    if (!el) return null;
+    const r = el.getBoundingClientRect();
+    return { x: r.x, y: r.y, width: r.width, height: r.height };
+  };
+  const text = (el) => (el.innerText || el.textContent || '').trim();
+  const apart = (a, b, axis) => {
+    const x = a.x + a.width <= b.x || b.x + b.width <= a.x;
+    const y = a.y + a.height <= b.y || b.y + b.height <= a.y;
+    return axis === 'x' ? x : axis === 'y' ? y : x || y;
+  };
+  const textMatches = (value, check) =>
+    (check.equals === undefined || value === check.equals)
+    && (check.contains === undefined || value.includes(check.contains))
+    && (check.matches === undefined || new RegExp(check.matches).test(value));
+
+  return checks.map((check) => {
+    switch (check.kind) {
+      case 'visible':
+      case 'hidden':
+      case 'enabled': {
+        const matches = all(check.selector);
+        const test = check.kind === 'enabled' ? isEnabled : check.kind === 'visible' ? isVisible : (el) => !isVisible(el);
+        const failing = matches.filter((el) => !test(el)).length;
+        if (check.kind === 'hidden') return { ok: failing === 0, actual: { matches: matches.length, visible: failing } };
+        return { ok: matches.length > 0 && failing === 0, actual: { matches: matches.length, failing } };
+      }
+      case 'text': {
+        const values = all(check.selector).map(text);
+        return { ok: values.some((value) => textMatches(value, check)), actual: values.slice(0, 5) };
+      }
+      case 'texts': {
+        const values = all(check.selector).map(text);
+        return { ok: JSON.stringify(values) === JSON.stringify(check.equals), actual: values };
+      }
+      case 'count': {
+        const count = all(check.selector).length;
+        const ok = (check.equals === undefined || count === check.equals)
+          && (check.at_least === undefined || count >= check.at_least)
+          && (check.at_most === undefined || count <= check.at_most);
+        return { ok, actual: count };
+      }
+      case 'title':
+        return { ok: textMatches(document.title, check), actual: document.title };
+      case 'no_overlap': {
+        const boxes = check.selectors.map(box);
+        const missing = check.selectors.filter((_, i) => !boxes[i]);
+        if (missing.length) return { ok: false, actual: { missing } };
+        const overlaps = [];
+        for (let i = 0; i < boxes.length; i++)
+          for (let j = i + 1; j < boxes.length; j++)
+            if (!apart(boxes[i], boxes[j], check.axis)) overlaps.push([check.selectors[i], check.selectors[j]]);
+        return { ok: overlaps.length === 0, actual: { overlaps, boxes } };
+      }
+      default:
+        return { ok: false, actual: `unknown check ${check.kind}` };
+    }
+  });
+}
+"""
+
+# Resolves truthy only once every check passes; polled by wait_for_function.
+ALL_PASS = f"(checks) => ({EVALUATE_CHECKS})(checks).every((result) => result.ok)"
+
+
+@dataclass
+class CheckFailure:
+    kind: str
+    target: str
+    expected: Dict[str, Any]
+    actual: Any
+
+    def __str__(self) -> str:
+        expected = ", ".join(f"{key}={value!r}" for key, value in self.expected.items()) or "pass"
+        return f"{self.kind} {self.target}: expected {expected}, got {self.actual!r}"
+
+
+class ChecksFailed(AssertionError):
+    """Some checks of a group failed; :attr:`failures` has the structured diff."""
+
+    def __init__(self, failures: List[CheckFailure]):
+        self.failures = failures
+        super().__init__(f"{len(failures)} check(s) failed:\n" + "\n".join(f"  {failure}" for failure in failures))
+
+
+@dataclass
+class Checks:
+    page: async_api.Page
+    checks: List[Dict[str, Any]] = field(default_factory=list)
+
+    def _add(self, kind: str, **spec: Any) -> "Checks":
+        self.checks.append({"kind": kind, **{key: value for key, value in spec.items() if value is not None}})
+        return self
+
+    def visible(self, *selectors: str) -> "Checks":
+        for selector in selectors:
+            self._add("visible", selector=selector)
+        return self
+
+    def hidden(self, *selectors: str) -> "Checks":
+        for selector in selectors:
+            self._add("hidden", selector=selector)
+        return self
+
+    def enabled(self, *selectors: str) -> "Checks":
+        for selector in selectors:
+            self._add("enabled", selector=selector)
+        return self
+
+    def text(self, selector: str, *, equals: Optional[str] = None, contains: Optional[str] = None,
+             matches: Optional[str] = None) -> "Checks":
+        return self._add("text", selector=selector, equals=equals, contains=contains, matches=matches)
+
+    def texts(self, selector: str, equals: Sequence[str]) -> "Checks":
+        """The trimmed text of every match, in document order."""
+        return self._add("texts", selector=selector, equals=list(equals))
+
+    def count(self, selector: str, *, equals: Optional[int] = None, at_least: Optional[int] = None,
+              at_most: Optional[int] = None) -> "Checks":
+        return self._add("count", selector=selector, equals=equals, at_least=at_least, at_most=at_most)
+
+    def title(self, *, equals: Optional[str] = None, contains: Optional[str] = None) -> "Checks":
+        return self._add("title", equals=equals, contains=contains)
+
+    def no_overlap(self, *selectors: str, axis: Optional[str] = None) -> "Checks":
+        """The boxes do not overlap; ``axis="x"`` means side by side, ``"y"`` stacked."""
+        return self._add("no_overlap", selectors=list(selectors), axis=axis)
+
+    async def evaluate(self) -> List[CheckFailure]:
+        """Run the group once and return the failing checks."""
+        results = await self.page.evaluate(EVALUATE_CHECKS, self.checks)
+        failures = []
+        for check, result in zip(self.checks, results):
+            if not result["ok"]:
+                expected = {key: value for key, value in check.items() if key not in ("kind", "selector", "selectors")}
+                target = check.get("selector") or ", ".join(check.get("selectors", [])) or "document"
+                failures.append(CheckFailure(check["kind"], target, expected, result["actual"]))
+        return failures
+
+    async def verify(self, timeout: float = DEFAULT_TIMEOUT_MS) -> None:
+        """Wait until every check passes or raise :class:`ChecksFailed` with the diff."""
+        if not self.checks:
+            return
+        try:
+            await self.page.wait_for_function(ALL_PASS, arg=self.checks, polling="raf", timeout=timeout)
+            return
+        except async_api.TimeoutError:
+            pass
+        failures = await self.evaluate()
+        if failures:
+            raise ChecksFailed(failures)
@@ -0,0 +1,225 @@
+"""Two-partner Socket.IO fan-out benchmark for the couple-room events.
+
+Every simulated couple opens two sockets straight to ``server.ts`` (no
+browser), both send ``join:couple``, then the partners take turns sending
+``sync:start``, ``sync:complete``, ``task:update``, ``task:complete`` and
+``memory:create``. Latency is measured from the sender's write to the
+partner socket receiving the matching broadcast, and reported as p50/p95/p99
+per event type. Running several stage sizes (``--couples 50,100,200``) shows
+where a single node stops keeping up.
+
+``join:couple`` checks the users against the database, so the couples come
+from a roster of real rows. Export one with::
+
+    psql "$DATABASE_URL" -Atc "select json_agg(json_build_object(
+        'coupleId', couple_id, 'userId', id, 'name', name, 'role', partner_role))
+        from users" > roster.json
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .session import BASE_URL
+from .sio import SocketClient
+from .stats import Samples
+from .tokens import session_cookie
+
+
+@dataclass
+class Partner:
+    user_id: str
+    name: str
+    role: str  # "partner_a" or "partner_b"
+
+
+@dataclass
+class Couple:
+    id: str
+    partners: List[Partner] = field(default_factory=list)
+
+
+def load_roster(path: Path) -> List[Couple]:
+    """Read couples with exactly two partners from a roster JSON file.
+
+    Accepts the flat user rows from the export in the module docstring, a
+    list of ``{"coupleId", "partners": [{"userId", "name", "role"}]}``, or a
+    ``.jsonl`` file of flat rows as written by ``harness synth --roster``.
+    """
+    with open(path) as fh:
+        if path.suffix == ".jsonl":
+            rows = [json.loads(line) for line in fh if line.strip()]
+        else:
+            rows = json.load(fh) or []
+    couples: Dict[str, Couple] = {}
+    for row in rows:
+        for member in row.get("partners", [row]):
+            couple = couples.setdefault(row["coupleId"], Couple(row["coupleId"]))
+            couple.partners.append(Partner(member["userId"], member.get("name", ""), member.get("role", "")))
+    complete = []
+    for couple in couples.values():
+        if len(couple.partners) != 2:
+            continue
+        roles = {partner.role for partner in couple.partners}
+        if roles != {"partner_a", "partner_b"}:
+            couple.partners[0].role, couple.partners[1].role = "partner_a", "partner_b"
+        couple.partners.sort(key=lambda partner: partner.role)
+        complete.append(couple)
+    return complete
+
+
+@dataclass(frozen=True)
+class FanoutEvent:
+    """A client event and the broadcast the partner socket gets for it."""
+
+    name: str
+    broadcast: str
+    payload: Callable[[int], Dict[str, Any]]
+    matches: Callable[[List[Any], int], bool]
+
+
+def arg_field(args: List[Any], *path: str) -> Any:
+    """``args[0][path[0]][path[1]]...``, or None wherever the shape doesn't fit."""
+    value = args[0] if args else None
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+FANOUT_EVENTS = [
+    FanoutEvent(
+        "sync:start", "partner:activity",
+        lambda probe: {"mood": probe, "energy": 5},
+        # The server folds the payload into a sentence: "started daily sync (mood: 7, energy: 5)".
+        lambda args, probe: f"(mood: {probe}," in (arg_field(args, "activity") or ""),
+    ),
+    FanoutEvent(
+        "sync:complete", "sync:partner_completed",
+        lambda probe: {"syncData": {"probe": probe, "mood": 4, "tags": ["calm"]}},
+        lambda args, probe: arg_field(args, "syncData", "probe") == probe,
+    ),
+    FanoutEvent(
+        "task:update", "task:updated",
+        lambda probe: {"taskId": f"probe-{probe}", "update": {"status": "IN_PROGRESS"}},
+        lambda args, probe: arg_field(args, "taskId") == f"probe-{probe}",
+    ),
+    FanoutEvent(
+        "task:complete", "task:completed",
+        lambda probe: {"taskId": f"probe-{probe}", "title": "Benchmark task", "coins": 10},
+        lambda args, probe: arg_field(args, "taskId") == f"probe-{probe}",
+    ),
+    FanoutEvent(
+        "memory:create", "memory:created",
+        lambda probe: {"memory": {"probe": probe, "title": "Benchmark memory"}},
+        lambda args, probe: arg_field(args, "memory", "probe") == probe,
+    ),
+]
+
+
+@dataclass
+class BenchConfig:
+    base_url: str = BASE_URL
+    secret: Optional[str] = None
+    rounds: int = 10
+    interval: float = 0.0        # pause between events within a couple
+    timeout: float = 5.0         # give up on a broadcast after this long
+    connect_concurrency: int = 50
+    events: List[FanoutEvent] = field(default_factory=lambda: list(FANOUT_EVENTS))
+
+
+async def join(client: SocketClient, couple: Couple, partner: Partner, timeout: float) -> float:
+    """Send ``join:couple`` and return seconds until ``couple:joined`` comes back."""
+    joined = client.expect("couple:joined")
+    failed = client.expect("error")
+    sent = await client.emit("join:couple", {
+        "userId": partner.user_id, "coupleId": couple.id,
+        "partnerRole": partner.role, "name": partner.name,
+    })
+    done, _ = await asyncio.wait({joined, failed}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    if joined in done:
+        failed.cancel()
+        return joined.result().at - sent
+    joined.cancel()
+    if failed in done:
+        message = arg_field(failed.result().args, "message") or "error"
+        raise PermissionError(f"join:couple rejected: {message}")
+    failed.cancel()
+    raise asyncio.TimeoutError("no couple:joined")
+
+
+async def connect_partner(config: BenchConfig, couple: Couple, partner: Partner,
+                          gate: asyncio.Semaphore, samples: Samples) -> SocketClient:
+    cookie = session_cookie(partner.user_id, name=partner.name, couple_id=couple.id, secret=config.secret)
+    client = SocketClient(config.base_url, cookie=cookie)
+    async with gate:
+        started = time.perf_counter()
+        await client.connect(timeout=config.timeout)
+        samples.add("connect", time.perf_counter() - started)
+    return client
+
+
+async def run_couple(config: BenchConfig, couple: Couple, gate: asyncio.Semaphore, samples: Samples) -> None:
+    clients: List[SocketClient] = []
+    try:
+        try:
+            for partner in couple.partners:
+                clients.append(await connect_partner(config, couple, partner, gate, samples))
+            for client, partner in zip(clients, couple.partners):
+                samples.add("join:couple", await join(client, couple, partner, config.timeout))
+        except Exception as exc:
+            samples.error("join:couple" if len(clients) == 2 else "connect", type(exc).__name__)
+            return
+
+        probe = 0
+        for round_no in range(config.rounds):
+            sender, receiver = clients[round_no % 2], clients[1 - round_no % 2]
+            for event in config.events:
+                probe += 1
+                arrived = receiver.expect(event.broadcast, lambda args, probe=probe, event=event: event.matches(args, probe))
+                try:
+                    sent = await sender.emit(event.name, event.payload(probe))
+                    samples.add(event.name, (await asyncio.wait_for(arrived, config.timeout)).at - sent)
+                except asyncio.TimeoutError:
+                    samples.error(event.name, "timeout")
+                except Exception as exc:
+                    samples.error(event.name, type(exc).__name__)
+                    return
+                if config.interval:
+                    await asyncio.sleep(config.interval)
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+
+async def run_stage(config: BenchConfig, couples: List[Couple]) -> Dict[str, Any]:
+    """Run every couple concurrently once; return the per-event summary."""
+    samples = Samples()
+    gate = asyncio.Semaphore(max(1, config.connect_concurrency))
+    started = time.perf_counter()
+    await asyncio.gather(*(run_couple(config, couple, gate, samples) for couple in couples))
+    return {
+        "couples": len(couples),
+        "joined": len(samples.values["join:couple"]) // 2,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "events": samples.summary(),
+    }
+
+
+def capacity(stages: List[Dict[str, Any]], max_p99_ms: float) -> Optional[int]:
+    """Largest stage where every couple joined, nothing failed, and every event's p99 fit."""
+    best = None
+    for stage in stages:
+        events = stage["events"]
+        clean = stage["joined"] == stage["couples"] and not any(entry.get("errors") for entry in events.values())
+        fast = all(entry.get("p99_ms", 0.0) <= max_p99_ms for label, entry in events.items() if label != "connect")
+        if clean and fast:
+            best = max(best or 0, stage["couples"])
+    return best
+
+
+def redis_cost(commands: Dict[str, int], stage: Dict[str, Any]) -> Dict[str, float]:
+    """Redis commands per couple-room event for a stage."""
+    sent = sum(entry["count"] for label, entry in stage["events"].items() if label not in ("connect", "join:couple"))
+    return {name: round(count / sent, 2) if sent else 0.0 for name, count in sorted(commands.items())}
@@ -0,0 +1,378 @@
+"""Seeded template databases and per-worker clones that reset in milliseconds.
+
+Every worker of a parallel run, or every benchmark server, gets its own
+copy of one seeded template. TC008 reassigning chores then cannot change what
+TC010 sees, and resetting a worker means cloning again instead of re-seeding.
+The backend follows ``DATABASE_URL``:
+
+- ``file:...`` (SQLite): the template is a consistent snapshot of the seeded
+  file (``prisma/dev.db`` by default), taken with ``VACUUM INTO`` under
+  ``.databases/``. Clones are reflinks (copy-on-write on btrfs and XFS), or
+  plain copies on filesystems without them.
+- ``postgresql://...``: the template is a database pushed from
+  ``prisma/schema.prisma`` and seeded by ``prisma/seed.ts`` and
+  ``prisma/seed-kids.ts``. It is built under a temporary name and renamed
+  when complete. Clones use ``CREATE DATABASE ... TEMPLATE``, and resets drop
+  with ``FORCE`` (PostgreSQL 13 or later). Needs ``asyncpg``
+  (``pip install asyncpg``).
+
+Templates are named after a hash of what they are built from: the schema
+and seed scripts, plus the seeded file's size and modification time for
+SQLite (hashing a multi-gigabyte ``dev.db`` would cost more than the
+snapshot). A template is rebuilt only when that input changes. Stale
+templates are removed unless another process still holds them: a
+template in use keeps a shared ``flock`` on its ``.lock`` file (SQLite) or
+a shared advisory lock (PostgreSQL) until :meth:`close`, or until its last
+lease ends. Point a server at a clone through its ``url``::
+
+    template = template_for(os.environ["DATABASE_URL"])
+    async with template.lease("worker-1") as clone:
+        async with local_stack(env={"DATABASE_URL": clone.url}) as stack:
+            ...
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, AsyncIterator, Dict, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse, urlunparse
+
+from .auth import REPO_DIR, TESTS_DIR
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+DATABASES_DIR = TESTS_DIR / ".databases"
+PRISMA_DIR = REPO_DIR / "prisma"
+DEV_DB = PRISMA_DIR / "dev.db"
+SEED_INPUTS = (PRISMA_DIR / "schema.prisma", PRISMA_DIR / "seed.ts", PRISMA_DIR / "seed-kids.ts")
+SEED_COMMANDS: Tuple[Tuple[str, ...], ...] = (
+    ("npx", "prisma", "db", "push", "--skip-generate"),
+    ("npx", "tsx", "prisma/seed.ts"),
+    ("npx", "tsx", "prisma/seed-kids.ts"),
+)
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+SQLITE_SIDE_FILES = ("-journal", "-wal", "-shm")
+_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def _key(*paths: Path, stat: Sequence[Path] = ()) -> str:
+    """Hash of the contents of ``paths`` and the size and mtime of ``stat``."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes() if path.exists() else b"")
+    for path in stat:
+        digest.update(path.name.encode())
+        if path.exists():
+            info = path.stat()
+            digest.update(f"{info.st_size}:{info.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def _advisory_key(name: str) -> int:
+    """A signed 64-bit advisory lock key for ``name``."""
+    return int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+
+
+def _check_name(name: str) -> str:
+    if not _NAME.match(name):
+        raise ValueError(f"database clone names are letters, digits, '-' and '_', not {name!r}")
+    return name
+
+
+def clone_file(source: Path, target: Path) -> str:
+    """Copy ``source`` to ``target`` copy-on-write where possible; returns "reflink" or "copy"."""
+    partial = target.with_name(target.name + ".partial")
+    with open(source, "rb") as src, open(partial, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            how = "reflink"
+        except OSError:
+            shutil.copyfileobj(src, dst, 1 << 20)
+            how = "copy"
+    for suffix in SQLITE_SIDE_FILES:
+        target.with_name(target.name + suffix).unlink(missing_ok=True)
+    os.replace(partial, target)
+    return how
+
+
+async def run_seed_commands(commands: Sequence[Sequence[str]], database_url: str) -> None:
+    """Run ``commands`` from the repository root against ``database_url``."""
+    for command in commands:
+        process = await asyncio.create_subprocess_exec(
+            *command, cwd=str(REPO_DIR), env={**os.environ, "DATABASE_URL": database_url},
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        )
+        output, _ = await process.communicate()
+        if process.returncode:
+            tail = output.decode(errors="replace").strip().splitlines()[-10:]
+            raise RuntimeError(f"{' '.join(command)} exited with code {process.returncode}:\n" + "\n".join(tail))
+
+
+@dataclass
+class DatabaseClone:
+    name: str
+    url: str
+    template: "Template"
+
+    async def reset(self) -> None:
+        """Throw away every change since the clone was made, also under a running server."""
+        await self.template.reset(self)
+
+    async def drop(self) -> None:
+        await self.template.drop(self)
+
+
+class SqliteTemplate:
+    """A snapshot of a seeded SQLite file, cloned per worker."""
+
+    def __init__(self, source: Path = DEV_DB, directory: Path = DATABASES_DIR,
+                 seed_commands: Sequence[Sequence[str]] = (), inputs: Sequence[Path] = SEED_INPUTS):
+        self.source = source
+        self.directory = directory
+        self.seed_commands = seed_commands
+        self.inputs = inputs
+        self.path: Optional[Path] = None
+        self.how: Optional[str] = None  # "reflink" or "copy", once something was cloned
+        self._lock: Optional[IO[str]] = None
+        self._leases = 0
+
+    async def build(self) -> str:
+        """Snapshot (and optionally seed) the template unless it is current; returns its path."""
+        if self.path is not None:
+            return str(self.path)
+        if not self.source.exists():
+            raise RuntimeError(f"{self.source} does not exist; create and seed it first")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"template-{_key(*self.inputs, stat=(self.source,))}.db"
+        lock = open(path.with_suffix(".lock"), "a")
+        fcntl.flock(lock, fcntl.LOCK_SH)
+        if not path.exists():
+            # Held exclusively only while building; a template that exists is never rebuilt under a reader.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not path.exists():
+                partial = path.with_name(path.name + ".partial")
+                partial.unlink(missing_ok=True)
+                # A consistent copy even while a dev server holds the source open.
+                with sqlite3.connect(self.source) as connection:
+                    connection.execute("VACUUM INTO ?", (str(partial),))
+                connection.close()
+                await run_seed_commands(self.seed_commands, f"file:{partial}")
+                os.replace(partial, path)
+            fcntl.flock(lock, fcntl.LOCK_SH)
+        self._lock, self.path = lock, path
+        self._remove_stale()
+        return str(path)
+
+    def _remove_stale(self) -> None:
+        """Delete other templates no process holds a shared lock on."""
+        for stale in self.directory.glob("template-*.db"):
+            if stale == self.path:
+                continue
+            with open(stale.with_suffix(".lock"), "a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # still cloned from by another run
+                stale.unlink(missing_ok=True)
+                stale.with_suffix(".lock").unlink(missing_ok=True)
+
+    async def close(self) -> None:
+        """Let other processes remove this template once it is stale."""
+        if self._lock is not None:
+            self._lock.close()
+        self._lock = self.path = None
+
+    def _clone_path(self, name: str) -> Path:
+        return self.directory / f"clone-{_check_name(name)}.db"
+
+    async def clone(self, name: str) -> DatabaseClone:
+        if self.path is None:
+            await self.build()
+        target = self._clone_path(name)
+        self.how = clone_file(self.path, target)
+        return DatabaseClone(name, f"file:{target}", self)
+
+    async def reset(self, clone: DatabaseClone) -> None:
+        # Copied page by page under SQLite's locks rather than replaced, so a server
+        # holding the clone open sees the reset instead of keeping the old file.
+        await self.build()
+        with sqlite3.connect(self.path) as source, sqlite3.connect(self._clone_path(clone.name)) as target:
+            source.backup(target)
+        source.close()
+        target.close()
+
+    async def drop(self, clone: DatabaseClone) -> None:
+        target = self._clone_path(clone.name)
+        for suffix in ("", *SQLITE_SIDE_FILES):
+            target.with_name(target.name + suffix).unlink(missing_ok=True)
+
+    @asynccontextmanager
+    async def lease(self, name: str) -> AsyncIterator[DatabaseClone]:
+        async with _leased(self, name) as clone:
+            yield clone
+
+
+@asynccontextmanager
+async def _leased(template: "Template", name: str) -> AsyncIterator[DatabaseClone]:
+    """A clone dropped on exit; the template is released after its last lease."""
+    template._leases += 1
+    try:
+        clone = await template.clone(name)
+        try:
+            yield clone
+        finally:
+            await clone.drop()
+    finally:
+        template._leases -= 1
+        if not template._leases:
+            await template.close()
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class PostgresTemplate:
+    """A seeded PostgreSQL template database, cloned with ``CREATE DATABASE ... TEMPLATE``."""
+
+    def __init__(self, url: str, prefix: str = "tc", seed_commands: Sequence[Sequence[str]] = SEED_COMMANDS,
+                 inputs: Sequence[Path] = SEED_INPUTS):
+        if asyncpg is None:
+            raise RuntimeError("harness.databases needs the 'asyncpg' package for PostgreSQL: pip install asyncpg")
+        self.url = url
+        self.prefix = _check_name(prefix)
+        self.seed_commands = seed_commands
+        self.name = f"{prefix}_template_{_key(*inputs)}"
+        self._built = False
+        self._holder = None  # connection holding the shared advisory lock on the template
+        self._leases = 0
+        self._copying = asyncio.Lock()  # CREATE DATABASE ... TEMPLATE fails while another copy reads it
+
+    def url_for(self, database: str) -> str:
+        return urlunparse(urlparse(self.url)._replace(path=f"/{database}"))
+
+    async def _admin(self):
+        return await asyncpg.connect(self.url_for("postgres"))
+
+    async def _exists(self, connection, database: str) -> bool:
+        return bool(await connection.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", database))
+
+    async def build(self) -> str:
+        """Create and seed the template unless it is current; returns its name."""
+        if self._built:
+            return self.name
+        self._holder = await self._admin()
+        await self._holder.execute("SELECT pg_advisory_lock_shared($1)", _advisory_key(self.name))
+        connection = await self._admin()
+        try:
+            await self._remove_stale(connection)
+            if await self._exists(connection, self.name):
+                self._built = True
+                return self.name
+            # Built by one process at a time; the others wait, then find it.
+            await connection.execute("SELECT pg_advisory_lock($1)", _advisory_key(f"{self.name}_partial"))
+            if await self._exists(connection, self.name):
+                self._built = True
+                return self.name
+            building = f"{self.name}_partial"
+            await connection.execute(f"DROP DATABASE IF EXISTS {_quote(building)} WITH (FORCE)")
+            await connection.execute(f"CREATE DATABASE {_quote(building)}")
+            await run_seed_commands(self.seed_commands, self.url_for(building))
+            # Renamed only once seeded, so a failed build is never cloned.
+            await connection.execute(f"ALTER DATABASE {_quote(building)} RENAME TO {_quote(self.name)}")
+            await connection.execute(f"ALTER DATABASE {_quote(self.name)} WITH IS_TEMPLATE true")
+            self._built = True
+        finally:
+            await connection.close()  # also releases the build lock
+        return self.name
+
+    async def _remove_stale(self, connection) -> None:
+        """Drop other templates no session holds a shared advisory lock on."""
+        stale = await connection.fetch(
+            "SELECT datname FROM pg_database WHERE datname LIKE $1 AND datname NOT LIKE $2",
+            f"{self.prefix}\\_template\\_%", f"{self.name}%")
+        for row in stale:
+            key = _advisory_key(row["datname"])
+            if not await connection.fetchval("SELECT pg_try_advisory_lock($1)", key):
+                continue  # still cloned from by another run
+            try:
+                await connection.execute(f"ALTER DATABASE {_quote(row['datname'])} WITH IS_TEMPLATE false")
+                await connection.execute(f"DROP DATABASE {_quote(row['datname'])} WITH (FORCE)")
+            finally:
+                await connection.execute("SELECT pg_advisory_unlock($1)", key)
+
+    async def close(self) -> None:
+        """Let other processes drop this template once it is stale."""
+        if self._holder is not None:
+            await self._holder.close()
+        self._holder, self._built = None, False
+
+    def _clone_name(self, name: str) -> str:
+        return f"{self.prefix}_{_check_name(name).replace('-', '_')}"
+
+    async def clone(self, name: str) -> DatabaseClone:
+        database = self._clone_name(name)
+        async with self._copying:
+            await self.build()
+            connection = await self._admin()
+            try:
+                await connection.execute(f"DROP DATABASE IF EXISTS {_quote(database)} WITH (FORCE)")
+                await connection.execute(f"CREATE DATABASE {_quote(database)} TEMPLATE {_quote(self.name)}")
+            finally:
+                await connection.close()
+        return DatabaseClone(name, self.url_for(database), self)
+
+    async def reset(self, clone: DatabaseClone) -> None:
+        await self.clone(clone.name)
+
+    async def drop(self, clone: DatabaseClone) -> None:
+        connection = await self._admin()
+        try:
+            await connection.execute(f"DROP DATABASE IF EXISTS {_quote(self._clone_name(clone.name))} WITH (FORCE)")
+        finally:
+            await connection.close()
+
+    @asynccontextmanager
+    async def lease(self, name: str) -> AsyncIterator[DatabaseClone]:
+        async with _leased(self, name) as clone:
+            yield clone
+
+
+Template = Union[SqliteTemplate, PostgresTemplate]
+
+
+def sqlite_path(database_url: str) -> Path:
+    """The file a ``file:`` URL names; Prisma resolves relative paths against the schema's directory."""
+    path = Path(database_url[len("file:"):].split("?", 1)[0])
+    return path if path.is_absolute() else PRISMA_DIR / path
+
+
+def default_database_url() -> str:
+    return os.environ.get("DATABASE_URL") or f"file:{DEV_DB}"
+
+
+def template_for(database_url: Optional[str] = None, **options) -> Template:
+    """The template backend for ``database_url`` (default: ``$DATABASE_URL``, else ``prisma/dev.db``)."""
+    url = database_url or default_database_url()
+    if url.startswith("file:"):
+        return SqliteTemplate(sqlite_path(url), **options)
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresTemplate(url, **options)
+    raise ValueError(f"no template support for {url.split(':', 1)[0]!r} databases")
+
+
+async def clone_all(template: Template, names: Sequence[str]) -> Dict[str, DatabaseClone]:
+    """One clone per name, made in turn."""
+    await template.build()
+    return {name: await template.clone(name) for name in names}
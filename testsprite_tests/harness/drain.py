@@ -0,0 +1,434 @@
+"""Offline queue drain benchmark for ``public/workers/sync-worker.js``.
+
+The sync worker queues ``SYNC_DATA`` while its WebSocket is down and sends
+the queue once it is back up. ``python -m harness drain`` plays a commute
+through a dead zone against it, once per round, in a fresh context:
+
+1. A page on the app starts the worker and connects it to a sink: a local
+   WebSocket server that records every message with its arrival time.
+2. Signal goes: the context goes offline, the sink cuts the connection
+   (close code 1006, as a dropped radio link gives) and refuses new ones.
+3. ``--actions`` ``SYNC_DATA`` messages are posted to the worker, with
+   priorities drawn from ``--mix``, the way ``useSync().syncData`` does.
+4. After ``--offline-for`` seconds signal returns. The worker gets
+   ``--reconnect-wait`` seconds to reconnect on its own backoff. If it has
+   not, the harness sends ``CONNECT_WEBSOCKET`` as the hook's ``connect()``
+   would. ``--kick`` also sends ``PROCESS_QUEUE`` at once instead of waiting
+   for the worker's 5 s timer.
+
+Each round reports:
+
+- reconnect time, and whether the worker managed it itself
+- time to the first item, drain time from first to last item, and
+  throughput
+- items lost to the queue cap, by requested priority
+- duplicates: the same item arriving twice
+- id collisions: different items under one id. ``--app-ids`` makes ids as
+  ``useSync`` does, ``sync-<Date.now()>``, which a burst repeats
+- arrival order: the share in posting order, inversions where a
+  lower-priority item overtook a higher one, and latency from reconnect
+  per priority
+- load on the sink: connections, messages, bytes and the peak rate in
+  100 ms buckets
+
+The worker talks plain JSON over a WebSocket rather than Socket.IO, so the
+sink stands in for the server it expects. The file in ``public/`` is
+TypeScript. When the browser cannot load it as is, the run says so in
+``worker.load_error`` and serves a copy with the types stripped (by the
+repository's ``typescript`` package), so everything else still measures
+the worker's own logic.
+
+Needs the ``aiohttp`` package (``pip install aiohttp``).
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from playwright import async_api
+
+from .auth import REPO_DIR
+from .pool import BrowserPool
+from .session import BASE_URL, open_app
+from .stats import summarize
+
+try:
+    from aiohttp import web
+except ImportError:  # pragma: no cover - optional dependency
+    web = None
+
+WORKER_URL_PATH = "/workers/sync-worker.js"
+WORKER_FILE = REPO_DIR / "public" / "workers" / "sync-worker.js"
+PRIORITIES = ("high", "medium", "low")
+DEFAULT_MIX = {"high": 1.0, "medium": 3.0, "low": 6.0}
+LOAD_BUCKET = 0.1  # seconds per sink load bucket
+
+# typescript.transpileModule strips the types and leaves the code alone.
+TRANSPILE = ("const ts = require('typescript'); const fs = require('fs');"
+             "process.stdout.write(ts.transpileModule(fs.readFileSync(process.argv[1], 'utf8'),"
+             " {compilerOptions: {target: ts.ScriptTarget.ES2020}}).outputText);")
+
+PROBE_JS = """(url) => new Promise((resolve) => {
+  const worker = new Worker(url);
+  const done = (error) => { clearTimeout(timer); worker.terminate(); resolve(error); };
+  const timer = setTimeout(() => done('no reply to HEARTBEAT'), 3000);
+  worker.onerror = (event) => { event.preventDefault(); done(event.message || 'failed to load'); };
+  worker.onmessage = () => done(null);
+  worker.postMessage({ id: 'probe', action: 'HEARTBEAT' });
+})"""
+
+START_JS = """(url) => {
+  const state = { worker: new Worker(url), replies: [] };
+  state.worker.onmessage = (event) => {
+    const m = event.data;
+    state.replies.push({ id: m.id, type: m.type, success: m.success, data: m.data ?? null, error: m.error ?? null });
+  };
+  window.__drain = state;
+}"""
+
+POST_JS = "(message) => window.__drain.worker.postMessage(message)"
+
+ENQUEUE_JS = """({ prefix, priorities, appIds }) => {
+  priorities.forEach((priority, seq) => {
+    window.__drain.worker.postMessage({
+      id: appIds ? `sync-${Date.now()}` : `${prefix}-${seq}`,
+      action: 'SYNC_DATA',
+      data: { data: { seq, priority, kind: 'task:update' }, retryOnFail: true, priority },
+    });
+  });
+}"""
+
+STATUS_COUNT_JS = """(status) => window.__drain.replies.filter(
+  (r) => r.type === 'CONNECTION' && r.data && r.data.status === status).length"""
+
+QUEUE_JS = """(prefix) => {
+  const replies = window.__drain.replies;
+  const answers = replies.filter((r) => r.type === 'DATA' && typeof r.id === 'string' && r.id.startsWith(prefix));
+  const sizes = replies.filter((r) => r.id === 'queue-updated').map((r) => r.data.queueSize);
+  return {
+    answered: answers.length,
+    queued: answers.filter((r) => r.data && r.data.queued).length,
+    sent: answers.filter((r) => r.data && r.data.sent).length,
+    queue_size: sizes.length ? sizes[sizes.length - 1] : 0,
+    max_queue: sizes.length ? Math.max(...sizes) : 0,
+  };
+}"""
+
+
+@dataclass
+class DrainConfig:
+    actions: int = 300
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    rounds: int = 3
+    offline_for: float = 5.0
+    reconnect_wait: float = 10.0
+    kick: bool = False
+    app_ids: bool = False    # ids as useSync makes them, sync-<Date.now()>, which collide within a millisecond
+    settle: float = 7.0      # quiet seconds after the last arrival that end a round
+    timeout: float = 120.0
+    seed: int = 0
+    base_url: str = BASE_URL
+    headless: bool = True
+
+
+@dataclass
+class Arrival:
+    id: str
+    seq: Optional[int]
+    priority: Optional[str]
+    sync_type: Optional[str]
+    at: float
+    size: int
+
+
+class SyncSink:
+    """The WebSocket server the worker connects to, recording what it sends."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        if web is None:
+            raise RuntimeError("harness.drain needs the 'aiohttp' package: pip install aiohttp")
+        self.host = host
+        self.port = 0
+        self.accepting = True
+        self.arrivals: List[Arrival] = []
+        self.connected_at: List[float] = []
+        self.refused = 0
+        self.messages = 0
+        self.bytes = 0
+        self._open: List[web.Request] = []
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/sync"
+
+    async def __aenter__(self) -> "SyncSink":
+        app = web.Application()
+        app.router.add_get("/sync", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, 0).start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._runner.cleanup()
+
+    def clear(self) -> None:
+        self.arrivals.clear()
+        self.connected_at.clear()
+        self.refused = self.messages = self.bytes = 0
+
+    def go_offline(self) -> None:
+        """Refuse new connections and cut the open ones without a close frame."""
+        self.accepting = False
+        for request in self._open:
+            if request.transport is not None:
+                request.transport.abort()
+        self._open.clear()
+
+    def go_online(self) -> None:
+        self.accepting = True
+
+    async def _handle(self, request: "web.Request") -> "web.StreamResponse":
+        if not self.accepting:
+            self.refused += 1
+            return web.Response(status=503)
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.connected_at.append(time.perf_counter())
+        self._open.append(request)
+        async for message in socket:
+            if message.type != web.WSMsgType.TEXT:
+                continue
+            at = time.perf_counter()
+            self.messages += 1
+            self.bytes += len(message.data)
+            try:
+                payload = json.loads(message.data)
+            except ValueError:
+                continue
+            if payload.get("type") == "SYNC_DATA":
+                data = payload.get("data") if isinstance(payload.get("data"), dict) else {}
+                self.arrivals.append(Arrival(str(payload.get("id")), data.get("seq"), data.get("priority"),
+                                             payload.get("syncType"), at, len(message.data)))
+        if request in self._open:
+            self._open.remove(request)
+        return socket
+
+
+async def transpiled_worker(path: Path = WORKER_FILE) -> str:
+    """``path`` with its TypeScript annotations stripped."""
+    process = await asyncio.create_subprocess_exec(
+        "node", "-e", TRANSPILE, str(path), cwd=str(REPO_DIR),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    output, errors = await process.communicate()
+    if process.returncode:
+        raise RuntimeError(f"could not transpile {path.name} (is typescript installed? npm ci):\n"
+                           + errors.decode(errors="replace")[-2000:])
+    return output.decode()
+
+
+def parse_mix(items: Sequence[str]) -> Dict[str, float]:
+    """``["high=1", "low=6"]`` over :data:`DEFAULT_MIX`."""
+    mix = dict(DEFAULT_MIX)
+    for item in items:
+        priority, _, value = item.partition("=")
+        if priority not in PRIORITIES:
+            raise ValueError(f"no priority {priority!r}; priorities are {', '.join(PRIORITIES)}")
+        mix[priority] = float(value)
+    if not any(mix.values()):
+        raise ValueError("the priority mix is all zero")
+    return mix
+
+
+def priority_inversions(arrivals: Sequence[Arrival]) -> int:
+    """Pairs where an item arrived before one of higher priority that arrived later."""
+    rank = {priority: index for index, priority in enumerate(PRIORITIES)}
+    later = Counter()
+    inversions = 0
+    for arrival in reversed(arrivals):
+        own = rank.get(arrival.priority)
+        if own is None:
+            continue
+        inversions += sum(count for other, count in later.items() if other < own)
+        later[own] += 1
+    return inversions
+
+
+def peak_rate(times: Sequence[float]) -> float:
+    """Busiest :data:`LOAD_BUCKET` window, in messages per second."""
+    if not times:
+        return 0.0
+    buckets = Counter(int((at - times[0]) / LOAD_BUCKET) for at in times)
+    return round(max(buckets.values()) / LOAD_BUCKET, 1)
+
+
+def analyse_round(priorities: List[str], arrivals: List[Arrival], online_at: float,
+                  reconnected_at: Optional[float]) -> Dict[str, Any]:
+    """Loss, duplicates, order and timing of one round's arrivals."""
+    seen: Counter = Counter((arrival.id, arrival.seq) for arrival in arrivals)
+    seqs_by_id: Dict[str, set] = defaultdict(set)
+    for arrival in arrivals:
+        seqs_by_id[arrival.id].add(arrival.seq)
+    first_seen: Dict[int, Arrival] = {}
+    for arrival in arrivals:
+        if arrival.seq is not None and arrival.seq not in first_seen:
+            first_seen[arrival.seq] = arrival
+    ordered = [first_seen[seq] for seq in sorted(first_seen, key=lambda seq: first_seen[seq].at)]
+    lost = Counter(priorities[seq] for seq in range(len(priorities)) if seq not in first_seen)
+    in_order = sum(1 for before, after in zip(ordered, ordered[1:]) if before.seq < after.seq)
+    since = reconnected_at if reconnected_at is not None else online_at
+    latency: Dict[str, List[float]] = defaultdict(list)
+    for arrival in ordered:
+        latency[arrival.priority].append(arrival.at - since)
+    drain = ordered[-1].at - ordered[0].at if ordered else None
+    return {
+        "received": len(first_seen),
+        "lost": sum(lost.values()),
+        "lost_by_priority": {priority: lost[priority] for priority in PRIORITIES if lost[priority]},
+        "duplicates": sum(count - 1 for count in seen.values() if count > 1),
+        "id_collisions": sum(len(seqs) - 1 for seqs in seqs_by_id.values() if len(seqs) > 1),
+        "reconnect_ms": round((reconnected_at - online_at) * 1000, 1) if reconnected_at is not None else None,
+        "first_item_ms": round((ordered[0].at - since) * 1000, 1) if ordered else None,
+        "drain_ms": round(drain * 1000, 1) if drain is not None else None,
+        "items_per_s": round(len(ordered) / drain, 1) if drain else None,
+        "in_order": round(in_order / (len(ordered) - 1), 3) if len(ordered) > 1 else None,
+        "priority_inversions": priority_inversions(ordered),
+        "latency_by_priority": {priority: summarize(latency[priority]) for priority in PRIORITIES if latency[priority]},
+    }
+
+
+async def _wait_until(predicate, timeout: float, interval: float = 0.05) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if await predicate():
+            return True
+        await asyncio.sleep(interval)
+    return await predicate()
+
+
+async def _run_round(pool: BrowserPool, sink: SyncSink, config: DrainConfig, number: int,
+                     worker_source: Optional[str]) -> Dict[str, Any]:
+    rng = random.Random(config.seed + number)
+    names = [priority for priority in PRIORITIES if config.mix.get(priority)]
+    priorities = rng.choices(names, weights=[config.mix[name] for name in names], k=config.actions)
+    prefix = "sync-" if config.app_ids else f"drain{number}"
+    sink.clear()
+    sink.go_online()
+    async with pool.context() as context:
+        if worker_source is not None:
+            await context.route(f"**{WORKER_URL_PATH}",
+                                lambda route: route.fulfill(body=worker_source, content_type="application/javascript"))
+        page = await context.new_page()
+        await open_app(page, config.base_url)
+        await page.evaluate(START_JS, WORKER_URL_PATH)
+        await page.evaluate(POST_JS, {"id": "bench-connect", "action": "CONNECT_WEBSOCKET",
+                                      "data": {"websocketUrl": sink.url}})
+        await page.wait_for_function(f"({STATUS_COUNT_JS})('connected') > 0", timeout=10000)
+
+        await context.set_offline(True)
+        sink.go_offline()
+        await page.wait_for_function(f"({STATUS_COUNT_JS})('disconnected') > 0", timeout=10000)
+        offline_at = time.perf_counter()
+        await page.evaluate(ENQUEUE_JS, {"prefix": prefix, "priorities": priorities, "appIds": config.app_ids})
+        await page.wait_for_function(f"({QUEUE_JS})('{prefix}').answered >= {config.actions}", timeout=30000)
+        queue = await page.evaluate(QUEUE_JS, prefix)
+        await asyncio.sleep(max(0.0, config.offline_for - (time.perf_counter() - offline_at)))
+
+        connections_before = len(sink.connected_at)
+        await context.set_offline(False)
+        sink.go_online()
+        online_at = time.perf_counter()
+
+        async def reconnected() -> bool:
+            return len(sink.connected_at) > connections_before
+
+        self_reconnected = await _wait_until(reconnected, config.reconnect_wait)
+        if not self_reconnected:
+            await page.evaluate(POST_JS, {"id": "bench-reconnect", "action": "CONNECT_WEBSOCKET",
+                                          "data": {"websocketUrl": sink.url}})
+            await _wait_until(reconnected, 10.0)
+        reconnected_at = sink.connected_at[connections_before] if len(sink.connected_at) > connections_before else None
+        if reconnected_at is not None and config.kick:
+            await page.wait_for_function(f"({STATUS_COUNT_JS})('connected') > 1", timeout=10000)
+            await page.evaluate(POST_JS, {"id": "bench-kick", "action": "PROCESS_QUEUE"})
+
+        deadline = online_at + config.timeout
+
+        async def drained() -> bool:
+            now = time.perf_counter()
+            if now >= deadline or reconnected_at is None:
+                return True
+            received = {arrival.seq for arrival in sink.arrivals}
+            if len(received) >= queue["queue_size"]:
+                return True
+            return bool(sink.arrivals) and now - sink.arrivals[-1].at > config.settle
+
+        await _wait_until(drained, config.timeout + config.reconnect_wait)
+        remaining = await page.evaluate(QUEUE_JS, prefix)
+
+    arrivals = list(sink.arrivals)
+    return {
+        "round": number,
+        "actions": config.actions,
+        "posted_by_priority": dict(Counter(priorities)),
+        "queued": queue["queued"],
+        "sent_while_offline": queue["sent"],
+        "queue_size_offline": queue["queue_size"],
+        "max_queue": remaining["max_queue"],
+        "self_reconnected": self_reconnected,
+        **analyse_round(priorities, arrivals, online_at, reconnected_at),
+        "load": {
+            "connections": len(sink.connected_at),
+            "refused": sink.refused,
+            "messages": sink.messages,
+            "bytes": sink.bytes,
+            "peak_per_s": peak_rate([arrival.at for arrival in arrivals]),
+        },
+    }
+
+
+async def run_drain(config: DrainConfig, progress=None) -> Dict[str, Any]:
+    """``config.rounds`` offline/online cycles against the sync worker."""
+    rounds: List[Dict[str, Any]] = []
+    async with SyncSink() as sink, BrowserPool(1, headless=config.headless) as pool:
+        async with pool.context() as context:
+            page = await context.new_page()
+            await open_app(page, config.base_url)
+            load_error = await page.evaluate(PROBE_JS, WORKER_URL_PATH)
+        worker_source = await transpiled_worker() if load_error else None
+        for number in range(config.rounds):
+            try:
+                result = await _run_round(pool, sink, config, number, worker_source)
+            except async_api.TimeoutError as exc:
+                result = {"round": number, "error": str(exc).splitlines()[0]}
+            rounds.append(result)
+            if progress is not None:
+                progress(result)
+    finished = [result for result in rounds if "error" not in result]
+
+    def over_rounds(key: str) -> Dict[str, float]:
+        return summarize([result[key] / 1000 for result in finished if result.get(key) is not None])
+
+    return {
+        "config": asdict(config),
+        "worker": {"path": str(WORKER_FILE.relative_to(REPO_DIR)), "load_error": load_error,
+                   "transpiled": worker_source is not None},
+        "rounds": rounds,
+        "summary": {
+            "reconnect": over_rounds("reconnect_ms"),
+            "first_item": over_rounds("first_item_ms"),
+            "drain": over_rounds("drain_ms"),
+            "lost": sum(result["lost"] for result in finished),
+            "duplicates": sum(result["duplicates"] for result in finished),
+            "id_collisions": sum(result["id_collisions"] for result in finished),
+            "self_reconnected": sum(1 for result in finished if result["self_reconnected"]),
+        },
+    }
@@ -0,0 +1,153 @@
+"""Keep the last steps of a case in memory and write them out only when it fails.
+
+While a :class:`FlightLog` is active (the runner activates one per case),
+every page of the case's context buffers its console output and network
+responses. After each :class:`harness.steps.Steps` step the buffered lines
+and a DOM snapshot are pushed into a ring of the last ``TC_RING_STEPS``
+steps (default 20). A passing case drops the ring. A failing case writes
+it to ``<failures_dir>/<case>/`` together with the state of every open page:
+
+- ``steps.json``: the ring, oldest step first, with console and network
+  lines per step
+- ``step-<page>-<n>.html``: the DOM after each buffered step
+- ``page-<page>.png`` / ``page-<page>.html``: screenshot and DOM at the
+  moment of failure
+- ``trace.zip``: a full Playwright trace, with ``full_trace`` only
+
+``full_trace`` records a Playwright trace with snapshots for every case but
+serializes it only on failure. Passing cases pay for the recording, not for
+writing the archive.
+"""
+
+import json
+import os
+import shutil
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+from playwright import async_api
+
+RING_STEPS = int(os.environ.get("TC_RING_STEPS", "20"))
+MAX_LINES = 200  # console/network lines kept per step
+
+
+@dataclass
+class StepSnapshot:
+    page: int
+    index: int
+    action: str
+    target: str
+    url: str
+    duration_ms: float
+    error: Optional[str] = None
+    console: List[str] = field(default_factory=list)
+    network: List[str] = field(default_factory=list)
+    dom: Optional[str] = field(default=None, repr=False)
+
+
+class _PageBuffer:
+    """Console and network lines of one page since its last step."""
+
+    def __init__(self, page: async_api.Page, number: int):
+        self.page = page
+        self.number = number
+        self.steps = 0
+        self.origin = time.perf_counter()
+        self.console: List[str] = []
+        self.network: List[str] = []
+        page.on("console", lambda message: self._line(self.console, f"{message.type}: {message.text}"))
+        page.on("pageerror", lambda error: self._line(self.console, f"pageerror: {error}"))
+        page.on("response", lambda response: self._line(
+            self.network, f"{response.status} {response.request.method} {response.url}"))
+        page.on("requestfailed", lambda request: self._line(
+            self.network, f"failed {request.method} {request.url}: {request.failure}"))
+
+    def _line(self, lines: List[str], text: str) -> None:
+        if len(lines) < MAX_LINES:
+            lines.append(f"+{(time.perf_counter() - self.origin) * 1000:.0f}ms {text}")
+
+    def take(self) -> tuple:
+        console, network = self.console, self.network
+        self.console, self.network = [], []
+        return console, network
+
+
+class FlightLog:
+    """The ring of recent steps across the pages of one case."""
+
+    def __init__(self, case: str, size: int = RING_STEPS):
+        self.case = case
+        self.ring: Deque[StepSnapshot] = deque(maxlen=size)
+        self._pages: Dict[async_api.Page, _PageBuffer] = {}
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        context.on("page", self._buffer)
+        for page in context.pages:
+            self._buffer(page)
+
+    def _buffer(self, page: async_api.Page) -> _PageBuffer:
+        if page not in self._pages:
+            self._pages[page] = _PageBuffer(page, len(self._pages))
+        return self._pages[page]
+
+    async def step(self, page: async_api.Page, action: str, target: str, duration: float,
+                   error: Optional[str]) -> None:
+        """Push the step that just finished on ``page`` into the ring."""
+        buffer = self._buffer(page)
+        buffer.steps += 1
+        console, network = buffer.take()
+        try:
+            dom = await page.content()
+        except async_api.Error:
+            dom = None  # navigating or closed; the next step or the failure dump has it
+        self.ring.append(StepSnapshot(buffer.number, buffer.steps, action, target, page.url,
+                                      round(duration * 1000, 3), error, console, network, dom))
+
+    async def dump(self, context: async_api.BrowserContext, directory: Path, error: str) -> Path:
+        """Write the ring, screenshots and the failing state to ``directory/<case>``."""
+        target = directory / self.case
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True)
+        pending = []
+        for page, buffer in self._pages.items():
+            console, network = buffer.take()
+            if console or network:
+                pending.append({"page": buffer.number, "console": console, "network": network})
+            if page.is_closed():
+                continue
+            try:
+                await page.screenshot(path=str(target / f"page-{buffer.number}.png"), full_page=True)
+                (target / f"page-{buffer.number}.html").write_text(await page.content())
+            except async_api.Error:
+                pass
+        steps = []
+        for snapshot in self.ring:
+            entry = asdict(snapshot)
+            dom = entry.pop("dom")
+            if dom is not None:
+                name = f"step-{snapshot.page}-{snapshot.index}.html"
+                (target / name).write_text(dom)
+                entry["dom"] = name
+            steps.append(entry)
+        with open(target / "steps.json", "w") as fh:
+            json.dump({"case": self.case, "error": error, "steps": steps, "after_last_step": pending}, fh, indent=2)
+        return target
+
+
+CURRENT_FLIGHT: ContextVar[Optional[FlightLog]] = ContextVar("harness_flight", default=None)
+
+
+@contextmanager
+def recording(case: str, size: int = RING_STEPS) -> Iterator[FlightLog]:
+    """Make every ``Steps`` created in this task push its steps into a new ring."""
+    log = FlightLog(case, size)
+    token = CURRENT_FLIGHT.set(log)
+    try:
+        yield log
+    finally:
+        CURRENT_FLIGHT.reset(token)
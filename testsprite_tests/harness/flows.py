@@ -0,0 +1,27 @@
+"""Multi-step UI flows shared by the plan steps and the auth snapshots."""
+
+from playwright.async_api import expect
+
+from .session import BASE_URL, open_app
+from .steps import Steps
+
+CREDENTIALS_CALLBACK = "/api/auth/callback/credentials"
+
+
+async def log_in(steps: Steps, email: str, password: str, base_url: str = BASE_URL) -> None:
+    """Sign in through the ``/login`` form of ``base_url`` and wait for the Home Hub."""
+    base_url = base_url.rstrip("/")
+    await open_app(steps.page, f"{base_url}/login")
+    await steps.fill("login.email", email)
+    await steps.fill("login.password", password)
+    await steps.click("login.submit", api=CREDENTIALS_CALLBACK)
+    await expect(steps.page).to_have_url(f"{base_url}/")
+
+
+async def complete_daily_sync(steps: Steps) -> None:
+    """Daily Sync step 1 (mood), step 2 (tags), then submit; the card leaves the Home Hub once done."""
+    await steps.click("sync.option", nth=2)
+    await steps.click("sync.next")
+    await steps.click("sync.option", nth=1)
+    await steps.click("sync.option", nth=4)
+    await steps.click("sync.complete", gone="sync.card")
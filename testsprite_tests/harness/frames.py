@@ -0,0 +1,95 @@
+"""Decode Socket.IO traffic seen by a Playwright page."""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from playwright import async_api
+
+SOCKET_PATH = "/api/socketio"
+
+
+@dataclass
+class SocketEvent:
+    name: str
+    args: List[Any]
+    direction: str  # "sent" or "received"
+    at: float       # time.perf_counter() when Playwright reported the frame
+    ack_id: Optional[int] = None
+
+
+def parse_packet(payload: Any) -> Optional[tuple]:
+    """Decode an Engine.IO v4 message frame carrying a Socket.IO EVENT or ACK.
+
+    Returns ``(name, args, ack_id)``; ACK packets are named ``"ack"``. Pings,
+    handshakes and binary frames return None.
+    """
+    if not isinstance(payload, str) or len(payload) < 2 or payload[0] != "4" or payload[1] not in "23":
+        return None
+    kind, rest = payload[1], payload[2:]
+    if rest.startswith("/"):
+        _, _, rest = rest.partition(",")
+    digits = 0
+    while digits < len(rest) and rest[digits].isdigit():
+        digits += 1
+    ack_id = int(rest[:digits]) if digits else None
+    try:
+        data = json.loads(rest[digits:])
+    except ValueError:
+        return None
+    if not isinstance(data, list):
+        return None
+    if kind == "3":
+        return "ack", data, ack_id
+    if not data or not isinstance(data[0], str):
+        return None
+    return data[0], data[1:], ack_id
+
+
+class SocketFrames:
+    """Record Socket.IO events on a page and let steps wait for specific ones."""
+
+    def __init__(self, page: async_api.Page, path: str = SOCKET_PATH):
+        self.path = path
+        self.events: List[SocketEvent] = []
+        self.sockets: List[async_api.WebSocket] = []
+        self.listeners: List[Callable[[SocketEvent], None]] = []
+        self._waiters: List[tuple] = []
+        page.on("websocket", self._on_websocket)
+
+    def _on_websocket(self, ws: async_api.WebSocket) -> None:
+        if self.path not in ws.url:
+            return
+        self.sockets.append(ws)
+        ws.on("framesent", lambda payload: self._record(payload, "sent"))
+        ws.on("framereceived", lambda payload: self._record(payload, "received"))
+
+    def _record(self, payload: Any, direction: str) -> None:
+        packet = parse_packet(payload)
+        if packet is None:
+            return
+        name, args, ack_id = packet
+        event = SocketEvent(name, args, direction, time.perf_counter(), ack_id)
+        self.events.append(event)
+        for listener in self.listeners:
+            listener(event)
+        pending = []
+        for wanted, wanted_direction, future in self._waiters:
+            if future.done():
+                continue  # timed out or cancelled by the caller
+            if name == wanted and direction == wanted_direction:
+                future.set_result(event)
+            else:
+                pending.append((wanted, wanted_direction, future))
+        self._waiters = pending
+
+    def expect(self, name: str, direction: str = "received") -> "asyncio.Future[SocketEvent]":
+        """Return a future for the next ``name`` event; create it before acting."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((name, direction, future))
+        return future
+
+    def since(self, started: float) -> List[SocketEvent]:
+        return [event for event in self.events if event.at >= started]
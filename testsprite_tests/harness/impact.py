@@ -0,0 +1,318 @@
+"""Map each TC to the source files it exercises and pick TCs for a diff.
+
+With ``run --impact`` every case's pages record V8 precise coverage over CDP
+plus the documents and ``/api/*`` routes they request. At the end of the case
+this becomes a set of repository files:
+
+- browser modules with at least one executed function. In development
+  webpack names them ``webpack-internal:///(...)/./src/...``. Production
+  chunks are mapped through their source maps, where every source of an
+  executed chunk counts.
+- the app router files that served each requested path: ``route.ts`` for
+  API routes, and ``page.tsx`` plus the layouts above it for pages. Each
+  comes with the local modules it imports, transitively, so a change to
+  ``src/lib/db.ts`` reaches every case that hits a route using it.
+
+``.impact.json`` keeps these per case. A passing run replaces a case's
+entry. A failing run only adds to it, since it stopped before exercising
+everything. ``run --changed`` diffs the tree against ``--since`` and runs
+the cases whose files intersect the diff. It also runs cases with no entry
+yet, and every case when a global file (dependencies, config, server,
+schema, the harness itself) changed. The cases it runs refresh their
+entries, so the index stays current without full runs.
+"""
+
+import asyncio
+import json
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+from playwright import async_api
+
+from .auth import REPO_DIR, TESTS_DIR
+
+IMPACT_PATH = TESTS_DIR / ".impact.json"
+APP_DIR = REPO_DIR / "src" / "app"
+TESTS_PREFIX = "testsprite_tests/"
+
+# A change to any of these can affect every case.
+GLOBAL_FILES = {
+    "package.json", "package-lock.json", "next.config.ts", "tsconfig.json", "server.ts",
+    "tailwind.config.ts", "postcss.config.mjs", "src/middleware.ts", "src/app/globals.css",
+}
+GLOBAL_PREFIXES = ("prisma/", "public/", "testsprite_tests/harness/")
+
+_WEBPACK_SOURCE = re.compile(r"^(?:webpack-internal:///|webpack://[^/]*/)(?:\([^)]*\)/)?\./(?P<path>[^?]+)")
+_IMPORT = re.compile(r"""(?:from\s*|import\s*\(\s*|import\s+|require\(\s*)['"](?P<spec>[@./][^'"]*)['"]""")
+_EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.tsx", "/index.js")
+_ROUTE_FILES = ("page", "route")
+_PAGE_WRAPPERS = ("layout", "template", "loading", "error", "not-found")
+
+
+def _relative(path: Path) -> Optional[str]:
+    try:
+        return path.resolve().relative_to(REPO_DIR).as_posix()
+    except ValueError:
+        return None
+
+
+def _source_file(url: str) -> Optional[str]:
+    """Repository path named by a webpack module or source map URL."""
+    match = _WEBPACK_SOURCE.match(url)
+    if not match:
+        return None
+    path = match.group("path")
+    if path.startswith("node_modules/") or not (REPO_DIR / path).is_file():
+        return None
+    return path
+
+
+class ImportGraph:
+    """Local modules imported by a source file, resolved like ``tsconfig`` paths."""
+
+    def __init__(self, root: Path = REPO_DIR):
+        self.root = root
+        self._imports: Dict[str, Set[str]] = {}
+
+    def _resolve(self, source: Path, spec: str) -> Optional[str]:
+        if spec.startswith("@/"):
+            base = self.root / "src" / spec[2:]
+        elif spec.startswith("."):
+            base = source.parent / spec
+        else:
+            return None  # a package
+        for extension in _EXTENSIONS:
+            candidate = Path(f"{base}{extension}")
+            if candidate.is_file():
+                return _relative(candidate)
+        return None
+
+    def imports(self, path: str) -> Set[str]:
+        if path not in self._imports:
+            source = self.root / path
+            try:
+                text = source.read_text(errors="replace")
+            except OSError:
+                text = ""
+            resolved = (self._resolve(source, match.group("spec")) for match in _IMPORT.finditer(text))
+            self._imports[path] = {found for found in resolved if found}
+        return self._imports[path]
+
+    def closure(self, paths: Iterable[str]) -> Set[str]:
+        seen: Set[str] = set()
+        pending = list(paths)
+        while pending:
+            path = pending.pop()
+            if path not in seen:
+                seen.add(path)
+                pending.extend(self.imports(path) - seen)
+        return seen
+
+
+@dataclass
+class _Route:
+    segments: List[str]   # "[id]", "[...slug]" and "[[...slug]]" are dynamic
+    file: str
+    wrappers: List[str]   # layouts and friends from the app root down
+
+    def matches(self, parts: List[str]) -> bool:
+        for index, segment in enumerate(self.segments):
+            if segment.startswith("[[..."):
+                return True
+            if segment.startswith("[..."):
+                return len(parts) > index
+            if index >= len(parts) or not (segment.startswith("[") or segment == parts[index]):
+                return False
+        return len(parts) == len(self.segments)
+
+
+class RouteTable:
+    """App router files serving a URL path."""
+
+    def __init__(self, app_dir: Path = APP_DIR, graph: Optional[ImportGraph] = None):
+        self.graph = graph or ImportGraph()
+        self.routes: List[_Route] = []
+        if not app_dir.is_dir():
+            return
+        for path in sorted(app_dir.rglob("*")):
+            if path.stem not in _ROUTE_FILES or path.suffix not in (".ts", ".tsx", ".js", ".jsx"):
+                continue
+            directories = path.parent.relative_to(app_dir).parts
+            segments = [part for part in directories if not part.startswith(("(", "@"))]
+            wrappers = []
+            for depth in range(len(directories) + 1):
+                folder = app_dir.joinpath(*directories[:depth])
+                for name in _PAGE_WRAPPERS:
+                    wrappers.extend(_relative(found) for found in folder.glob(f"{name}.*"))
+            self.routes.append(_Route(segments, _relative(path), wrappers if path.stem == "page" else []))
+        # Static segments beat dynamic ones, as in Next.js.
+        self.routes.sort(key=lambda route: sum(segment.startswith("[") for segment in route.segments))
+
+    def files_for(self, url_path: str) -> Set[str]:
+        parts = [part for part in url_path.split("/") if part]
+        for route in self.routes:
+            if route.matches(parts):
+                return self.graph.closure([route.file, *route.wrappers])
+        return set()
+
+
+class ImpactCollector:
+    """Coverage and requested paths of every page in one case's context."""
+
+    def __init__(self, routes: RouteTable):
+        self.routes = routes
+        self.scripts: Set[str] = set()
+        self.paths: Set[str] = set()
+        self._sessions: List[Tuple[async_api.Page, async_api.CDPSession]] = []
+        self._starting: List[asyncio.Future] = []
+        self._maps: Dict[str, Set[str]] = {}
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        context.on("page", self._on_page)
+        for page in context.pages:
+            self._on_page(page)
+
+    def _on_page(self, page: async_api.Page) -> None:
+        page.on("request", self._on_request)
+        self._starting.append(asyncio.ensure_future(self._start(page)))
+
+    def _on_request(self, request: async_api.Request) -> None:
+        path = urlparse(request.url).path
+        if request.resource_type == "document" or path.startswith("/api/"):
+            self.paths.add(path)
+
+    async def _start(self, page: async_api.Page) -> None:
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Profiler.enable")
+            await session.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": False})
+        except async_api.Error:
+            return  # not Chromium, or the page closed already
+        self._sessions.append((page, session))
+
+    async def _take(self, session: async_api.CDPSession) -> None:
+        try:
+            coverage = await session.send("Profiler.takePreciseCoverage")
+        except async_api.Error:
+            return
+        for script in coverage["result"]:
+            if any(function["ranges"][0]["count"] for function in script["functions"]):
+                self.scripts.add(script["url"])
+
+    async def _map_sources(self, context: async_api.BrowserContext, url: str) -> Set[str]:
+        """Sources listed in the source map of a production chunk."""
+        if url not in self._maps:
+            sources: Set[str] = set()
+            try:
+                response = await context.request.get(url + ".map", timeout=5000)
+                if response.ok:
+                    for source in (await response.json()).get("sources", []):
+                        found = _source_file(urljoin("webpack://_N_E/", source)) or _source_file(source)
+                        if found:
+                            sources.add(found)
+            except (async_api.Error, ValueError):
+                pass
+            self._maps[url] = sources
+        return self._maps[url]
+
+    async def finish(self, context: async_api.BrowserContext) -> Set[str]:
+        """Repository files the case touched; call before the context closes."""
+        await asyncio.gather(*self._starting)
+        await asyncio.gather(*(self._take(session) for page, session in self._sessions if not page.is_closed()))
+        files: Set[str] = set()
+        for url in self.scripts:
+            found = _source_file(url)
+            if found:
+                files.add(found)
+            elif url.startswith("http") and "/_next/static/" in url:
+                files |= await self._map_sources(context, url)
+        for path in self.paths:
+            files |= self.routes.files_for(path)
+        return files
+
+
+@dataclass
+class ImpactIndex:
+    path: Path = IMPACT_PATH
+    cases: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    routes: RouteTable = field(default_factory=RouteTable, repr=False)
+
+    @classmethod
+    def load(cls, path: Path = IMPACT_PATH) -> "ImpactIndex":
+        if not path.exists():
+            return cls(path)
+        with open(path) as fh:
+            return cls(path, json.load(fh).get("cases", {}))
+
+    def collector(self) -> ImpactCollector:
+        return ImpactCollector(self.routes)
+
+    def save(self) -> None:
+        with open(self.path, "w") as fh:
+            json.dump({"version": 1, "cases": dict(sorted(self.cases.items()))}, fh, indent=2)
+
+    def update(self, case_id: str, files: Set[str], complete: bool) -> None:
+        if not complete:
+            files = files | set(self.cases.get(case_id, {}).get("files", []))
+        self.cases[case_id] = {"files": sorted(files), "commit": head_commit(), "updated": int(time.time())}
+
+    def select(self, case_ids: Iterable[str], changed: Iterable[str]) -> Dict[str, str]:
+        """Case id -> why it must run, for the cases a diff can affect."""
+        changed = set(changed)
+        reasons: Dict[str, str] = {}
+        everything = sorted(path for path in changed if path in GLOBAL_FILES or path.startswith(GLOBAL_PREFIXES))
+        for case_id in case_ids:
+            entry = self.cases.get(case_id)
+            scripts = [path for path in changed if path.startswith(f"{TESTS_PREFIX}{case_id}_")]
+            if everything:
+                reasons[case_id] = f"global change: {everything[0]}"
+            elif scripts:
+                reasons[case_id] = f"script changed: {scripts[0]}"
+            elif entry is None:
+                reasons[case_id] = "no coverage recorded yet"
+            else:
+                hits = sorted(changed & set(entry["files"]))
+                if hits:
+                    reasons[case_id] = f"covers {hits[0]}" + (f" (+{len(hits) - 1} more)" if len(hits) > 1 else "")
+        return reasons
+
+    def uncovered(self, changed: Iterable[str]) -> List[str]:
+        """Changed source files no recorded case exercises."""
+        covered = set().union(*(set(entry["files"]) for entry in self.cases.values())) if self.cases else set()
+        return sorted(path for path in changed if path.startswith("src/") and path not in covered)
+
+
+def _git(*args: str) -> List[str]:
+    try:
+        output = subprocess.run(["git", *args], cwd=REPO_DIR, check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError) as exc:
+        raise RuntimeError(f"git {' '.join(args)} failed: {(getattr(exc, 'stderr', '') or str(exc)).strip()}") from None
+    return [line for line in output.splitlines() if line]
+
+
+def head_commit() -> str:
+    try:
+        return _git("rev-parse", "--short", "HEAD")[0]
+    except RuntimeError:
+        return ""
+
+
+def default_since() -> str:
+    """The current branch's upstream, or the previous commit when it has none."""
+    try:
+        return _git("rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{upstream}")[0]
+    except (RuntimeError, IndexError):
+        return "HEAD~1"
+
+
+def changed_files(since: str) -> List[str]:
+    """Files changed since the merge base with ``since``, plus uncommitted and untracked ones."""
+    changed = set(_git("diff", "--name-only", f"{since}...HEAD"))
+    changed.update(_git("diff", "--name-only", "HEAD"))
+    changed.update(_git("ls-files", "--others", "--exclude-standard"))
+    return sorted(changed)
@@ -0,0 +1,294 @@
+"""Check every state a TC reaches against ``lighthouse-budget.json``.
+
+Lighthouse CI loads a few URLs cold. With ``run --lighthouse`` the same
+budget file applies to every route and UI state the TC scripts reach:
+opened modals, Kids tabs, each Daily Sync step. It reuses the contexts the
+cases already run in, with no browser of its own.
+
+A state is what the page shows after a :class:`harness.steps.Steps` step,
+plus each document as loaded before its first step (or at the end of the
+case when no step ran on it). For every state the tracker reports:
+
+- requests and transfer size by Lighthouse resource type (``document``,
+  ``script``, ``stylesheet``, ``image``, ``media``, ``font``, ``other``,
+  ``third-party``, ``total``). These come from Playwright's request events,
+  subscribed as each page opens so its first document counts too, and
+  cover everything the document loaded up to that state, so a lazily
+  loaded chunk counts against the route it was loaded on.
+- load metrics of the document, checked once per document at its first
+  state: ``first-contentful-paint``, ``largest-contentful-paint``,
+  ``cumulative-layout-shift``, ``total-blocking-time``, ``interactive``
+  (the later of DOMContentLoaded and the last long task) and
+  ``max-potential-fid`` (the longest task)
+
+The budget entry that applies is the last one whose ``path`` matches the
+state's URL path, as in Lighthouse. ``*`` matches anything and a trailing
+``$`` anchors the end. Metrics the harness cannot measure (``speed-index``,
+``first-meaningful-paint``) are listed as unsupported instead of checked.
+Each budget is reported once per route, at the first state that breaks it.
+"""
+
+import asyncio
+import json
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from .budgets import READ_VITALS
+
+# Resolved here rather than taken from harness.auth, which imports harness.steps, which imports this.
+LIGHTHOUSE_BUDGET = Path(__file__).resolve().parent.parent.parent / "lighthouse-budget.json"
+RESOURCE_TYPES = ("document", "script", "stylesheet", "image", "media", "font", "other", "third-party", "total")
+MEASURED_TYPES = {"document", "script", "stylesheet", "image", "media", "font"}  # Playwright's resource types
+# Lighthouse metric -> READ_VITALS reading.
+METRICS = {
+    "first-contentful-paint": lambda vitals: vitals.get("fcp"),
+    "largest-contentful-paint": lambda vitals: vitals.get("lcp"),
+    "cumulative-layout-shift": lambda vitals: vitals.get("cls"),
+    "total-blocking-time": lambda vitals: vitals.get("blockingMs"),
+    "interactive": lambda vitals: max(vitals.get("domContentLoaded") or 0, vitals.get("longTaskEnd") or 0) or None,
+    "max-potential-fid": lambda vitals: vitals.get("longestTaskMs"),
+}
+
+
+@dataclass
+class BudgetEntry:
+    path: str = "/"
+    timings: Dict[str, float] = field(default_factory=dict)         # metric -> ms (CLS unitless)
+    resource_sizes: Dict[str, float] = field(default_factory=dict)  # resource type -> KiB
+    resource_counts: Dict[str, int] = field(default_factory=dict)   # resource type -> requests
+    first_party_hosts: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        anchored = self.path.endswith("$")
+        pattern = re.escape(self.path.rstrip("$")).replace(r"\*", ".*")
+        self._pattern = re.compile(pattern + ("$" if anchored else ""))
+
+    def matches(self, path: str) -> bool:
+        return bool(self._pattern.match(path))
+
+
+class LighthouseBudget:
+    """The entries of a Lighthouse ``budget.json``."""
+
+    def __init__(self, entries: List[BudgetEntry], source: str = ""):
+        self.entries = entries
+        self.source = source
+
+    @classmethod
+    def load(cls, path: Path = LIGHTHOUSE_BUDGET) -> "LighthouseBudget":
+        with open(path) as fh:
+            data = json.load(fh)
+        entries = []
+        for raw in data:
+            entries.append(BudgetEntry(
+                path=raw.get("path", "/"),
+                timings={item["metric"]: item["budget"] for item in raw.get("timings", [])},
+                resource_sizes={item["resourceType"]: item["budget"] for item in raw.get("resourceSizes", [])},
+                resource_counts={item["resourceType"]: item["budget"] for item in raw.get("resourceCounts", [])},
+                first_party_hosts=raw.get("options", {}).get("firstPartyHostnames", []),
+            ))
+        return cls(entries, str(path))
+
+    def for_path(self, path: str) -> Optional[BudgetEntry]:
+        matching = [entry for entry in self.entries if entry.matches(path)]
+        return matching[-1] if matching else None
+
+    def unsupported(self) -> List[str]:
+        return sorted({metric for entry in self.entries for metric in entry.timings if metric not in METRICS})
+
+
+@dataclass
+class StateResult:
+    case: str
+    state: str                 # "<path> load", "<path> after <action> <target>" or "<path> end"
+    path: str
+    resources: Dict[str, Dict[str, float]]
+    timings: Dict[str, Optional[float]] = field(default_factory=dict)
+    violations: List[str] = field(default_factory=list)
+
+
+class _PageResources:
+    """Requests of the page's current document, from the page's request events.
+
+    The handlers are registered synchronously when the page opens, before
+    anything navigates it; sizes are read once each request finishes.
+    """
+
+    def __init__(self, page: async_api.Page):
+        self.page = page
+        self.document = 0
+        self.checked: Optional[int] = None   # document whose load metrics were checked
+        self.states_of_document = 0
+        self.requests: Dict[async_api.Request, Tuple[str, str]] = {}  # request -> (resource type, host)
+        self.sizes: Dict[async_api.Request, int] = {}
+        self._pending: Set["asyncio.Future[None]"] = set()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+
+    def _on_request(self, request: async_api.Request) -> None:
+        # A redirect is the same navigation.
+        if request.is_navigation_request() and request.redirected_from is None and self._in_main_frame(request):
+            self.document += 1
+            self.states_of_document = 0
+            self.requests.clear()
+            self.sizes.clear()
+        host = urlparse(request.url).hostname or ""
+        kind = request.resource_type if request.resource_type in MEASURED_TYPES else "other"
+        self.requests[request] = (kind, host)
+
+    def _in_main_frame(self, request: async_api.Request) -> bool:
+        try:
+            return request.frame == self.page.main_frame
+        except async_api.Error:
+            return False  # a service worker's request has no frame
+
+    def _on_finished(self, request: async_api.Request) -> None:
+        if request in self.requests:
+            future = asyncio.ensure_future(self._read_size(request))
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+
+    async def _read_size(self, request: async_api.Request) -> None:
+        try:
+            sizes = await request.sizes()
+        except async_api.Error:
+            return  # the page closed first
+        if request in self.requests:  # not of a document navigated away from meanwhile
+            self.sizes[request] = sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+    async def settle(self) -> None:
+        """Wait for the sizes of requests that already finished."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending))
+
+    def totals(self, first_party: List[str]) -> Dict[str, Dict[str, float]]:
+        counts: Dict[str, int] = defaultdict(int)
+        sizes: Dict[str, int] = defaultdict(int)
+        for request, (kind, host) in self.requests.items():
+            buckets = [kind, "total"]
+            if host and not any(host == name or host.endswith("." + name) for name in first_party):
+                buckets.append("third-party")
+            for bucket in buckets:
+                counts[bucket] += 1
+                sizes[bucket] += self.sizes.get(request, 0)
+        return {kind: {"requests": counts[kind], "kib": round(sizes[kind] / 1024, 1)}
+                for kind in RESOURCE_TYPES if kind in counts}
+
+
+class StateBudgets:
+    """Track one case's pages and check each state it reaches against a :class:`LighthouseBudget`."""
+
+    def __init__(self, budget: LighthouseBudget, case: str):
+        self.budget = budget
+        self.case = case
+        self.states: List[StateResult] = []
+        self._pages: Dict[async_api.Page, _PageResources] = {}
+        self._reported: set = set()
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        context.on("page", self._open)
+        for page in context.pages:
+            self._open(page)
+
+    def _open(self, page: async_api.Page) -> _PageResources:
+        if page not in self._pages:
+            self._pages[page] = _PageResources(page)
+        return self._pages[page]
+
+    async def _tracker(self, page: async_api.Page) -> Optional[_PageResources]:
+        if page.is_closed():
+            return None
+        tracker = self._open(page)
+        await tracker.settle()
+        return tracker
+
+    async def before_step(self, page: async_api.Page) -> None:
+        """Record the document as loaded if no state of it was taken yet."""
+        tracker = await self._tracker(page)
+        if tracker is not None and tracker.states_of_document == 0:
+            await self._snapshot(tracker, "load")
+
+    async def after_step(self, page: async_api.Page, action: str, target: str) -> None:
+        tracker = await self._tracker(page)
+        if tracker is not None:
+            await self._snapshot(tracker, f"after {action} {target}")
+
+    async def finish(self, context: async_api.BrowserContext) -> None:
+        """Take a last state of every open page whose document was never recorded."""
+        for page in list(self._pages):
+            if page.is_closed():
+                continue
+            tracker = await self._tracker(page)
+            if tracker is not None and tracker.states_of_document == 0:
+                await self._snapshot(tracker, "end")
+
+    async def _snapshot(self, tracker: _PageResources, label: str) -> None:
+        path = urlparse(tracker.page.url).path or "/"
+        entry = self.budget.for_path(path)
+        first_party = (entry.first_party_hosts if entry and entry.first_party_hosts
+                       else [urlparse(tracker.page.url).hostname or ""])
+        state = StateResult(self.case, f"{path} {label}", path, tracker.totals(first_party))
+        tracker.states_of_document += 1
+        if tracker.checked != tracker.document:
+            tracker.checked = tracker.document
+            try:
+                vitals = await tracker.page.evaluate(READ_VITALS)
+            except async_api.Error:
+                vitals = {}
+            state.timings = {metric: read(vitals) for metric, read in METRICS.items()}
+        if entry is not None:
+            state.violations = self._check(entry, state)
+        self.states.append(state)
+
+    def _check(self, entry: BudgetEntry, state: StateResult) -> List[str]:
+        violations = []
+
+        def over(key: str, message: str) -> None:
+            if (state.path, key) not in self._reported:
+                self._reported.add((state.path, key))
+                violations.append(f"{state.state}: {message}")
+
+        for kind, limit in entry.resource_sizes.items():
+            kib = state.resources.get(kind, {}).get("kib", 0.0)
+            if kib > limit:
+                over(f"size {kind}", f"{kind} {kib:g} KiB > {limit:g} KiB")
+        for kind, limit in entry.resource_counts.items():
+            count = state.resources.get(kind, {}).get("requests", 0)
+            if count > limit:
+                over(f"count {kind}", f"{count} {kind} requests > {limit}")
+        for metric, limit in entry.timings.items():
+            value = state.timings.get(metric)
+            if value is not None and value > limit:
+                unit = "" if metric == "cumulative-layout-shift" else " ms"
+                over(metric, f"{metric} {value:.4g}{unit} > {limit:g}{unit}")
+        return violations
+
+    @property
+    def violations(self) -> List[str]:
+        return [violation for state in self.states for violation in state.violations]
+
+    def report(self) -> Dict[str, Any]:
+        return {"budget": self.budget.source, "unsupported": self.budget.unsupported(),
+                "states": [asdict(state) for state in self.states]}
+
+
+CURRENT_STATES: ContextVar[Optional[StateBudgets]] = ContextVar("harness_states", default=None)
+
+
+@contextmanager
+def budgeting(budget: Optional[LighthouseBudget], case: str) -> Iterator[Optional[StateBudgets]]:
+    """Check the states of every ``Steps`` created in this task against ``budget``."""
+    states = StateBudgets(budget, case) if budget is not None else None
+    token = CURRENT_STATES.set(states)
+    try:
+        yield states
+    finally:
+        CURRENT_STATES.reset(token)
@@ -0,0 +1,285 @@
+"""Open-loop HTTP load generator for the task and Daily Sync API routes.
+
+Drives ``/api/tasks`` (GET and POST), ``/api/tasks/assign``,
+``/api/tasks/complete`` and ``/api/sync/complete`` directly over one pooled
+``aiohttp`` session. Arrivals follow a Poisson process at a fixed rate that
+does not slow down when the server does (open loop), and latency is measured
+from each request's scheduled arrival, so queueing in the client counts
+against the server instead of hiding it. Requests beyond ``max_inflight`` are
+shed and counted as errors rather than queued. A completion that arrives
+while no task is open sends nothing and is counted as skipped.
+
+The operation mixes in :data:`MIXES` follow the PRD's user flows: Daily Sync
+check-ins and Home Hub/task views dominate a weekday, couples plan
+micro-offers across the three balance forces (Play & Romance, Duty,
+Self-care) during the Weekly Yagna Loop, complete them for Lakshmi Coins,
+and occasionally ask the load balancer to reassign chores.
+
+Needs the ``aiohttp`` package (``pip install aiohttp``).
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .session import BASE_URL
+from .stats import Samples, histogram
+from .tokens import session_cookie
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+# Weighted by the three relational forces; categories match the coin
+# multipliers in src/app/api/tasks/complete/route.ts.
+TASK_CATEGORIES = [("romance", 3), ("household", 3), ("parenting", 2), ("personal", 1), ("health", 1)]
+MICRO_OFFERS = {
+    "romance": ["Plan a surprise chai date", "Write a love note", "Cook their favourite dinner"],
+    "household": ["Take over grocery run", "Fix the kitchen tap", "Sort the laundry"],
+    "parenting": ["Handle school drop-off", "Bedtime story night", "Pack tomorrow's tiffin"],
+    "personal": ["Evening walk alone", "Read for 30 minutes"],
+    "health": ["Morning yoga together", "Prepare a healthy lunch"],
+}
+MOOD_TAGS = ["happy", "tired", "calm", "stressed", "energetic", "grateful", "anxious", "content"]
+
+
+@dataclass
+class Operation:
+    name: str            # reported label, e.g. "POST /api/sync/complete"
+    weight: float
+    build: Callable[["LoadRun", "SimUser"], Optional[Tuple[str, str, Optional[Dict[str, Any]], Dict[str, str]]]]
+    on_success: Optional[Callable[["LoadRun", Any], None]] = None
+
+
+@dataclass
+class SimUser:
+    couple: int
+    partner: str         # "partner_a" or "partner_b"
+    cookie: str = ""
+
+
+def _weighted(choices: List[Tuple[str, float]]) -> str:
+    names, weights = zip(*choices)
+    return random.choices(names, weights)[0]
+
+
+def _sync(run: "LoadRun", user: SimUser):
+    body = {
+        "partner": user.partner,
+        "mood_score": random.randint(1, 5),
+        "energy_level": random.randint(1, 10),
+        "mood_tags": random.sample(MOOD_TAGS, random.randint(1, 3)),
+        "context_notes": "",
+    }
+    return "POST", "/api/sync/complete", body, {}
+
+
+def _list_tasks(run: "LoadRun", user: SimUser):
+    return "GET", "/api/tasks", None, {}
+
+
+def _create_task(run: "LoadRun", user: SimUser):
+    category = _weighted(TASK_CATEGORIES)
+    due = datetime.now(timezone.utc) + timedelta(days=random.randint(1, 7))
+    body = {
+        "title": random.choice(MICRO_OFFERS[category]),
+        "description": "Weekly Yagna Loop micro-offer",
+        "assigned_to": random.choice([user.partner, "both"]),
+        "category": category,
+        "due_at": due.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+    }
+    return "POST", "/api/tasks", body, {}
+
+
+def _complete_task(run: "LoadRun", user: SimUser):
+    if not run.open_tasks:
+        return None  # nothing to complete yet; counted as skipped, not as a server error
+    return "POST", "/api/tasks/complete", {"task_id": run.open_tasks.popleft()}, {}
+
+
+def _assign(run: "LoadRun", user: SimUser):
+    # The route is limited to ADMIN sessions; without one it only measures the 403 path.
+    return "POST", "/api/tasks/assign", {}, {"Cookie": run.admin_cookie} if run.admin_cookie else {}
+
+
+def _remember_task(run: "LoadRun", body: Any) -> None:
+    if isinstance(body, dict):
+        run.offer_task(body)
+
+
+def _remember_tasks(run: "LoadRun", body: Any) -> None:
+    if isinstance(body, list):
+        for task in body:
+            if isinstance(task, dict):
+                run.offer_task(task)
+
+
+SYNC = Operation("POST /api/sync/complete", 0.0, _sync)
+LIST_TASKS = Operation("GET /api/tasks", 0.0, _list_tasks, _remember_tasks)
+CREATE_TASK = Operation("POST /api/tasks", 0.0, _create_task, _remember_task)
+COMPLETE_TASK = Operation("POST /api/tasks/complete", 0.0, _complete_task)
+ASSIGN = Operation("POST /api/tasks/assign", 0.0, _assign)
+
+
+def _mix(**weights: float) -> List[Operation]:
+    operations = {"sync": SYNC, "list": LIST_TASKS, "create": CREATE_TASK, "complete": COMPLETE_TASK, "assign": ASSIGN}
+    return [replace(operations[name], weight=weight) for name, weight in weights.items() if weight]
+
+
+MIXES = {
+    # A weekday: everyone checks in (Daily Sync target is >40% of couples) and glances at the Home Hub.
+    "daily": _mix(sync=0.30, list=0.30, create=0.20, complete=0.15, assign=0.05),
+    # Morning ritual peak: the 60-second check-in dominates.
+    "morning-sync": _mix(sync=0.60, list=0.30, complete=0.10),
+    # Sunday Weekly Yagna Loop: planning micro-offers and rebalancing chores.
+    "weekly-loop": _mix(sync=0.05, list=0.25, create=0.40, complete=0.20, assign=0.10),
+}
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = BASE_URL
+    rate: float = 20.0              # arrivals per second
+    duration: float = 30.0          # seconds of arrivals per stage
+    couples: int = 100              # simulated couples the arrivals are spread over
+    max_connections: int = 100      # size of the keep-alive connection pool
+    max_inflight: int = 1000        # shed arrivals beyond this many open requests
+    timeout: float = 30.0
+    secret: Optional[str] = None    # NEXTAUTH_SECRET for per-user session cookies
+    mix: List[Operation] = field(default_factory=lambda: list(MIXES["daily"]))
+    seed: Optional[int] = None
+
+
+@dataclass
+class LoadRun:
+    config: LoadConfig
+    session: Any
+    samples: Samples = field(default_factory=Samples)
+    statuses: Dict[str, Dict[int, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    skipped: Dict[str, int] = field(default_factory=lambda: defaultdict(int))  # arrivals with nothing to send
+    open_tasks: Deque[str] = field(default_factory=deque)
+    known_tasks: Set[str] = field(default_factory=set)  # every id ever queued, so none is completed twice
+    users: List[SimUser] = field(default_factory=list)
+    admin_cookie: str = ""
+    inflight: int = 0
+
+    def __post_init__(self) -> None:
+        for couple in range(self.config.couples):
+            for partner in ("partner_a", "partner_b"):
+                self.users.append(SimUser(couple, partner))
+        try:
+            for user in self.users:
+                user.cookie = session_cookie(f"load-{user.couple}-{user.partner}", secret=self.config.secret)
+            self.admin_cookie = session_cookie("load-admin", role="ADMIN", secret=self.config.secret)
+        except RuntimeError:
+            pass  # no secret or no cryptography: run the routes anonymously, as the demo UI does
+
+    def offer_task(self, task: Dict[str, Any]) -> None:
+        task_id = task.get("id")
+        if task_id and task.get("status") != "COMPLETED" and task_id not in self.known_tasks:
+            self.known_tasks.add(task_id)
+            self.open_tasks.append(task_id)
+
+    async def request(self, operation: Operation, scheduled: float) -> None:
+        user = random.choice(self.users)
+        built = operation.build(self, user)
+        if built is None:
+            self.skipped[operation.name] += 1
+            return
+        method, path, body, headers = built
+        if user.cookie and "Cookie" not in headers:
+            headers = {**headers, "Cookie": user.cookie}
+        self.inflight += 1
+        try:
+            async with self.session.request(method, self.config.base_url + path, json=body, headers=headers) as response:
+                payload = await response.read()
+                elapsed = time.perf_counter() - scheduled
+                self.statuses[operation.name][response.status] += 1
+                if response.status >= 400:
+                    self.samples.error(operation.name, f"http_{response.status}")
+                    return
+                self.samples.add(operation.name, elapsed)
+                if operation.on_success is not None:
+                    operation.on_success(self, json.loads(payload))
+        except asyncio.TimeoutError:
+            self.samples.error(operation.name, "timeout")
+        except aiohttp.ClientError as exc:
+            self.samples.error(operation.name, type(exc).__name__)
+        except ValueError:
+            self.samples.error(operation.name, "bad_json")
+        finally:
+            self.inflight -= 1
+
+
+async def _arrivals(run: LoadRun) -> List[asyncio.Task]:
+    """Fire operations at Poisson arrival times for ``config.duration`` seconds."""
+    config = run.config
+    operations = [(operation, operation.weight) for operation in config.mix]
+    tasks = []
+    start = time.perf_counter()
+    next_at = start
+    while True:
+        next_at += random.expovariate(config.rate)
+        if next_at - start >= config.duration:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        operation = random.choices([op for op, _ in operations], [w for _, w in operations])[0]
+        if run.inflight >= config.max_inflight:
+            run.samples.error(operation.name, "shed")
+            continue
+        tasks.append(asyncio.create_task(run.request(operation, next_at)))
+    return tasks
+
+
+async def run_load(config: LoadConfig) -> Dict[str, Any]:
+    """Run one open-loop stage at ``config.rate`` and summarize it per route."""
+    if aiohttp is None:
+        raise RuntimeError("harness.load needs the 'aiohttp' package: pip install aiohttp")
+    if config.seed is not None:
+        random.seed(config.seed)
+    connector = aiohttp.TCPConnector(limit=config.max_connections, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=config.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        run = LoadRun(config, session)
+        # Seed the completion queue with whatever is still open.
+        await run.request(LIST_TASKS, time.perf_counter())
+        run.samples = Samples()
+        run.statuses.clear()
+        run.skipped.clear()
+
+        started = time.perf_counter()
+        tasks = await _arrivals(run)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    routes: Dict[str, Any] = {}
+    report = run.samples.summary()
+    for name, entry in report.items():
+        ok = entry["count"]
+        errors = sum(entry.get("errors", {}).values())
+        routes[name] = {
+            **entry,
+            "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / (ok + errors), 4) if ok + errors else 0.0,
+            "statuses": dict(run.statuses.get(name, {})),
+            "skipped": run.skipped.get(name, 0),
+            "histogram": histogram(run.samples.values.get(name, [])),
+        }
+    total_ok = sum(entry["count"] for entry in report.values())
+    total_errors = sum(sum(entry.get("errors", {}).values()) for entry in report.values())
+    return {
+        "rate": config.rate,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total_ok / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(total_errors / (total_ok + total_errors), 4) if total_ok + total_errors else 0.0,
+        "skipped": sum(run.skipped.values()),
+        "routes": routes,
+    }
@@ -0,0 +1,253 @@
+"""Named locators for the Leela OS UI.
+
+Each entry lists candidate strategies in order of preference: ``data-testid``
+first, then ARIA role and accessible name, then form label, then visible text,
+and finally the absolute XPath the TC scripts were recorded with. A page
+binding resolves a name once, remembers which strategy matched and reuses
+that locator for the rest of the page's life.
+
+Every resolution is tallied on the registry, so after a run against a new UI
+build :meth:`LocatorRegistry.stale` lists the names that no longer match
+anything or only survive through their XPath fallback. Names registered with
+nothing but an XPath are listed on every run, used or not.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from playwright import async_api
+
+TEST_ID = "test_id"
+ROLE = "role"
+LABEL = "label"
+TEXT = "text"
+XPATH = "xpath"
+STRATEGIES = (TEST_ID, ROLE, LABEL, TEXT, XPATH)
+
+DEFAULT_RESOLVE_TIMEOUT_MS = 5000
+
+
+class StaleLocatorError(LookupError):
+    """None of a named locator's strategies matched the page."""
+
+
+@dataclass(frozen=True)
+class LocatorSpec:
+    name: str
+    test_id: Optional[str] = None
+    role: Optional[str] = None
+    role_name: Optional[str] = None
+    label: Optional[str] = None
+    text: Optional[str] = None
+    xpath: Optional[str] = None
+
+    @property
+    def semantic(self) -> bool:
+        """Whether the spec has a strategy other than its XPath fallback."""
+        return bool(self.test_id or self.role or self.label or self.text)
+
+    def candidates(self, page: async_api.Page) -> List[Tuple[str, async_api.Locator]]:
+        found = []
+        if self.test_id:
+            found.append((TEST_ID, page.get_by_test_id(self.test_id)))
+        if self.role:
+            found.append((ROLE, page.get_by_role(self.role, name=self.role_name, exact=True)))
+        if self.label:
+            found.append((LABEL, page.get_by_label(self.label, exact=True)))
+        if self.text:
+            found.append((TEXT, page.get_by_text(self.text, exact=True)))
+        if self.xpath:
+            found.append((XPATH, page.locator(f"xpath={self.xpath}")))
+        return found
+
+
+class LocatorRegistry:
+    def __init__(self, specs: Iterable[LocatorSpec] = ()):
+        self._specs: Dict[str, LocatorSpec] = {}
+        self._resolved: Dict[str, Counter] = defaultdict(Counter)
+        self._missed: Counter = Counter()
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: LocatorSpec) -> None:
+        if spec.name in self._specs:
+            raise ValueError(f"locator '{spec.name}' is already registered")
+        if not (spec.semantic or spec.xpath):
+            raise ValueError(f"locator '{spec.name}' has no strategy")
+        self._specs[spec.name] = spec
+
+    def __getitem__(self, name: str) -> LocatorSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(f"unknown locator '{name}'") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def names(self) -> List[str]:
+        return sorted(self._specs)
+
+    def bind(self, page: async_api.Page) -> "PageLocators":
+        return PageLocators(self, page)
+
+    def _record(self, name: str, strategy: Optional[str]) -> None:
+        if strategy is None:
+            self._missed[name] += 1
+        else:
+            self._resolved[name][strategy] += 1
+
+    def report(self) -> Dict[str, dict]:
+        """Per-name resolution counts: ``{name: {"resolved": {...}, "missed": n}}``."""
+        return {
+            name: {"resolved": dict(self._resolved.get(name, {})), "missed": self._missed.get(name, 0)}
+            for name in self.names()
+            if name in self._resolved or name in self._missed
+        }
+
+    def stale(self) -> Dict[str, str]:
+        """Names that missed, only matched through XPath, or have nothing but an XPath, with the reason."""
+        stale = {}
+        for name, entry in self.report().items():
+            if entry["missed"]:
+                stale[name] = "no strategy matched"
+            elif set(entry["resolved"]) == {XPATH} and self._specs[name].semantic:
+                stale[name] = "matched only by XPath fallback"
+        for name in self.names():
+            if name not in stale and not self._specs[name].semantic:
+                stale[name] = "XPath only: add a data-testid or role"
+        return stale
+
+
+class PageLocators:
+    """A registry bound to one page, caching the strategy chosen per name."""
+
+    def __init__(self, registry: LocatorRegistry, page: async_api.Page):
+        self.registry = registry
+        self.page = page
+        self._chosen: Dict[str, async_api.Locator] = {}
+
+    async def resolve(self, name: str, timeout: float = DEFAULT_RESOLVE_TIMEOUT_MS) -> async_api.Locator:
+        if name in self._chosen:
+            return self._chosen[name]
+
+        candidates = self.registry[name].candidates(self.page)
+        # Wait once for whichever strategy shows up first, then pick the
+        # most preferred one that matches.
+        anyone = candidates[0][1]
+        for _, locator in candidates[1:]:
+            anyone = anyone.or_(locator)
+        try:
+            await anyone.first.wait_for(state="attached", timeout=timeout)
+        except async_api.TimeoutError:
+            self.registry._record(name, None)
+            raise StaleLocatorError(f"locator '{name}' matched nothing within {timeout:.0f} ms") from None
+
+        for strategy, locator in candidates:
+            if await locator.count():
+                self.registry._record(name, strategy)
+                self._chosen[name] = locator
+                return locator
+        self.registry._record(name, None)
+        raise StaleLocatorError(f"locator '{name}' detached while resolving")
+
+
+_SYNC = "html/body/div[2]/div/div/div[3]/div/div[2]/div[3]"
+_NAV = "html/body/div[2]/div[3]/div"
+_FAB = "html/body/div[2]/div[2]"
+_LOGIN = "html/body/div[2]/div/div[2]"
+_KIDS = "html/body/div[2]/div/main/div/div/div/div[2]"
+_TASKS = "html/body/div[2]/div/div/div[2]/div[2]"
+_RITUALS = "html/body/div[2]/div/div/div[3]"
+
+LOCATORS = LocatorRegistry([
+    # Bottom navigation (BottomNavigation's seven tabs, in order)
+    LocatorSpec("nav.home", test_id="nav-home", xpath=f"{_NAV}/button[1]"),
+    LocatorSpec("nav.tasks", test_id="nav-tasks", xpath=f"{_NAV}/button[2]"),
+    LocatorSpec("nav.together", test_id="nav-together", xpath=f"{_NAV}/button[3]"),
+    LocatorSpec("nav.rituals", test_id="nav-rituals", xpath=f"{_NAV}/button[4]"),
+    LocatorSpec("nav.goals", test_id="nav-goals", xpath=f"{_NAV}/button[5]"),
+    LocatorSpec("nav.kids", test_id="nav-kids", xpath=f"{_NAV}/button[6]"),
+    LocatorSpec("nav.profile", test_id="nav-profile", xpath=f"{_NAV}/button[7]"),
+
+    # Floating action button and its menu
+    LocatorSpec("fab.toggle", test_id="fab-toggle", role="button", role_name="Toggle actions",
+                xpath=f"{_FAB}/button"),
+    LocatorSpec("fab.daily_sync", test_id="fab-action-daily-sync", role="button", role_name="Daily Sync",
+                xpath=f"{_FAB}/div/div[1]/button"),
+    LocatorSpec("fab.add_memory", test_id="fab-action-add-memory", role="button", role_name="Add Memory",
+                xpath=f"{_FAB}/div/div[2]/button"),
+    LocatorSpec("fab.ai_coach", test_id="fab-action-ai-coach", role="button", role_name="AI Coach",
+                xpath=f"{_FAB}/div/div[3]/button"),
+
+    # Daily Sync card (mood emojis on step 1, tags on step 2)
+    LocatorSpec("sync.card", test_id="daily-sync-card", xpath=_SYNC),
+    LocatorSpec("sync.option", test_id="daily-sync-option", xpath=f"{_SYNC}/div/div/button"),
+    LocatorSpec("sync.next", test_id="daily-sync-next", role="button", role_name="Next Step",
+                xpath=f"{_SYNC}/button"),
+    LocatorSpec("sync.complete", test_id="daily-sync-complete", role="button", role_name="Complete Sync",
+                xpath=f"{_SYNC}/div[2]/button[2]"),
+    LocatorSpec("sync.energy", test_id="daily-sync-energy", role="slider", role_name="Energy level",
+                xpath=f"{_SYNC}/div[2]/div/input"),
+
+    # Login page
+    LocatorSpec("login.email", label="Email", xpath=f"{_LOGIN}/form/div[1]/input"),
+    LocatorSpec("login.password", label="Password", xpath=f"{_LOGIN}/form/div[2]/input"),
+    LocatorSpec("login.submit", role="button", role_name="Sign In", xpath=f"{_LOGIN}/form/button"),
+    LocatorSpec("login.demo", role="button", role_name="Demo Login (Arjun & Priya)",
+                xpath=f"{_LOGIN}/div/button[1]"),
+    LocatorSpec("login.skip", role="button", role_name="Skip Sign In (Demo Mode)",
+                xpath=f"{_LOGIN}/div/button[2]"),
+
+    # Home Hub
+    LocatorSpec("home.coin_card", test_id="home-coin-card", xpath="html/body/div[2]/div/div/div[2]/div/div"),
+    LocatorSpec("home.memory_jukebox", role="button", role_name="View Memory Jukebox",
+                xpath="html/body/div[2]/div/div/div[4]/button"),
+    LocatorSpec("home.weekend_try_now", role="button", role_name="Try Now",
+                xpath="html/body/div[2]/div/div/div[6]/div[2]/div[2]/div[5]/button"),
+
+    # Profile and settings
+    LocatorSpec("profile.edit", role="button", role_name="Edit Profile",
+                xpath="html/body/div[2]/div/div/div[2]/div/div[8]/button[1]"),
+    LocatorSpec("profile.settings", role="button", role_name="Settings",
+                xpath="html/body/div[2]/div/div/div[2]/div/div[8]/button[2]"),
+    LocatorSpec("dialog.close", role="button", role_name="Close", xpath="html/body/div[5]/button"),
+
+    # Tasks (one edit and start button per card; pick a card with nth)
+    LocatorSpec("tasks.add", role="button", role_name="Add Task", xpath=f"{_TASKS}/div[2]/div/div/button"),
+    LocatorSpec("tasks.edit", test_id="task-edit", xpath=f"{_TASKS}/div[3]/div/div/div[2]/button[1]"),
+    LocatorSpec("tasks.start", test_id="task-start", xpath=f"{_TASKS}/div[3]/div/div/div[2]/button[2]"),
+    LocatorSpec("tasks.dialog", test_id="task-dialog", role="dialog", role_name="Add New Task",
+                xpath="html/body/div[2]/div/div/div[3]/div"),
+    LocatorSpec("tasks.dialog.cancel", test_id="task-dialog-cancel",
+                xpath="html/body/div[2]/div/div/div[3]/div/div[3]/button[1]"),
+    LocatorSpec("tasks.dialog.save", test_id="task-dialog-save",
+                xpath="html/body/div[2]/div/div/div[3]/div/div[3]/button[2]"),
+
+    # Rituals (ids from RitualSystem's ritual list)
+    LocatorSpec("rituals.morning_connection.repeat", test_id="ritual-start-1",
+                xpath=f"{_RITUALS}/div[2]/div[2]/div/div/div[2]/button[2]"),
+    LocatorSpec("rituals.evening_unwind.start", test_id="ritual-start-2",
+                xpath=f"{_RITUALS}/div[2]/div[2]/div[2]/div/div[2]/button[2]"),
+    LocatorSpec("rituals.session", test_id="ritual-session", role="dialog", role_name="Active ritual",
+                xpath=f"{_RITUALS}/div/div"),
+    LocatorSpec("rituals.session.pause", test_id="ritual-session-pause", role="button", role_name="Pause",
+                xpath=f"{_RITUALS}/div/div/div/div[4]/button[1]"),
+    LocatorSpec("rituals.session.complete", test_id="ritual-session-next",
+                xpath=f"{_RITUALS}/div/div/div/div[4]/button[2]"),
+
+    # Kids Dashboard
+    LocatorSpec("kids.tab.todays_fun", role="tab", role_name="Today's Fun", xpath=f"{_KIDS}/div/button[1]"),
+    LocatorSpec("kids.tab.my_growth", role="tab", role_name="My Growth", xpath=f"{_KIDS}/div/button[2]"),
+    LocatorSpec("kids.tab.ask_leela", role="tab", role_name="Ask Leela", xpath=f"{_KIDS}/div/button[3]"),
+    LocatorSpec("kids.tab.my_stars", role="tab", role_name="My Stars", xpath=f"{_KIDS}/div/button[4]"),
+    LocatorSpec("kids.todays_fun.kind_act", test_id="kids-kind-act", role="button",
+                role_name="Add your kind act for today", xpath=f"{_KIDS}/div[2]/div[2]/div/div/div[6]/button"),
+    LocatorSpec("kids.todays_fun.kindness_stars", test_id="kids-kindness-stars"),
+    LocatorSpec("kids.my_growth.see_progress", test_id="kids-see-progress",
+                xpath=f"{_KIDS}/div[3]/div/div/div/button"),
+    LocatorSpec("kids.ask_leela.understanding_feelings", test_id="kids-ask-leela-feelings",
+                xpath=f"{_KIDS}/div[4]/div/div/div[3]/div/button"),
+    LocatorSpec("kids.my_stars.celebrate", test_id="kids-celebrate"),
+])
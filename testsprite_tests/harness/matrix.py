@@ -0,0 +1,205 @@
+"""Run a script's layout checks on many device profiles at once.
+
+A TC script opts in with a module-level check, called once per viewport::
+
+    async def check_viewport(page, viewport):
+        axis = "y" if viewport.is_mobile and not viewport.landscape else "x"
+        await Checks(page).visible(*components).no_overlap(*components, axis=axis).verify()
+
+``python -m harness matrix`` opens ``VIEWPORT_PATH`` (default ``/``) for
+every device and orientation in its own context and calls the check. All
+contexts come from the same pooled browsers and run concurrently, so ten
+more profiles cost roughly one profile's wall clock. Each run also records
+whether the page scrolls sideways, the most common responsive breakage.
+All results go into one report, with the structured diff of failing
+:class:`harness.checks.Checks`.
+
+:data:`DEVICES` covers the Android phones the PRD's audience, urban Indian
+parents, mostly carry: 720p budget phones at 360 CSS pixels, 1080p
+mid-rangers between 384 and 412, and a desktop for comparison.
+"""
+
+import asyncio
+import json
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from playwright import async_api
+
+from .auth import AuthStore
+from .checks import ChecksFailed
+from .pool import BrowserPool
+from .runner import ERROR, FAILED, PASSED, TestCase
+from .session import BASE_URL, open_app
+
+PORTRAIT = "portrait"
+LANDSCAPE = "landscape"
+ORIENTATIONS = (PORTRAIT, LANDSCAPE)
+
+# Chrome for Android reports this reduced user agent whatever the model.
+ANDROID_CHROME_UA = ("Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) "
+                     "Chrome/124.0.0.0 Mobile Safari/537.36")
+# Status bar plus Chrome's address bar, taken off the screen height.
+BROWSER_CHROME_PX = 80
+
+
+@dataclass(frozen=True)
+class DeviceProfile:
+    name: str
+    width: int           # screen in CSS pixels, portrait
+    height: int
+    scale: float         # device pixel ratio
+    is_mobile: bool = True
+    user_agent: Optional[str] = ANDROID_CHROME_UA
+
+    def context_options(self, orientation: str) -> Dict[str, Any]:
+        """``Browser.new_context`` options for the device held in ``orientation``."""
+        width, height = (self.height, self.width) if orientation == LANDSCAPE else (self.width, self.height)
+        options: Dict[str, Any] = {
+            "screen": {"width": width, "height": height},
+            "viewport": {"width": width, "height": height - (BROWSER_CHROME_PX if self.is_mobile else 0)},
+            "device_scale_factor": self.scale,
+            "is_mobile": self.is_mobile,
+            "has_touch": self.is_mobile,
+        }
+        if self.user_agent:
+            options["user_agent"] = self.user_agent
+        return options
+
+
+DEVICES: Dict[str, DeviceProfile] = {device.name: device for device in [
+    DeviceProfile("redmi-12c", 360, 800, 2.0),            # 720x1600, also Redmi A2 / Poco C-series
+    DeviceProfile("vivo-y16", 360, 806, 2.0),             # 720x1612
+    DeviceProfile("galaxy-a05", 384, 853, 1.875),         # 720x1600
+    DeviceProfile("galaxy-m14", 384, 856, 2.8125),        # 1080x2408, also Galaxy A14
+    DeviceProfile("redmi-note-13", 393, 873, 2.75),       # 1080x2400, also Poco M6 Pro
+    DeviceProfile("realme-narzo-60", 393, 873, 2.75),     # 1080x2400
+    DeviceProfile("galaxy-a54", 412, 892, 2.625),         # 1080x2340, also Galaxy M34
+    DeviceProfile("oneplus-nord-ce3", 412, 915, 2.625),   # 1080x2400
+    DeviceProfile("desktop", 1280, 720, 1.0, is_mobile=False, user_agent=None),
+]}
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """What ``check_viewport`` is told about the context it runs in."""
+
+    device: str
+    orientation: str
+    width: int
+    height: int
+    is_mobile: bool
+
+    @property
+    def landscape(self) -> bool:
+        return self.orientation == LANDSCAPE
+
+    @property
+    def label(self) -> str:
+        return f"{self.device}@{self.width}x{self.height}"
+
+
+@dataclass
+class ViewportResult:
+    case: str
+    viewport: Viewport
+    status: str
+    duration: float
+    error: Optional[str] = None
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+    overflow_x: Optional[int] = None    # CSS pixels the page scrolls sideways
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PASSED
+
+
+def select_devices(names: Iterable[str]) -> List[DeviceProfile]:
+    names = list(names)
+    unknown = [name for name in names if name not in DEVICES]
+    if unknown:
+        raise ValueError(f"unknown device(s) {', '.join(unknown)}; known: {', '.join(DEVICES)}")
+    return [DEVICES[name] for name in names] if names else list(DEVICES.values())
+
+
+def matrix_cases(cases: Iterable[TestCase]) -> List[TestCase]:
+    """The cases whose script defines ``check_viewport``."""
+    return [case for case in cases if "check_viewport" in case.path.read_text()]
+
+
+async def _run_viewport(pool: BrowserPool, auth: Optional[AuthStore], case: TestCase, module: Any,
+                        device: DeviceProfile, orientation: str, base_url: str) -> ViewportResult:
+    options = device.context_options(orientation)
+    viewport = Viewport(device.name, orientation, options["viewport"]["width"], options["viewport"]["height"],
+                        device.is_mobile)
+    started = time.perf_counter()
+    profile = getattr(module, "STORAGE_STATE", None)
+    lease = auth.context(profile, **options) if auth and profile else pool.context(**options)
+    overflow = None
+    try:
+        async with lease as context:
+            context.set_default_timeout(5000)
+            page = await context.new_page()
+            await open_app(page, base_url.rstrip("/") + getattr(module, "VIEWPORT_PATH", "/"))
+            try:
+                await module.check_viewport(page, viewport)
+            finally:
+                try:
+                    overflow = await page.evaluate(
+                        "() => document.documentElement.scrollWidth - document.documentElement.clientWidth")
+                except async_api.Error:
+                    pass
+    except ChecksFailed as exc:
+        failures = [asdict(failure) for failure in exc.failures]
+        return ViewportResult(case.id, viewport, FAILED, time.perf_counter() - started, str(exc), failures, overflow)
+    except AssertionError as exc:
+        return ViewportResult(case.id, viewport, FAILED, time.perf_counter() - started,
+                              str(exc) or "assertion failed", overflow_x=overflow)
+    except Exception:
+        return ViewportResult(case.id, viewport, ERROR, time.perf_counter() - started,
+                              traceback.format_exc(limit=3), overflow_x=overflow)
+    return ViewportResult(case.id, viewport, PASSED, time.perf_counter() - started, overflow_x=overflow)
+
+
+async def run_matrix(
+    cases: List[TestCase],
+    devices: List[DeviceProfile],
+    *,
+    orientations: Iterable[str] = ORIENTATIONS,
+    workers: int = 16,
+    browsers: int = 1,
+    headless: bool = True,
+    use_auth: bool = True,
+    base_url: str = BASE_URL,
+) -> List[ViewportResult]:
+    """Every case on every device and orientation, at most ``workers`` contexts at once.
+
+    Desktop profiles only run in their natural orientation.
+    """
+    semaphore = asyncio.Semaphore(max(1, workers))
+    modules = {case.id: case.load_module() for case in cases}
+
+    async with BrowserPool(browsers, headless=headless) as pool:
+        auth = AuthStore(pool) if use_auth else None
+
+        async def bounded(case: TestCase, device: DeviceProfile, orientation: str) -> ViewportResult:
+            async with semaphore:
+                return await _run_viewport(pool, auth, case, modules[case.id], device, orientation, base_url)
+
+        runs = [(case, device, orientation) for case in cases for device in devices
+                for orientation in orientations if device.is_mobile or orientation == PORTRAIT]
+        return list(await asyncio.gather(*(bounded(*run) for run in runs)))
+
+
+def write_report(path: Path, results: List[ViewportResult], wall_clock: float) -> Dict[str, Any]:
+    report = {
+        "wall_clock": round(wall_clock, 3),
+        "serial": round(sum(result.duration for result in results), 3),
+        "results": [{**asdict(result), "duration": round(result.duration, 3)} for result in results],
+    }
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2)
+    return report
@@ -0,0 +1,172 @@
+"""Run ``testsprite_frontend_test_plan.json`` directly instead of the TC scripts.
+
+Each plan step description is matched against registered step
+implementations (see :mod:`harness.plan_steps`). Every case gets a fresh
+context from the shared pool with the app already open. Cases the app has
+no UI for are listed in :data:`harness.plan_steps.EXCLUDED` and left to
+their TC scripts.
+"""
+
+import asyncio
+import json
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright import async_api
+
+from .pool import BrowserPool
+from .runner import ERROR, FAILED, PASSED, TESTS_DIR, TestCase, TestResult
+from .session import BASE_URL, open_app
+from .steps import Steps
+from .trace import TraceWriter, collecting
+
+PLAN_PATH = TESTS_DIR / "testsprite_frontend_test_plan.json"
+
+
+class UnmatchedStep(LookupError):
+    """No registered implementation matches a plan step description."""
+
+
+@dataclass
+class PlanStep:
+    type: str
+    description: str
+
+
+@dataclass
+class PlanCase:
+    id: str
+    title: str
+    description: str = ""
+    category: str = ""
+    priority: str = ""
+    steps: List[PlanStep] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlanCase":
+        steps = [PlanStep(step["type"], step["description"]) for step in data.get("steps", [])]
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description", ""),
+            category=data.get("category", ""),
+            priority=data.get("priority", ""),
+            steps=steps,
+        )
+
+
+def load_plan(path: Path = PLAN_PATH, select: Optional[List[str]] = None) -> List[PlanCase]:
+    with open(path) as fh:
+        cases = [PlanCase.from_dict(item) for item in json.load(fh)]
+    if select:
+        wanted = {case_id.upper() for case_id in select}
+        cases = [case for case in cases if case.id in wanted]
+    return cases
+
+
+@dataclass
+class StepContext:
+    """What a step implementation gets to work with."""
+
+    case: PlanCase
+    step: PlanStep
+    match: "re.Match[str]"
+    pool: BrowserPool
+    context: async_api.BrowserContext
+    page: async_api.Page
+    steps: Steps
+    state: Dict[str, Any]
+
+
+StepFn = Callable[[StepContext], Awaitable[None]]
+
+
+@dataclass
+class StepImpl:
+    name: str
+    pattern: "re.Pattern[str]"
+    fn: StepFn
+    setup: bool = False  # already satisfied by the shared setup (app open)
+
+
+class PlanStepRegistry:
+    def __init__(self) -> None:
+        self._impls: List[StepImpl] = []
+
+    def step(self, pattern: str, *, setup: bool = False) -> Callable[[StepFn], StepFn]:
+        """Register the decorated coroutine for descriptions matching ``pattern``."""
+        def register(fn: StepFn) -> StepFn:
+            self._impls.append(StepImpl(fn.__name__, re.compile(pattern, re.I), fn, setup))
+            return fn
+        return register
+
+    def match(self, step: PlanStep) -> Tuple[StepImpl, "re.Match[str]"]:
+        for impl in self._impls:
+            found = impl.pattern.search(step.description)
+            if found:
+                return impl, found
+        raise UnmatchedStep(f"no implementation for {step.type} step: {step.description!r}")
+
+    def unmatched(self, cases: List[PlanCase]) -> List[Tuple[str, PlanStep]]:
+        missing = []
+        for case in cases:
+            for step in case.steps:
+                try:
+                    self.match(step)
+                except UnmatchedStep:
+                    missing.append((case.id, step))
+        return missing
+
+
+class PlanExecutor:
+    def __init__(self, pool: BrowserPool, registry: PlanStepRegistry, *, trace: Optional[TraceWriter] = None):
+        self.pool = pool
+        self.registry = registry
+        self.trace = trace
+
+    async def run_case(self, case: PlanCase) -> TestResult:
+        if self.trace is None:
+            return await self._run_case(case)
+        with collecting(case.id) as collector:
+            result = await self._run_case(case)
+        self.trace.write(collector, result.status, result.duration)
+        return result
+
+    async def _run_case(self, case: PlanCase) -> TestResult:
+        test_case = TestCase(id=case.id, name=case.title, path=PLAN_PATH)
+        started = time.perf_counter()
+        try:
+            bound = [self.registry.match(step) for step in case.steps]
+        except UnmatchedStep as exc:
+            return TestResult(test_case, ERROR, 0.0, str(exc))
+
+        try:
+            await self._execute(case, bound)
+        except AssertionError as exc:
+            return TestResult(test_case, FAILED, time.perf_counter() - started, str(exc) or "assertion failed")
+        except Exception:
+            return TestResult(test_case, ERROR, time.perf_counter() - started, traceback.format_exc(limit=3))
+        return TestResult(test_case, PASSED, time.perf_counter() - started)
+
+    async def _execute(self, case: PlanCase, bound: List[Tuple[StepImpl, "re.Match[str]"]]) -> None:
+        async with self.pool.context() as context:
+            context.set_default_timeout(5000)
+            page = await context.new_page()
+            steps = Steps(page)
+            await open_app(page, BASE_URL)
+            state: Dict[str, Any] = {}
+            for (impl, found), step in zip(bound, case.steps):
+                await impl.fn(StepContext(case, step, found, self.pool, context, page, steps, state))
+
+    async def run(self, cases: List[PlanCase], *, workers: int = 4) -> List[TestResult]:
+        semaphore = asyncio.Semaphore(max(1, workers))
+
+        async def bounded(case: PlanCase) -> TestResult:
+            async with semaphore:
+                return await self.run_case(case)
+
+        return list(await asyncio.gather(*(bounded(case) for case in cases)))
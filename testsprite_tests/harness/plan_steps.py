@@ -0,0 +1,155 @@
+"""Step implementations for the descriptions in ``testsprite_frontend_test_plan.json``.
+
+Patterns are matched case-insensitively with ``re.search`` in registration
+order, so put the more specific ones first. A new plan case only needs code
+here when it uses a description no pattern covers yet; ``python -m harness
+plan --check`` lists those.
+
+Cases whose features this UI does not have are listed in :data:`EXCLUDED`
+with the reason; ``plan`` skips them and their TC scripts stay the way to
+run them.
+"""
+
+from typing import Dict
+
+from playwright.async_api import expect
+
+from .flows import complete_daily_sync
+from .plan import PlanStepRegistry, StepContext
+
+PLAN_STEPS = PlanStepRegistry()
+
+EXCLUDED: Dict[str, str] = {
+    "TC002": "the Weekly Yagna plan and micro-offers are not mounted in the app shell",
+    "TC004": "the Weekly Yagna plan and micro-offers are not mounted in the app shell",
+    "TC006": "the weekend plan is only shown as sent; there is no partner acceptance",
+    "TC007": "profile settings have no data-sharing toggles; export and deletion only show alerts",
+    "TC008": "Load Balancer suggestions are applied directly; there is no partner consent",
+    "TC009": "the Resolve Conflict action only shows a toast; ConflictSolver is not mounted",
+    "TC010": "there is no streak repair or couple leaderboard in the app shell",
+    "TC011": "the Add Memory action only shows a toast; the Memory Weaver is not mounted",
+    "TC012": "the Secret Love action only shows a toast; SecretCoupleLoop is not mounted",
+    "TC013": "there are no ambient sensing controls",
+    "TC014": "no UI action sends a real-time update; starting or editing a task only changes local state",
+    "TC015": "data export and account deletion make no backend calls to fail",
+}
+
+# (tab, representative action, toast it raises)
+KIDS_MODULES = [
+    ("kids.tab.todays_fun", "kids.todays_fun.kind_act", "Kindness Recorded!"),
+    ("kids.tab.my_growth", "kids.my_growth.see_progress", "Development Tracking!"),
+    ("kids.tab.ask_leela", "kids.ask_leela.understanding_feelings", "Leela is here!"),
+    ("kids.tab.my_stars", "kids.my_stars.celebrate", "You're Absolutely Amazing!"),
+]
+PRIMARY_COMPONENTS = ["#home-hub", "#balance-compass", "#dashboards"]
+VIEWPORTS = {
+    "desktop": {"width": 1280, "height": 720},
+    "portrait": {"width": 375, "height": 667},
+    "landscape": {"width": 667, "height": 375},
+}
+
+
+# Shared setup
+
+@PLAN_STEPS.step(r"launch the app|open home hub", setup=True)
+async def home_hub(ctx: StepContext) -> None:
+    """The shared setup already opened the app."""
+
+
+@PLAN_STEPS.step(r"complete onboarding")
+async def complete_onboarding(ctx: StepContext) -> None:
+    await complete_daily_sync(ctx.steps)
+
+
+# Home Hub and Daily Sync
+
+@PLAN_STEPS.step(r"input current mood and energy")
+async def input_mood_and_energy(ctx: StepContext) -> None:
+    await ctx.steps.click("sync.option", nth=4)
+    await ctx.steps.click("sync.next")
+
+
+@PLAN_STEPS.step(r"view partner snapshot")
+async def view_partner_snapshot(ctx: StepContext) -> None:
+    await expect(ctx.page.get_by_text("Step 2 of 2")).to_be_visible()
+
+
+@PLAN_STEPS.step(r"sync completion is recorded")
+async def sync_completion_confirmed(ctx: StepContext) -> None:
+    await ctx.steps.click("sync.complete", gone="sync.card")
+    await expect(ctx.page.get_by_text("Daily Sync Complete!")).to_be_visible()
+
+
+@PLAN_STEPS.step(r"onboarding completes successfully")
+async def onboarding_summary(ctx: StepContext) -> None:
+    await expect(ctx.page.get_by_text("Daily Sync Complete!")).to_be_visible()
+
+
+@PLAN_STEPS.step(r"micro-tasks are generated")
+async def micro_tasks_generated(ctx: StepContext) -> None:
+    await ctx.steps.click("nav.tasks")
+    await expect(ctx.page.get_by_text("Task Management")).to_be_visible()
+    await expect((await ctx.steps.ui.resolve("tasks.start")).first).to_be_visible()
+
+
+# Kids Dashboard
+
+@PLAN_STEPS.step(r"access kids dashboard")
+async def open_kids_dashboard(ctx: StepContext) -> None:
+    await ctx.steps.click("nav.kids", until="kids.tab.todays_fun")
+
+
+@PLAN_STEPS.step(r"navigate through each of the .* parent-led modules")
+async def visit_kids_modules(ctx: StepContext) -> None:
+    """Open every module tab; the dashboard has four, not the six the plan names."""
+    for tab, _, _ in KIDS_MODULES:
+        await ctx.steps.click(tab)
+        await expect(await ctx.steps.ui.resolve(tab)).to_have_attribute("aria-selected", "true")
+        await expect(ctx.page.get_by_role("tabpanel")).to_be_visible()
+
+
+@PLAN_STEPS.step(r"representative actions for each module")
+async def kids_module_actions(ctx: StepContext) -> None:
+    ctx.state["kindness_before"] = await _local_int(ctx, "totalKindnessPoints", 25)
+    for tab, action, toast in KIDS_MODULES:
+        await ctx.steps.click(tab)
+        await ctx.steps.click(action)
+        await expect(ctx.page.get_by_text(toast).first).to_be_visible()
+
+
+@PLAN_STEPS.step(r"actions are recorded, logged, and reflected")
+async def kids_actions_recorded(ctx: StepContext) -> None:
+    stored = await _local_int(ctx, "totalKindnessPoints", 0)
+    before = ctx.state["kindness_before"]
+    assert stored > before, f"kind act not stored: totalKindnessPoints {before} -> {stored}"
+    await ctx.steps.click("kids.tab.todays_fun")
+    await expect(await ctx.steps.ui.resolve("kids.todays_fun.kindness_stars")).to_have_text(str(stored))
+
+
+# Layout
+
+@PLAN_STEPS.step(r"load primary ui components .* desktop")
+async def load_desktop(ctx: StepContext) -> None:
+    await ctx.page.set_viewport_size(VIEWPORTS["desktop"])
+    await ctx.page.reload()
+    ctx.state["viewports"] = ["desktop"]
+
+
+@PLAN_STEPS.step(r"repeat loading .* mobile portrait and landscape")
+async def load_mobile(ctx: StepContext) -> None:
+    ctx.state["viewports"] = ["portrait", "landscape"]
+
+
+@PLAN_STEPS.step(r"components render fully|components adapt layout")
+async def components_render(ctx: StepContext) -> None:
+    for viewport in ctx.state.get("viewports", ["desktop"]):
+        await ctx.page.set_viewport_size(VIEWPORTS[viewport])
+        await ctx.page.reload()
+        for selector in PRIMARY_COMPONENTS:
+            await expect(ctx.page.locator(selector)).to_be_visible()
+            await expect(ctx.page.locator(f"{selector} button").first).to_be_enabled()
+
+
+async def _local_int(ctx: StepContext, key: str, default: int) -> int:
+    value = await ctx.page.evaluate("key => localStorage.getItem(key)", key)
+    return int(value) if value else default
@@ -0,0 +1,72 @@
+"""A small pool of long-lived Chromium browsers handing out fresh contexts."""
+
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from playwright import async_api
+
+from .session import POOLED_CHROMIUM_ARGS
+
+
+class BrowserPool:
+    """Start ``size`` browsers once and lease an isolated context per test.
+
+    Contexts are spread round-robin across the browsers. Each lease gets a
+    brand-new ``BrowserContext`` (cookies, storage and cache are not shared)
+    which is closed when the lease ends, so tests stay as isolated as they
+    were with one browser each.
+    """
+
+    def __init__(self, size: int = 1, *, headless: bool = True, args: Optional[List[str]] = None):
+        if size < 1:
+            raise ValueError("BrowserPool size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.args = list(POOLED_CHROMIUM_ARGS if args is None else args)
+        self._pw: Optional[async_api.Playwright] = None
+        self._browsers: List[async_api.Browser] = []
+        self._cycle = None
+
+    async def start(self) -> "BrowserPool":
+        self._pw = await async_api.async_playwright().start()
+        for _ in range(self.size):
+            browser = await self._pw.chromium.launch(headless=self.headless, args=self.args)
+            self._browsers.append(browser)
+        self._cycle = itertools.cycle(self._browsers)
+        return self
+
+    async def close(self) -> None:
+        for browser in self._browsers:
+            await browser.close()
+        self._browsers.clear()
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def playwright(self) -> async_api.Playwright:
+        if self._pw is None:
+            raise RuntimeError("BrowserPool has not been started")
+        return self._pw
+
+    def browser(self) -> async_api.Browser:
+        """Return the next browser in rotation."""
+        if self._cycle is None:
+            raise RuntimeError("BrowserPool has not been started")
+        return next(self._cycle)
+
+    @asynccontextmanager
+    async def context(self, **options: Any) -> AsyncIterator[async_api.BrowserContext]:
+        """Lease a fresh context; ``options`` go to ``Browser.new_context``."""
+        context = await self.browser().new_context(**options)
+        try:
+            yield context
+        finally:
+            await context.close()
@@ -0,0 +1,345 @@
+"""A local reverse proxy that injects network and backend faults.
+
+The TC scripts run against ``http://localhost:3000`` by default, so the proxy takes that
+port and forwards to ``server.ts`` on another one::
+
+    python -m harness proxy --profile flaky-mobile --spawn-server   # app on :3100, proxy on :3000
+    python -m harness run --trace faulty/
+
+The load tools can point ``--base-url`` at it as well. A profile is a list
+of rules, given by name from :data:`FAULT_PROFILES` or as a JSON file::
+
+    {"seed": 1, "rules": [
+      {"match": "* /api/*", "latency_ms": 300, "jitter_ms": 100, "bandwidth_kbps": 400},
+      {"match": "GET /api/user/export", "status": 503, "probability": 0.5},
+      {"match": "* /api/tasks*", "reset": 0.05},
+      {"match": "ws", "events": ["task:*", "sync:*"], "drop": 0.1, "latency_ms": 200}
+    ]}
+
+HTTP rules match ``"METHOD /path"`` globs. Every matching rule applies, in
+order, each with its own ``probability`` (default 1):
+
+- ``reset``: the connection is aborted before anything is forwarded.
+  Its value is the chance per request.
+- ``status``: a 5xx answered by the proxy; the backend never sees the request.
+- ``latency_ms`` / ``jitter_ms``: delay before forwarding.
+- ``bandwidth_kbps``: the response body is paced to this rate.
+
+WebSocket rules (``"match": "ws"``) apply per frame in both directions.
+Frames can be filtered to Socket.IO ``events``. ``drop`` is the chance a
+frame is discarded, ``reset`` the chance the connection is cut, and
+``latency_ms`` delays a frame without reordering it.
+
+Responses the proxy touched carry ``x-harness-fault`` naming the faults and
+``x-harness-fault-ms`` with the delay injected. The step traces pick these
+up (:mod:`harness.trace`), so ``summary.json`` shows which faults hit which
+routes and for how long. A ``trace-diff`` against a run without the proxy
+shows how far each case stretched. The proxy keeps its own totals per rule
+as well (:meth:`FaultProxy.report`).
+
+Needs the ``aiohttp`` package (``pip install aiohttp``).
+"""
+
+import asyncio
+import fnmatch
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .frames import parse_packet
+from .trace import FAULT_HEADER, FAULT_MS_HEADER, route_of
+
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = web = None
+
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailers",
+              "transfer-encoding", "upgrade"}
+PACE_INTERVAL = 0.05  # seconds of body sent per paced chunk
+
+
+@dataclass
+class FaultRule:
+    match: str                       # "METHOD /path-glob" or "ws"
+    probability: float = 1.0
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    bandwidth_kbps: Optional[float] = None
+    status: Optional[int] = None
+    reset: float = 0.0
+    drop: float = 0.0                # WebSocket only
+    events: List[str] = field(default_factory=list)  # WebSocket only: Socket.IO event globs
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        self.name = self.name or self.match
+
+    @property
+    def websocket(self) -> bool:
+        return self.match == "ws"
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.websocket:
+            return False
+        rule_method, _, rule_path = self.match.partition(" ")
+        return fnmatch.fnmatchcase(method, rule_method) and fnmatch.fnmatchcase(path, rule_path or "*")
+
+    def matches_frame(self, event: Optional[str]) -> bool:
+        return not self.events or (event is not None and any(fnmatch.fnmatchcase(event, glob) for glob in self.events))
+
+
+@dataclass
+class FaultProfile:
+    name: str
+    rules: List[FaultRule]
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "FaultProfile":
+        return cls(name, [FaultRule(**rule) for rule in data.get("rules", [])], data.get("seed"))
+
+
+FAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Roughly Chrome DevTools' "Slow 3G".
+    "slow-3g": {"rules": [
+        {"match": "* /*", "latency_ms": 400, "jitter_ms": 100, "bandwidth_kbps": 400},
+        {"match": "ws", "latency_ms": 400},
+    ]},
+    # A phone on a busy 4G cell: variable latency, the odd reset and lost frame.
+    "flaky-mobile": {"rules": [
+        {"match": "* /*", "latency_ms": 150, "jitter_ms": 150, "bandwidth_kbps": 1600},
+        {"match": "* /api/*", "reset": 0.02, "name": "api reset"},
+        {"match": "ws", "drop": 0.05, "reset": 0.005, "latency_ms": 100},
+    ]},
+    # TC014: the network drops out now and then.
+    "interruptions": {"rules": [
+        {"match": "* /api/*", "reset": 0.2, "name": "api reset"},
+        {"match": "ws", "reset": 0.02},
+    ]},
+    # TC015: export and deletion fail in the backend.
+    "backend-failure": {"rules": [
+        {"match": "* /api/user/export", "status": 503},
+        {"match": "* /api/user/delete", "status": 500},
+    ]},
+}
+
+
+def load_profile(name_or_path: str) -> FaultProfile:
+    """A built-in profile by name, or a JSON profile file."""
+    if name_or_path in FAULT_PROFILES:
+        return FaultProfile.from_dict(name_or_path, FAULT_PROFILES[name_or_path])
+    path = Path(name_or_path)
+    if not path.exists():
+        raise ValueError(f"no fault profile {name_or_path!r}; built in: {', '.join(FAULT_PROFILES)}")
+    with open(path) as fh:
+        return FaultProfile.from_dict(path.stem, json.load(fh))
+
+
+@dataclass
+class RuleStats:
+    matched: int = 0
+    latency: int = 0
+    paced: int = 0
+    status: int = 0
+    reset: int = 0
+    dropped: int = 0
+    injected_ms: float = 0.0
+
+
+class FaultProxy:
+    """Forward ``listen`` to ``upstream`` through a :class:`FaultProfile`."""
+
+    def __init__(self, profile: FaultProfile, upstream: str, host: str = "127.0.0.1", port: int = 3000):
+        if aiohttp is None:
+            raise RuntimeError("harness.proxy needs the 'aiohttp' package: pip install aiohttp")
+        self.profile = profile
+        self.upstream = upstream.rstrip("/")
+        self.host = host
+        self.port = port
+        self.rng = random.Random(profile.seed)
+        self.stats: Dict[str, RuleStats] = defaultdict(RuleStats)
+        self.routes: Dict[str, Dict[str, float]] = defaultdict(lambda: {"requests": 0, "faulted": 0, "injected_ms": 0.0})
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._runner: Optional["web.AppRunner"] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "FaultProxy":
+        # Bodies pass through byte for byte, compressed or not.
+        self._session = aiohttp.ClientSession(auto_decompress=False, timeout=aiohttp.ClientTimeout(total=None))
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        return self
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self) -> "FaultProxy":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _fires(self, rule: FaultRule, chance: float = 1.0) -> bool:
+        return self.rng.random() < rule.probability * chance
+
+    async def _handle(self, request: "web.Request") -> "web.StreamResponse":
+        if request.headers.get("upgrade", "").lower() == "websocket":
+            return await self._websocket(request)
+        route = f"{request.method} {route_of(request.path)}"
+        self.routes[route]["requests"] += 1
+        faults: List[str] = []
+        injected = 0.0
+        paced_by: Optional[FaultRule] = None
+        for rule in self.profile.rules:
+            if not rule.matches(request.method, request.path):
+                continue
+            stats = self.stats[rule.name]
+            stats.matched += 1
+            if rule.reset and self._fires(rule, rule.reset):
+                stats.reset += 1
+                self._fault(route, injected)
+                request.transport.abort()
+                return web.Response()  # never sent; the client sees the connection drop
+            if rule.status and self._fires(rule):
+                stats.status += 1
+                faults.append(f"status={rule.status}")
+                self._fault(route, injected)
+                return web.json_response({"error": "Injected fault"}, status=rule.status,
+                                         headers=self._fault_headers(faults, injected))
+            if (rule.latency_ms or rule.jitter_ms) and self._fires(rule):
+                delay = max(0.0, rule.latency_ms + self.rng.uniform(-rule.jitter_ms, rule.jitter_ms))
+                stats.latency += 1
+                stats.injected_ms += delay
+                injected += delay
+                faults.append(f"latency={delay:.0f}ms")
+                await asyncio.sleep(delay / 1000)
+            if rule.bandwidth_kbps and self._fires(rule):
+                stats.paced += 1
+                if paced_by is None or rule.bandwidth_kbps < paced_by.bandwidth_kbps:
+                    paced_by = rule
+        if paced_by is not None:
+            faults.append(f"bandwidth={paced_by.bandwidth_kbps:g}kbps")
+        return await self._forward(request, route, faults, injected, paced_by)
+
+    def _fault(self, route: str, injected: float) -> None:
+        self.routes[route]["faulted"] += 1
+        self.routes[route]["injected_ms"] = round(self.routes[route]["injected_ms"] + injected, 3)
+
+    @staticmethod
+    def _fault_headers(faults: List[str], injected: float) -> Dict[str, str]:
+        return {FAULT_HEADER: ";".join(faults), FAULT_MS_HEADER: f"{injected:.0f}"} if faults else {}
+
+    def _upstream_headers(self, request: "web.Request") -> List[Tuple[str, str]]:
+        # Host is kept so NextAuth and redirects keep pointing at the proxy.
+        return [(name, value) for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP]
+
+    async def _forward(self, request: "web.Request", route: str, faults: List[str], injected: float,
+                       paced_by: Optional[FaultRule]) -> "web.StreamResponse":
+        body = await request.read()
+        async with self._session.request(request.method, self.upstream + request.path_qs,
+                                         headers=self._upstream_headers(request), data=body or None,
+                                         allow_redirects=False) as upstream:
+            response = web.StreamResponse(status=upstream.status, reason=upstream.reason)
+            for name, value in upstream.headers.items():
+                if name.lower() not in HOP_BY_HOP:
+                    response.headers.add(name, value)
+            for name, value in self._fault_headers(faults, injected).items():
+                response.headers[name] = value
+            await response.prepare(request)
+            started = time.perf_counter()
+            sent = 0
+            paced_ms = 0.0
+            bytes_per_s = paced_by.bandwidth_kbps * 1000 / 8 if paced_by else None
+            chunk_size = max(1024, int(bytes_per_s * PACE_INTERVAL)) if bytes_per_s else 1 << 16
+            async for chunk in upstream.content.iter_chunked(chunk_size):
+                await response.write(chunk)
+                sent += len(chunk)
+                if bytes_per_s:
+                    ahead = sent / bytes_per_s - (time.perf_counter() - started)
+                    if ahead > 0:
+                        paced_ms += ahead * 1000
+                        await asyncio.sleep(ahead)
+            await response.write_eof()
+        if paced_by is not None:
+            self.stats[paced_by.name].injected_ms += paced_ms
+        if faults:
+            # The header went out before the body, so it leaves out the pacing; the report has it.
+            self._fault(route, injected + paced_ms)
+        return response
+
+    async def _websocket(self, request: "web.Request") -> "web.WebSocketResponse":
+        client = web.WebSocketResponse(autoping=False)
+        await client.prepare(request)
+        rules = [rule for rule in self.profile.rules if rule.websocket]
+        headers = [(name, value) for name, value in self._upstream_headers(request)
+                   if name.lower() not in ("host", "sec-websocket-key", "sec-websocket-version", "sec-websocket-extensions")]
+        ws_url = self.upstream.replace("http", "ws", 1) + request.path_qs
+        async with self._session.ws_connect(ws_url, headers=headers, autoping=False) as server:
+            cut = asyncio.Event()
+
+            async def pump(source, sink) -> None:
+                async for message in source:
+                    if message.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                        break
+                    if message.type == aiohttp.WSMsgType.TEXT:
+                        packet = parse_packet(message.data)
+                        if not await self._frame_faults(rules, packet[0] if packet else None, cut):
+                            continue
+                        await sink.send_str(message.data)
+                    else:
+                        await sink.send_bytes(message.data)
+                cut.set()
+
+            pumps = [asyncio.ensure_future(pump(client, server)), asyncio.ensure_future(pump(server, client))]
+            await cut.wait()
+            for task in pumps:
+                task.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
+        if not client.closed and request.transport is not None:
+            request.transport.abort()  # a cut, not a close handshake
+        return client
+
+    async def _frame_faults(self, rules: List[FaultRule], name: Optional[str], cut: asyncio.Event) -> bool:
+        """Apply the WebSocket rules to one frame; False when it is dropped or the connection cut."""
+        for rule in rules:
+            if not rule.matches_frame(name):
+                continue
+            stats = self.stats[rule.name]
+            stats.matched += 1
+            if rule.reset and self._fires(rule, rule.reset):
+                stats.reset += 1
+                cut.set()
+                return False
+            if rule.drop and self._fires(rule, rule.drop):
+                stats.dropped += 1
+                return False
+            if rule.latency_ms and self._fires(rule):
+                delay = max(0.0, rule.latency_ms + self.rng.uniform(-rule.jitter_ms, rule.jitter_ms))
+                stats.latency += 1
+                stats.injected_ms += delay
+                await asyncio.sleep(delay / 1000)
+        return True
+
+    def report(self) -> Dict[str, Any]:
+        """Faults applied per rule and the delay they injected per route."""
+        return {
+            "profile": self.profile.name,
+            "rules": {name: {**asdict(stats), "injected_ms": round(stats.injected_ms, 3)}
+                      for name, stats in self.stats.items()},
+            "routes": dict(sorted(self.routes.items(), key=lambda item: -item[1]["injected_ms"])),
+        }
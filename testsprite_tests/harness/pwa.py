@@ -0,0 +1,290 @@
+"""Cold, warm, relaunch and offline loads of the app's routes, with the PWA caches in play.
+
+Every TC starts from an empty context, so nothing measures a repeat visit,
+which is how most people open an installed PWA. ``python -m harness pwa``
+loads each route four times in one persistent browser profile, new to that
+route:
+
+- ``cold``: the first visit. The service worker is registered here: by the
+  app if it does so on that route, otherwise by the harness (``--sw``,
+  default ``/service-worker.js``, the script ``use-web-push`` registers).
+  The harness then waits for the worker to activate or fail to install.
+- ``warm``: a new tab in the same browser, memory cache and all
+- ``relaunch``: the browser closed and reopened on the same profile, as
+  when the app is opened from the home screen again
+- ``offline``: the same, with the network off
+
+Each load reports:
+
+- where its requests came from, read over CDP: ``network``,
+  ``memory_cache``, ``disk_cache``, ``cache_storage`` (the service worker
+  answered from Cache Storage) or ``service_worker_network`` (the service
+  worker fetched it), with request counts and decoded bytes
+- bytes over the wire
+- TTFB, DOMContentLoaded, load, LCP and ``interactive_ms``. The last is the
+  later of DOMContentLoaded and the end of the last long task before the
+  network went quiet: Lighthouse's TTI without its 5 s quiet window.
+- Cache Storage after the load: bytes used and entries per cache
+- the service worker's state, and whether it controls the page
+
+:func:`compare` diffs two reports. It flags a route whose warm or relaunch
+load takes noticeably more bytes from the network, whose offline load
+stopped working, whose Cache Storage emptied, or that got slower. A
+service-worker change that quietly disables caching fails the build.
+"""
+
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright import async_api
+
+from .auth import AuthStore
+from .budgets import READ_VITALS, VITALS_SCRIPT
+from .pool import BrowserPool
+from .session import BASE_URL, POOLED_CHROMIUM_ARGS
+
+PHASES = ("cold", "warm", "relaunch", "offline")
+DEFAULT_ROUTES = ("/", "/login")
+DEFAULT_SW = "/service-worker.js"
+CACHED_SOURCES = ("memory_cache", "disk_cache", "cache_storage")
+
+SW_READY_JS = """async ({ script, timeout }) => {
+  if (!('serviceWorker' in navigator)) return { by: null, state: null, error: 'no service worker support' };
+  let registration = await navigator.serviceWorker.getRegistration();
+  let by = registration ? 'app' : null;
+  if (!registration && script) {
+    try {
+      registration = await navigator.serviceWorker.register(script);
+      by = 'harness';
+    } catch (error) {
+      return { by: null, state: null, error: String(error) };
+    }
+  }
+  if (!registration) return { by: null, state: null, error: null };
+  const worker = registration.installing || registration.waiting || registration.active;
+  const settled = (state) => state === 'activated' || state === 'redundant';
+  const state = await new Promise((resolve) => {
+    if (!worker || settled(worker.state)) return resolve(worker ? worker.state : null);
+    const timer = setTimeout(() => resolve(worker.state), timeout);
+    worker.addEventListener('statechange', () => {
+      if (settled(worker.state)) { clearTimeout(timer); resolve(worker.state); }
+    });
+  });
+  return { by, script: worker ? worker.scriptURL : null, state, error: state === 'redundant' ? 'install failed' : null };
+}"""
+
+SW_STATE_JS = """async () => {
+  if (!('serviceWorker' in navigator)) return { state: null, controlled: false };
+  const registration = await navigator.serviceWorker.getRegistration();
+  const worker = registration && (registration.active || registration.waiting || registration.installing);
+  return { state: worker ? worker.state : null, controlled: !!navigator.serviceWorker.controller };
+}"""
+
+CACHE_STORAGE_JS = """async () => {
+  const estimate = navigator.storage && navigator.storage.estimate ? await navigator.storage.estimate() : {};
+  const entries = {};
+  if (self.caches) {
+    for (const name of await caches.keys()) entries[name] = (await (await caches.open(name)).keys()).length;
+  }
+  return { bytes: (estimate.usageDetails || {}).caches ?? null, entries };
+}"""
+
+
+@dataclass
+class PwaConfig:
+    routes: List[str] = field(default_factory=lambda: list(DEFAULT_ROUTES))
+    service_worker: Optional[str] = DEFAULT_SW   # registered when the app does not; None to leave it to the app
+    profile: Optional[str] = None                # harness.auth profile to sign in as
+    sw_timeout: float = 15.0
+    idle_timeout: float = 10.0
+    base_url: str = BASE_URL
+    headless: bool = True
+
+
+class TransferLog:
+    """Where each request of a page came from, from the CDP Network domain."""
+
+    def __init__(self) -> None:
+        self.sources: Dict[str, str] = {}
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.wire_bytes = 0
+        self.document_source: Optional[str] = None
+        self._memory: set = set()
+
+    async def attach(self, page: async_api.Page) -> None:
+        session = await page.context.new_cdp_session(page)
+        session.on("Network.requestServedFromCache", lambda event: self._memory.add(event["requestId"]))
+        session.on("Network.responseReceived", self._on_response)
+        session.on("Network.dataReceived", self._on_data)
+        session.on("Network.loadingFinished", self._on_finished)
+        await session.send("Network.enable")
+
+    def _on_response(self, event: Dict[str, Any]) -> None:
+        response = event["response"]
+        if event["requestId"] in self._memory:
+            source = "memory_cache"
+        elif response.get("fromServiceWorker"):
+            source = {"cache-storage": "cache_storage", "http-cache": "disk_cache"}.get(
+                response.get("serviceWorkerResponseSource"), "service_worker_network")
+        elif response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            source = "disk_cache"
+        else:
+            source = "network"
+        self.sources[event["requestId"]] = source
+        if event.get("type") == "Document" and self.document_source is None:
+            self.document_source = source
+
+    def _on_data(self, event: Dict[str, Any]) -> None:
+        self.bytes[event["requestId"]] += event.get("dataLength", 0)
+
+    def _on_finished(self, event: Dict[str, Any]) -> None:
+        if self.sources.get(event["requestId"]) == "network":
+            self.wire_bytes += int(event.get("encodedDataLength", 0))
+
+    def totals(self) -> Dict[str, Dict[str, int]]:
+        table: Dict[str, Dict[str, int]] = defaultdict(lambda: {"requests": 0, "bytes": 0})
+        for request_id, source in self.sources.items():
+            table[source]["requests"] += 1
+            table[source]["bytes"] += self.bytes.get(request_id, 0)
+        return dict(table)
+
+
+async def _launch(playwright: async_api.Playwright, profile_dir: Path, config: PwaConfig,
+                  auth: Optional[AuthStore]) -> async_api.BrowserContext:
+    context = await playwright.chromium.launch_persistent_context(
+        str(profile_dir), headless=config.headless, args=POOLED_CHROMIUM_ARGS, service_workers="allow")
+    await context.add_init_script(VITALS_SCRIPT)
+    if auth is not None and config.profile:
+        await auth.apply(context, config.profile)
+    return context
+
+
+async def _load(context: async_api.BrowserContext, url: str, config: PwaConfig, phase: str) -> Dict[str, Any]:
+    page = await context.new_page()
+    log = TransferLog()
+    await log.attach(page)
+    result: Dict[str, Any] = {"phase": phase}
+    started = time.perf_counter()
+    try:
+        response = await page.goto(url, wait_until="load", timeout=30000)
+        result["status"] = response.status if response is not None else None
+        result["ok"] = response is None or response.ok
+    except async_api.Error as exc:
+        result.update(ok=False, status=None, error=str(exc).splitlines()[0])
+    try:
+        await page.wait_for_load_state("networkidle", timeout=config.idle_timeout * 1000)
+    except async_api.Error:
+        pass
+    result["wall_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if phase == "cold":
+        result["service_worker"] = await page.evaluate(
+            SW_READY_JS, {"script": config.service_worker, "timeout": config.sw_timeout * 1000})
+    try:
+        vitals = await page.evaluate(READ_VITALS)
+        result["timing"] = {
+            "ttfb_ms": vitals["ttfb"], "dom_content_loaded_ms": vitals["domContentLoaded"], "load_ms": vitals["load"],
+            "lcp_ms": vitals["lcp"],
+            "interactive_ms": max(vitals["domContentLoaded"] or 0, vitals["longTaskEnd"] or 0) or None,
+        }
+        result.setdefault("service_worker", {}).update(await page.evaluate(SW_STATE_JS))
+        result["cache_storage"] = await page.evaluate(CACHE_STORAGE_JS)
+    except async_api.Error as exc:
+        result.setdefault("error", str(exc).splitlines()[0])  # an error page without our script
+    sources = log.totals()
+    total = sum(row["bytes"] for row in sources.values())
+    cached = sum(sources.get(source, {}).get("bytes", 0) for source in CACHED_SOURCES)
+    result.update(
+        document_source=log.document_source,
+        sources=sources,
+        network_bytes=sum(sources.get(source, {}).get("bytes", 0) for source in ("network", "service_worker_network")),
+        wire_bytes=log.wire_bytes,
+        cached_share=round(cached / total, 3) if total else None,
+    )
+    await page.close()
+    return result
+
+
+@asynccontextmanager
+async def _profile_dir() -> AsyncIterator[Path]:
+    path = Path(tempfile.mkdtemp(prefix="harness-pwa-"))
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+async def measure_route(playwright: async_api.Playwright, route: str, config: PwaConfig,
+                        auth: Optional[AuthStore]) -> Dict[str, Any]:
+    """The four loads of ``route`` in a profile of its own."""
+    url = config.base_url.rstrip("/") + route
+    phases: Dict[str, Dict[str, Any]] = {}
+    async with _profile_dir() as profile_dir:
+        context = await _launch(playwright, profile_dir, config, auth)
+        try:
+            phases["cold"] = await _load(context, url, config, "cold")
+            phases["warm"] = await _load(context, url, config, "warm")
+        finally:
+            await context.close()
+        context = await _launch(playwright, profile_dir, config, auth)
+        try:
+            phases["relaunch"] = await _load(context, url, config, "relaunch")
+            await context.set_offline(True)
+            phases["offline"] = await _load(context, url, config, "offline")
+        finally:
+            await context.close()
+    return {"route": route, "phases": phases}
+
+
+async def run_pwa(config: PwaConfig, progress=None) -> Dict[str, Any]:
+    """Measure every route in turn; runs are sequential so they do not skew each other's timings."""
+    results = []
+    async with BrowserPool(1, headless=config.headless) as pool:
+        auth = AuthStore(pool, base_url=config.base_url) if config.profile else None
+        for route in config.routes:
+            result = await measure_route(pool.playwright, route, config, auth)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {"base_url": config.base_url, "service_worker": config.service_worker, "routes": results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, bytes_threshold: float = 0.2,
+            min_bytes: int = 10_000, time_threshold: float = 0.5, min_ms: float = 200.0) -> List[str]:
+    """Lines describing routes whose repeat visits cache less, or load slower, than in ``baseline``."""
+    before = {route["route"]: route["phases"] for route in baseline.get("routes", [])}
+    findings = []
+    for route in current.get("routes", []):
+        old_phases = before.get(route["route"])
+        if old_phases is None:
+            continue
+        for phase, now in route["phases"].items():
+            old = old_phases.get(phase)
+            if old is None:
+                continue
+            label = f"{route['route']} {phase}"
+            if old.get("ok") and not now.get("ok"):
+                findings.append(f"{label}: loaded before, now {now.get('error') or now.get('status')}")
+            if phase in ("warm", "relaunch"):
+                grew = now["network_bytes"] - old["network_bytes"]
+                if grew > min_bytes and grew > old["network_bytes"] * bytes_threshold:
+                    findings.append(f"{label}: network bytes {old['network_bytes']} -> {now['network_bytes']}")
+            old_cache = (old.get("cache_storage") or {}).get("entries") or {}
+            new_cache = (now.get("cache_storage") or {}).get("entries") or {}
+            if sum(old_cache.values()) and not sum(new_cache.values()):
+                findings.append(f"{label}: Cache Storage held {sum(old_cache.values())} entries, now none")
+            old_ms = (old.get("timing") or {}).get("interactive_ms")
+            new_ms = (now.get("timing") or {}).get("interactive_ms")
+            if old_ms and new_ms and new_ms - old_ms > min_ms and new_ms > old_ms * (1 + time_threshold):
+                findings.append(f"{label}: interactive {old_ms:.0f} ms -> {new_ms:.0f} ms")
+        old_sw = (old_phases.get("cold") or {}).get("service_worker") or {}
+        new_sw = (route["phases"].get("cold") or {}).get("service_worker") or {}
+        if old_sw.get("state") == "activated" and new_sw.get("state") != "activated":
+            findings.append(f"{route['route']}: service worker {new_sw.get('error') or new_sw.get('state')}, "
+                            f"was activated")
+    return findings
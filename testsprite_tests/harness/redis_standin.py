@@ -0,0 +1,296 @@
+"""An in-process Redis stand-in for running ``server.ts`` locally.
+
+``src/lib/socket.ts`` keeps presence in two hashes and fans events out
+through ``@socket.io/redis-adapter``, so the socket server needs a Redis that
+answers hash commands and pub/sub. This speaks just enough RESP2 for that
+(plus strings, keys and PING) and counts every command it serves, which lets
+the socket benchmarks report how much Redis traffic each event costs.
+
+Point the server at it with ``REDIS_URL=redis://127.0.0.1:<port>``; start it
+standalone with ``python -m harness redis``.
+"""
+
+import asyncio
+import fnmatch
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+Reply = Union[None, int, bytes, str, list, Exception]
+HashChange = Tuple[float, str, bytes, bytes]  # (perf_counter, "HSET"/"HDEL", key, field)
+
+
+class RespError(Exception):
+    pass
+
+
+def _encode(value: Reply) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):  # inline command, e.g. from redis-cli or telnet
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        size = int(header[1:])
+        data = await reader.readexactly(size + 2)
+        args.append(data[:-2])
+    return args
+
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.channels: Set[bytes] = set()
+        self.patterns: Set[bytes] = set()
+
+    @property
+    def subscriptions(self) -> int:
+        return len(self.channels) + len(self.patterns)
+
+    def send(self, value: Reply) -> None:
+        self.writer.write(_encode(value))
+
+
+class RedisStandIn:
+    """Hashes, strings and pub/sub over RESP2 on ``host:port``."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379):
+        self.host = host
+        self.port = port
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self.strings: Dict[bytes, bytes] = {}
+        self.commands: Counter = Counter()
+        self.published = 0
+        self.hash_log: Optional[List[HashChange]] = None  # set to a list to record field writes
+        self._clients: Set[_Client] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}"
+
+    async def start(self) -> "RedisStandIn":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "RedisStandIn":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def reset_counters(self) -> None:
+        self.commands.clear()
+        self.published = 0
+
+    def _log(self, command: str, key: bytes, field: bytes) -> None:
+        if self.hash_log is not None:
+            self.hash_log.append((time.perf_counter(), command, key, field))
+
+    def hash_sizes(self) -> Dict[str, int]:
+        return {key.decode(errors="replace"): len(fields) for key, fields in self.hashes.items()}
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        self._clients.add(client)
+        try:
+            while True:
+                try:
+                    args = await _read_command(reader)
+                except (asyncio.IncompleteReadError, ValueError):
+                    break
+                if args is None:
+                    break
+                if not args:
+                    continue
+                name = args[0].decode().upper()
+                self.commands[name] += 1
+                if name == "QUIT":
+                    client.send("OK")
+                    break
+                try:
+                    reply = self._dispatch(client, name, args[1:])
+                except RespError as exc:
+                    reply = exc
+                if reply is not _NO_REPLY:
+                    client.send(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+
+    def _dispatch(self, client: _Client, name: str, args: List[bytes]) -> Reply:
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            raise RespError(f"ERR unknown command '{name}'")
+        try:
+            return handler(client, *args)
+        except TypeError:
+            raise RespError(f"ERR wrong number of arguments for '{name.lower()}' command") from None
+
+    # Connection
+
+    def _cmd_ping(self, client: _Client, message: Optional[bytes] = None) -> Reply:
+        if client.subscriptions:
+            return [b"pong", message or b""]
+        return message if message is not None else "PONG"
+
+    def _cmd_echo(self, client: _Client, message: bytes) -> Reply:
+        return message
+
+    def _cmd_select(self, client: _Client, db: bytes) -> Reply:
+        return "OK"
+
+    def _cmd_client(self, client: _Client, *args: bytes) -> Reply:
+        return "OK"
+
+    def _cmd_info(self, client: _Client, *sections: bytes) -> Reply:
+        return b"# Server\r\nredis_version:7.0.0\r\nredis_mode:standalone\r\n"
+
+    # Strings and keys
+
+    def _cmd_get(self, client: _Client, key: bytes) -> Reply:
+        return self.strings.get(key)
+
+    def _cmd_set(self, client: _Client, key: bytes, value: bytes, *options: bytes) -> Reply:
+        self.strings[key] = value
+        return "OK"
+
+    def _cmd_del(self, client: _Client, *keys: bytes) -> Reply:
+        removed = 0
+        for key in keys:
+            removed += (self.strings.pop(key, None) is not None) + (self.hashes.pop(key, None) is not None)
+        return removed
+
+    def _cmd_exists(self, client: _Client, *keys: bytes) -> Reply:
+        return sum(1 for key in keys if key in self.strings or key in self.hashes)
+
+    # Hashes
+
+    def _cmd_hset(self, client: _Client, key: bytes, *pairs: bytes) -> Reply:
+        if not pairs or len(pairs) % 2:
+            raise RespError("ERR wrong number of arguments for 'hset' command")
+        fields = self.hashes.setdefault(key, {})
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in fields
+            fields[field] = value
+            self._log("HSET", key, field)
+        return added
+
+    def _cmd_hget(self, client: _Client, key: bytes, field: bytes) -> Reply:
+        return self.hashes.get(key, {}).get(field)
+
+    def _cmd_hdel(self, client: _Client, key: bytes, *fields: bytes) -> Reply:
+        existing = self.hashes.get(key, {})
+        removed = 0
+        for field in fields:
+            if existing.pop(field, None) is not None:
+                removed += 1
+                self._log("HDEL", key, field)
+        if key in self.hashes and not existing:
+            del self.hashes[key]
+        return removed
+
+    def _cmd_hgetall(self, client: _Client, key: bytes) -> Reply:
+        return [item for pair in self.hashes.get(key, {}).items() for item in pair]
+
+    def _cmd_hlen(self, client: _Client, key: bytes) -> Reply:
+        return len(self.hashes.get(key, {}))
+
+    # Pub/sub
+
+    def _cmd_publish(self, client: _Client, channel: bytes, message: bytes) -> Reply:
+        self.published += 1
+        receivers = 0
+        text = channel.decode("latin-1")
+        for other in self._clients:
+            if channel in other.channels:
+                other.send([b"message", channel, message])
+                receivers += 1
+            for pattern in other.patterns:
+                if fnmatch.fnmatchcase(text, pattern.decode("latin-1")):
+                    other.send([b"pmessage", pattern, channel, message])
+                    receivers += 1
+        return receivers
+
+    def _subscribe(self, client: _Client, kind: str, targets: Set[bytes], names: tuple) -> Reply:
+        for name in names:
+            targets.add(name)
+            client.send([kind.encode(), name, client.subscriptions])
+        return _NO_REPLY
+
+    def _unsubscribe(self, client: _Client, kind: str, targets: Set[bytes], names: tuple) -> Reply:
+        names = names or tuple(targets)
+        for name in names:
+            targets.discard(name)
+            client.send([kind.encode(), name, client.subscriptions])
+        if not names:
+            client.send([kind.encode(), None, client.subscriptions])
+        return _NO_REPLY
+
+    def _cmd_subscribe(self, client: _Client, *channels: bytes) -> Reply:
+        return self._subscribe(client, "subscribe", client.channels, channels)
+
+    def _cmd_psubscribe(self, client: _Client, *patterns: bytes) -> Reply:
+        return self._subscribe(client, "psubscribe", client.patterns, patterns)
+
+    def _cmd_unsubscribe(self, client: _Client, *channels: bytes) -> Reply:
+        return self._unsubscribe(client, "unsubscribe", client.channels, channels)
+
+    def _cmd_punsubscribe(self, client: _Client, *patterns: bytes) -> Reply:
+        return self._unsubscribe(client, "punsubscribe", client.patterns, patterns)
+
+    def _cmd_pubsub(self, client: _Client, subcommand: bytes, *args: bytes) -> Reply:
+        sub = subcommand.upper()
+        if sub == b"NUMSUB":
+            reply: list = []
+            for channel in args:
+                reply += [channel, sum(1 for other in self._clients if channel in other.channels)]
+            return reply
+        if sub == b"NUMPAT":
+            return sum(len(other.patterns) for other in self._clients)
+        if sub == b"CHANNELS":
+            pattern = args[0].decode("latin-1") if args else "*"
+            channels = {channel for other in self._clients for channel in other.channels}
+            return sorted(c for c in channels if fnmatch.fnmatchcase(c.decode("latin-1"), pattern))
+        raise RespError(f"ERR unknown subcommand '{subcommand.decode()}'")
+
+
+_NO_REPLY = object()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6379) -> None:
+    """Run a stand-in until cancelled (``python -m harness redis``)."""
+    async with RedisStandIn(host, port) as standin:
+        print(f"Redis stand-in listening on {standin.url}", flush=True)
+        await asyncio.Event().wait()
@@ -0,0 +1,273 @@
+"""Opt-in render profiling of chosen steps with Chrome DevTools tracing.
+
+While a :class:`RenderProfiler` is active (``run --render DIR``), every
+:class:`harness.steps.Steps` step whose locator name matches one of its
+patterns (``kids.tab.*``, ``fab.toggle``) runs inside a DevTools trace of
+the page's renderer. So does every ``async with steps.profile(label)``
+block, e.g. a reload at a new viewport. The trace of each step is reduced
+to:
+
+- ``long_tasks`` / ``blocking_ms``: main-thread tasks over 50 ms and their
+  time beyond 50 ms (Total Blocking Time)
+- ``scripting_ms``: script evaluation, function calls, timers, event
+  handlers and microtasks, counting nested work once
+- ``style_ms`` / ``layout_ms`` / ``paint_ms``: style recalculation, layout
+  and paint
+- ``frames`` / ``dropped_frames``: compositor frames begun and dropped
+
+Results are keyed by the locator name a step touched, so the same tab
+switch across runs and cases lands on one row. ``cpu_throttle`` slows the
+CPU the way DevTools does (4 is roughly a mid-range Android phone).
+
+Tracing starts and stops around each profiled step, which adds a few tens
+of milliseconds per step, and Chromium traces one step at a time, so
+profiled steps of concurrent cases wait for each other. Unprofiled steps
+cost nothing.
+"""
+
+import asyncio
+import fnmatch
+import json
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from playwright import async_api
+
+from .stats import summarize
+
+RENDER_FILE = "render.json"
+LONG_TASK_MS = 50.0
+CATEGORIES = ",".join([
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "toplevel",
+    "v8.execute",
+])
+SCRIPT_EVENTS = {"EvaluateScript", "FunctionCall", "TimerFire", "EventDispatch", "FireAnimationFrame",
+                 "FireIdleCallback", "RunMicrotasks", "v8.run", "v8.evaluateModule", "v8.compile", "V8.Execute"}
+STYLE_EVENTS = {"UpdateLayoutTree", "RecalculateStyles", "ScheduleStyleRecalculation"}
+LAYOUT_EVENTS = {"Layout"}
+PAINT_EVENTS = {"Paint", "PrePaint", "PaintImage", "Layerize", "UpdateLayer"}
+
+
+@dataclass
+class RenderSample:
+    case: str
+    step: str          # locator name or profile() label
+    action: str
+    duration_ms: float
+    long_tasks: int = 0
+    blocking_ms: float = 0.0
+    scripting_ms: float = 0.0
+    style_ms: float = 0.0
+    layout_ms: float = 0.0
+    paint_ms: float = 0.0
+    frames: int = 0
+    dropped_frames: int = 0
+
+
+def _renderer(events: List[Dict[str, Any]], frame_id: str) -> Optional[tuple]:
+    """(pid, tid) of the main thread rendering ``frame_id``."""
+    pid = None
+    for event in events:
+        if event.get("name") == "TracingStartedInBrowser":
+            for frame in event.get("args", {}).get("data", {}).get("frames", []):
+                if frame.get("frame") == frame_id:
+                    pid = frame.get("processId")
+    for event in events:
+        if (event.get("ph") == "M" and event.get("name") == "thread_name"
+                and event.get("args", {}).get("name") == "CrRendererMain"
+                and (pid is None or event.get("pid") == pid)):
+            return event["pid"], event["tid"]
+    return None
+
+
+def _outer_ms(events: List[Dict[str, Any]]) -> float:
+    """Total duration of ``events`` (``X`` events of one thread) without double-counting nesting."""
+    total, covered_until = 0.0, float("-inf")
+    for event in sorted(events, key=lambda event: event["ts"]):
+        end = event["ts"] + event.get("dur", 0)
+        if event["ts"] >= covered_until:
+            total += event.get("dur", 0)
+            covered_until = end
+        elif end > covered_until:
+            total += end - covered_until
+            covered_until = end
+    return total / 1000
+
+
+def reduce_trace(events: List[Dict[str, Any]], frame_id: str, sample: RenderSample) -> RenderSample:
+    """Fill ``sample`` from the trace events of one step."""
+    main = _renderer(events, frame_id)
+    on_main = [event for event in events
+               if event.get("ph") == "X" and (main is None or (event.get("pid"), event.get("tid")) == main)]
+    tasks = [event["dur"] / 1000 for event in on_main
+             if event.get("name") in ("RunTask", "ThreadControllerImpl::RunTask") and event.get("dur")]
+    long_tasks = [ms for ms in tasks if ms > LONG_TASK_MS]
+    sample.long_tasks = len(long_tasks)
+    sample.blocking_ms = round(sum(ms - LONG_TASK_MS for ms in long_tasks), 3)
+    sample.scripting_ms = round(_outer_ms([event for event in on_main if event["name"] in SCRIPT_EVENTS]), 3)
+    sample.style_ms = round(_outer_ms([event for event in on_main if event["name"] in STYLE_EVENTS]), 3)
+    sample.layout_ms = round(_outer_ms([event for event in on_main if event["name"] in LAYOUT_EVENTS]), 3)
+    sample.paint_ms = round(_outer_ms([event for event in on_main if event["name"] in PAINT_EVENTS]), 3)
+    for event in events:
+        name = event.get("name")
+        if name == "BeginFrame":
+            sample.frames += 1
+        elif name == "DroppedFrame":
+            sample.dropped_frames += 1
+        elif name == "PipelineReporter" and event.get("ph") == "b":
+            state = event.get("args", {}).get("chrome_frame_reporter", {}).get("state")
+            if state == "STATE_DROPPED":
+                sample.dropped_frames += 1
+    return sample
+
+
+class _PageTracer:
+    """One CDP session tracing one page, one step at a time."""
+
+    def __init__(self, session: async_api.CDPSession, frame_id: str):
+        self.session = session
+        self.frame_id = frame_id
+        self.events: List[Dict[str, Any]] = []
+        self._complete: Optional[asyncio.Future] = None
+        session.on("Tracing.dataCollected", lambda params: self.events.extend(params["value"]))
+        session.on("Tracing.tracingComplete", self._on_complete)
+
+    def _on_complete(self, params: Dict[str, Any]) -> None:
+        if self._complete is not None and not self._complete.done():
+            self._complete.set_result(None)
+
+    async def start(self) -> None:
+        self.events = []
+        await self.session.send("Tracing.start", {"categories": CATEGORIES, "transferMode": "ReportEvents"})
+
+    async def stop(self) -> List[Dict[str, Any]]:
+        self._complete = asyncio.get_running_loop().create_future()
+        await self.session.send("Tracing.end")
+        await asyncio.wait_for(self._complete, 10)
+        return self.events
+
+
+class RenderProfiler:
+    """Render cost of the matching steps of every case in a run."""
+
+    def __init__(self, patterns: Iterable[str] = ("*",), cpu_throttle: float = 1.0):
+        self.patterns = list(patterns)
+        self.cpu_throttle = cpu_throttle
+        self.samples: List[RenderSample] = []
+        self._tracers: Dict[async_api.Page, "asyncio.Future[_PageTracer]"] = {}
+        self._lock = asyncio.Lock()
+
+    def wants(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        """Open tracers as pages appear, so CPU throttling covers the whole case."""
+        context.on("page", self._open)
+        for page in context.pages:
+            self._open(page)
+
+    def _open(self, page: async_api.Page) -> "asyncio.Future[_PageTracer]":
+        if page not in self._tracers:
+            self._tracers[page] = asyncio.ensure_future(self._new_tracer(page))
+        return self._tracers[page]
+
+    async def _new_tracer(self, page: async_api.Page) -> _PageTracer:
+        session = await page.context.new_cdp_session(page)
+        tree = await session.send("Page.getFrameTree")
+        if self.cpu_throttle > 1:
+            await session.send("Emulation.setCPUThrottlingRate", {"rate": self.cpu_throttle})
+        return _PageTracer(session, tree["frameTree"]["frame"]["id"])
+
+    @asynccontextmanager
+    async def span(self, page: async_api.Page, case: str, step: str, action: str) -> AsyncIterator[None]:
+        """Trace the enclosed block and record it as one sample."""
+        # Chromium runs one trace at a time, so concurrent cases take turns.
+        async with self._lock:
+            try:
+                tracer: Optional[_PageTracer] = await self._open(page)
+                await tracer.start()
+            except async_api.Error:
+                tracer = None  # not Chromium, or the page is gone: run unprofiled
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                duration = (time.perf_counter() - started) * 1000
+                if tracer is not None:
+                    try:
+                        events = await tracer.stop()
+                    except (async_api.Error, asyncio.TimeoutError):
+                        events = None
+                    if events is not None:
+                        sample = RenderSample(case, step, action, round(duration, 3))
+                        self.samples.append(reduce_trace(events, tracer.frame_id, sample))
+
+    def report(self) -> Dict[str, Any]:
+        """Samples plus per-step aggregates, worst blocking time first."""
+        by_step: Dict[str, List[RenderSample]] = defaultdict(list)
+        for sample in self.samples:
+            by_step[sample.step].append(sample)
+        steps = {}
+        for step, samples in by_step.items():
+            steps[step] = {
+                "runs": len(samples),
+                "cases": sorted({sample.case for sample in samples}),
+                "duration": summarize(sample.duration_ms / 1000 for sample in samples),
+                "long_tasks": sum(sample.long_tasks for sample in samples),
+                "max_blocking_ms": max(sample.blocking_ms for sample in samples),
+                "scripting_ms": round(sum(sample.scripting_ms for sample in samples) / len(samples), 3),
+                "style_ms": round(sum(sample.style_ms for sample in samples) / len(samples), 3),
+                "layout_ms": round(sum(sample.layout_ms for sample in samples) / len(samples), 3),
+                "paint_ms": round(sum(sample.paint_ms for sample in samples) / len(samples), 3),
+                "dropped_frames": sum(sample.dropped_frames for sample in samples),
+                "frames": sum(sample.frames for sample in samples),
+            }
+        ordered = dict(sorted(steps.items(), key=lambda item: (-item[1]["max_blocking_ms"], item[0])))
+        return {"cpu_throttle": self.cpu_throttle, "steps": ordered,
+                "samples": [asdict(sample) for sample in self.samples]}
+
+    def write(self, directory: Path) -> Dict[str, Any]:
+        directory.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        with open(directory / RENDER_FILE, "w") as fh:
+            json.dump(report, fh, indent=2)
+        return report
+
+
+@dataclass
+class CaseProfiler:
+    """The run's profiler bound to the case that is running."""
+
+    profiler: RenderProfiler
+    case: str
+
+    def wants(self, name: str) -> bool:
+        return self.profiler.wants(name)
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        self.profiler.attach(context)
+
+    def span(self, page: async_api.Page, step: str, action: str):
+        return self.profiler.span(page, self.case, step, action)
+
+
+CURRENT_RENDER: ContextVar[Optional[CaseProfiler]] = ContextVar("harness_render", default=None)
+
+
+@contextmanager
+def profiling(profiler: Optional[RenderProfiler], case: str) -> Iterator[Optional[CaseProfiler]]:
+    """Profile the matching steps of every ``Steps`` created in this task."""
+    bound = CaseProfiler(profiler, case) if profiler is not None else None
+    token = CURRENT_RENDER.set(bound)
+    try:
+        yield bound
+    finally:
+        CURRENT_RENDER.reset(token)
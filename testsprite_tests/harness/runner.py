@@ -0,0 +1,276 @@
+"""Discover the TC scripts and run them concurrently on a shared browser pool.
+
+A script that sets a module-level ``STORAGE_STATE = "<profile>"`` gets a
+context that is already signed in as that :data:`harness.auth.PROFILES`
+entry instead of a blank one. A module-level ``BUDGET``
+(:class:`harness.budgets.Budget`) fails the case when it runs over, and so
+does any state over ``lighthouse-budget.json`` when one is given (see
+:mod:`harness.lighthouse`).
+With ``cassettes="record"`` or ``"replay"`` the backend traffic of each case
+is recorded to, or served from, its cassette (see :mod:`harness.cassette`).
+A failing case leaves its last steps, screenshots and DOM in
+``failures/<case>/`` (see :mod:`harness.flight`). With an ``impact`` index
+each case's coverage refreshes its entry (see :mod:`harness.impact`).
+"""
+
+import asyncio
+import importlib.util
+import os
+import shutil
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from playwright import async_api
+
+from .auth import AUTH_DIR, TESTS_DIR, AuthStore
+from .budgets import Budget, install_vitals, measure, read_vitals
+from .cassette import Cassette, Player, Recorder
+from .databases import DatabaseClone
+from .flight import FlightLog, recording
+from .impact import ImpactIndex
+from .lighthouse import LighthouseBudget, StateBudgets, budgeting
+from .render import RenderProfiler, profiling
+from .pool import BrowserPool
+from .session import BASE_URL
+from .trace import TraceCollector, TraceWriter, collecting
+
+FAILURES_DIR = TESTS_DIR / "failures"
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "error"
+
+
+@dataclass
+class TestCase:
+    id: str
+    name: str
+    path: Path
+
+    @classmethod
+    def from_path(cls, path: Path) -> "TestCase":
+        case_id, _, name = path.stem.partition("_")
+        return cls(id=case_id, name=name.replace("_", " "), path=path)
+
+    def load_module(self) -> ModuleType:
+        """Import the script as a module."""
+        # The scripts import ``harness`` as a top-level package.
+        if str(TESTS_DIR) not in sys.path:
+            sys.path.insert(0, str(TESTS_DIR))
+        spec = importlib.util.spec_from_file_location(f"testsprite_tests.{self.path.stem}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def load(self) -> Callable[..., Awaitable[None]]:
+        """Import the script and return its ``run_test`` coroutine function."""
+        return self.load_module().run_test
+
+
+@dataclass
+class TestResult:
+    case: TestCase
+    status: str
+    duration: float
+    error: Optional[str] = None
+    details: dict = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == PASSED
+
+
+def discover(root: Path = TESTS_DIR, select: Optional[Iterable[str]] = None) -> List[TestCase]:
+    """Return the TC scripts under ``root``, optionally filtered by id (``TC003``)."""
+    cases = [TestCase.from_path(path) for path in sorted(root.glob("TC[0-9][0-9][0-9]_*.py"))]
+    if select:
+        wanted = {case_id.upper() for case_id in select}
+        cases = [case for case in cases if case.id in wanted]
+    return cases
+
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+@dataclass
+class Backend:
+    """A server cases run against, one case at a time when it has a ``database`` clone to reset."""
+
+    base_url: str = BASE_URL
+    database: Optional[DatabaseClone] = None
+    auth_dir: Path = AUTH_DIR   # where its sign-in snapshots go; they only work against this server
+
+
+async def run_case(pool: BrowserPool, case: TestCase, auth: Optional[AuthStore] = None,
+                   trace: Optional[TraceWriter] = None, enforce_budgets: bool = True,
+                   cassettes: Optional[str] = None, failures_dir: Path = FAILURES_DIR,
+                   full_trace: bool = False, impact: Optional[ImpactIndex] = None,
+                   render: Optional[RenderProfiler] = None,
+                   lighthouse: Optional[LighthouseBudget] = None, base_url: str = BASE_URL) -> TestResult:
+    with collecting(case.id) as collector, recording(case.id) as flight, profiling(render, case.id), \
+            budgeting(lighthouse, case.id) as states:
+        result = await _run_case(pool, case, auth, collector, enforce_budgets, cassettes,
+                                 flight, failures_dir, full_trace, impact, render, states, base_url)
+    if result.ok:
+        shutil.rmtree(failures_dir / case.id, ignore_errors=True)  # evidence of an earlier failure
+    if trace is not None:
+        trace.write(collector, result.status, result.duration)
+    return result
+
+
+async def _run_case(pool: BrowserPool, case: TestCase, auth: Optional[AuthStore],
+                    collector: TraceCollector, enforce_budgets: bool, cassettes: Optional[str],
+                    flight: FlightLog, failures_dir: Path, full_trace: bool,
+                    impact: Optional[ImpactIndex], render: Optional[RenderProfiler],
+                    states: Optional[StateBudgets], base_url: str) -> TestResult:
+    started = time.perf_counter()
+    vitals = []
+    details = {}
+    recorder = player = None
+    if cassettes == REPLAY:
+        cassette = Cassette.load(case.id)
+        if cassette is None:
+            return TestResult(case, ERROR, 0.0, f"no cassette for {case.id}; record one with --record")
+        player = Player(cassette)
+    elif cassettes == RECORD:
+        recorder = Recorder(case.id)
+    try:
+        module = case.load_module()
+        profile = getattr(module, "STORAGE_STATE", None)
+        budget: Optional[Budget] = getattr(module, "BUDGET", None)
+        # The scripts navigate to paths, resolved against the server this case runs on.
+        lease = auth.context(profile, base_url=base_url) if auth and profile else pool.context(base_url=base_url)
+        async with lease as context:
+            if player is not None:
+                await player.attach(context)
+            if recorder is not None:
+                recorder.attach(context)
+            if budget is not None or states is not None:
+                await install_vitals(context)
+            if states is not None:
+                states.attach(context)
+            flight.attach(context)
+            if render is not None:
+                render.attach(context)
+            coverage = impact.collector() if impact is not None else None
+            if coverage is not None:
+                coverage.attach(context)
+            if full_trace:
+                await context.tracing.start(snapshots=True, screenshots=True)
+            try:
+                await module.run_test(context)
+            except Exception as exc:
+                # The lease closes the context on the way out; keep the evidence first.
+                await _dump_failure(context, flight, failures_dir, exc, full_trace)
+                if coverage is not None:
+                    impact.update(case.id, await coverage.finish(context), complete=False)
+                raise
+            if coverage is not None:
+                impact.update(case.id, await coverage.finish(context), complete=True)
+            if full_trace:
+                await context.tracing.stop()  # no path: the recording is discarded
+            if budget is not None:
+                vitals = await read_vitals(context)
+            if states is not None:
+                await states.finish(context)
+            if recorder is not None:
+                # Only passing runs are worth replaying.
+                (await recorder.finish()).save()
+    except AssertionError as exc:
+        return TestResult(case, FAILED, time.perf_counter() - started, str(exc) or "assertion failed")
+    except Exception:
+        return TestResult(case, ERROR, time.perf_counter() - started, traceback.format_exc(limit=3))
+    duration = time.perf_counter() - started
+    if player is not None and player.misses:
+        details["cassette_misses"] = player.misses
+    violations = []
+    if budget is not None:
+        measured = measure(collector, vitals)
+        details["budget"] = measured.to_dict()
+        violations += budget.check(measured)
+    if states is not None:
+        details["lighthouse"] = states.report()
+        violations += states.violations
+    if violations:
+        details["over_budget"] = violations
+    if violations and enforce_budgets:
+        return TestResult(case, FAILED, duration, "over budget: " + "; ".join(violations), details)
+    return TestResult(case, PASSED, duration, details=details)
+
+
+async def _dump_failure(context: async_api.BrowserContext, flight: FlightLog, failures_dir: Path,
+                        exc: Exception, full_trace: bool) -> None:
+    try:
+        target = await flight.dump(context, failures_dir, f"{type(exc).__name__}: {exc}".strip())
+        if full_trace:
+            await context.tracing.stop(path=str(target / "trace.zip"))
+    except Exception:
+        pass  # diagnostics must never mask the test's own failure
+
+
+async def run_suite(
+    cases: List[TestCase],
+    *,
+    workers: int = 4,
+    browsers: int = 1,
+    headless: bool = True,
+    use_auth: bool = True,
+    trace_dir: Optional[Path] = None,
+    enforce_budgets: bool = True,
+    cassettes: Optional[str] = None,
+    failures_dir: Path = FAILURES_DIR,
+    full_trace: bool = False,
+    impact: Optional[ImpactIndex] = None,
+    render: Optional[RenderProfiler] = None,
+    lighthouse: Optional[LighthouseBudget] = None,
+    backends: Optional[List[Backend]] = None,
+) -> List[TestResult]:
+    """Run ``cases`` with at most ``workers`` in flight, in discovery order.
+
+    With ``use_auth`` off every script gets a blank context, even those
+    that declare ``STORAGE_STATE``. With ``trace_dir`` every step is traced
+    into ``steps.jsonl`` and ``summary.json`` there (see :mod:`harness.trace`).
+    With ``enforce_budgets`` off, ``BUDGET`` overruns are only reported.
+    ``cassettes`` is ``"record"``, ``"replay"`` or None for a live backend.
+    Failing cases are written to ``failures_dir``; ``full_trace`` adds a
+    Playwright trace, recorded for every case but kept only for failures.
+    With ``impact`` every case refreshes its coverage entry and the index
+    is saved at the end. With ``render`` the steps it selects are profiled.
+    With ``lighthouse`` every state the cases reach is checked against it.
+    Without ``backends`` every case runs against :data:`BASE_URL`. With
+    them each worker takes one, and a backend's database clone is reset
+    before every case it runs, so no case sees what another wrote (TC008
+    reassigning chores, TC010 spending coins).
+    """
+    backends = (backends or [Backend()] * max(1, workers))[:max(1, workers)]
+    idle: "asyncio.Queue[Backend]" = asyncio.Queue()
+    for backend in backends:
+        idle.put_nowait(backend)
+
+    async with BrowserPool(browsers, headless=headless) as pool:
+        stores = {id(backend): AuthStore(pool, directory=backend.auth_dir, base_url=backend.base_url)
+                  for backend in backends} if use_auth else {}
+        trace = TraceWriter(trace_dir, started=time.time(), build=os.environ.get("TC_BUILD_ID")) if trace_dir else None
+
+        async def bounded(case: TestCase) -> TestResult:
+            backend = await idle.get()
+            try:
+                if backend.database is not None:
+                    await backend.database.reset()
+                return await run_case(pool, case, stores.get(id(backend)), trace, enforce_budgets, cassettes,
+                                      failures_dir, full_trace, impact, render, lighthouse, backend.base_url)
+            finally:
+                idle.put_nowait(backend)
+
+        results = list(await asyncio.gather(*(bounded(case) for case in cases)))
+    if trace is not None:
+        trace.close()
+    if impact is not None:
+        impact.save()
+    return results
@@ -0,0 +1,64 @@
+"""Browser session helpers shared by the TC scripts and the suite runner."""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from playwright import async_api
+
+BASE_URL = "http://localhost:3000"
+
+# Launch arguments used when a TC script runs on its own.
+CHROMIUM_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+    "--single-process",               # Run the browser in a single process mode
+]
+
+# A shared browser hosts many contexts at once, which `--single-process`
+# does not survive, so pooled browsers drop it.
+POOLED_CHROMIUM_ARGS = [arg for arg in CHROMIUM_ARGS if arg != "--single-process"]
+
+
+@asynccontextmanager
+async def standalone_context(
+    context: Optional[async_api.BrowserContext] = None,
+    *,
+    headless: bool = True,
+) -> AsyncIterator[async_api.BrowserContext]:
+    """Yield ``context`` untouched, or launch a private browser when it is None.
+
+    A context handed in by the runner belongs to its pool and is closed there;
+    a context created here is torn down together with its browser. Either way
+    the context has a ``base_url``, which the scripts' relative ``goto`` paths
+    resolve against: :data:`BASE_URL` here, the worker's server in a run.
+    """
+    if context is not None:
+        yield context
+        return
+
+    pw = None
+    browser = None
+    context = None
+    try:
+        pw = await async_api.async_playwright().start()
+        browser = await pw.chromium.launch(headless=headless, args=CHROMIUM_ARGS)
+        context = await browser.new_context(base_url=BASE_URL)
+        yield context
+    finally:
+        if context:
+            await context.close()
+        if browser:
+            await browser.close()
+        if pw:
+            await pw.stop()
+
+
+async def open_app(page: async_api.Page, url: str = BASE_URL) -> None:
+    """Navigate like the TC scripts do: commit, then DOMContentLoaded on every frame."""
+    await page.goto(url, wait_until="commit", timeout=10000)
+    for frame in page.frames:
+        try:
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
+        except async_api.Error:
+            pass
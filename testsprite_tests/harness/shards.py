@@ -0,0 +1,145 @@
+"""Split the suite into K shards of similar duration and merge their results.
+
+Every CI machine runs ``python -m harness run --shard I/K --results
+shard-I.json`` against the same durations history. Each one computes the
+same plan and runs only its own share. ``python -m harness merge shard-*.json``
+then prints one combined result and folds the new durations into the
+history, so the next plan reflects them. It fails instead when a shard's
+file is missing or a case has no result.
+
+The history file keeps the last few durations of every case and plans with
+their median. One unusually fast failure or slow retry does not move a case
+across shards. Cases without history count as the median of the known ones.
+Cases are packed longest first onto the least loaded shard, with ties broken
+by case id so every machine agrees.
+"""
+
+import json
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .auth import TESTS_DIR
+from .runner import TestCase, TestResult
+
+DURATIONS_PATH = TESTS_DIR / ".durations.json"
+HISTORY = 5              # durations kept per case
+DEFAULT_SECONDS = 60.0   # estimate when nothing has run yet
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """``"2/4"`` -> ``(2, 4)``; shards are numbered from 1."""
+    index, _, total = value.partition("/")
+    try:
+        shard, shards = int(index), int(total)
+    except ValueError:
+        raise ValueError(f"--shard takes I/K, e.g. 1/4, not {value!r}") from None
+    if not 1 <= shard <= shards:
+        raise ValueError(f"shard {shard} is not between 1 and {shards}")
+    return shard, shards
+
+
+def load_durations(path: Path = DURATIONS_PATH) -> Dict[str, List[float]]:
+    if not path.exists():
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def update_durations(results: Iterable[TestResult], path: Path = DURATIONS_PATH) -> Dict[str, List[float]]:
+    history = load_durations(path)
+    for result in results:
+        runs = history.setdefault(result.case.id, [])
+        runs.append(round(result.duration, 3))
+        del runs[:-HISTORY]
+    with open(path, "w") as fh:
+        json.dump(dict(sorted(history.items())), fh, indent=2)
+    return history
+
+
+def estimates(cases: List[TestCase], history: Dict[str, List[float]]) -> Dict[str, float]:
+    """Expected seconds per case: the median of its history, else of everyone's."""
+    known = {case_id: statistics.median(runs) for case_id, runs in history.items() if runs}
+    fallback = statistics.median(known.values()) if known else DEFAULT_SECONDS
+    return {case.id: known.get(case.id, fallback) for case in cases}
+
+
+@dataclass
+class Shard:
+    index: int
+    cases: List[TestCase] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def plan_shards(cases: List[TestCase], shards: int, history: Dict[str, List[float]]) -> List[Shard]:
+    """Longest-processing-time-first packing of ``cases`` into ``shards`` bins."""
+    expected = estimates(cases, history)
+    bins = [Shard(index) for index in range(1, shards + 1)]
+    for case in sorted(cases, key=lambda case: (-expected[case.id], case.id)):
+        target = min(bins, key=lambda shard: (shard.seconds, shard.index))
+        target.cases.append(case)
+        target.seconds += expected[case.id]
+    for shard in bins:
+        shard.cases.sort(key=lambda case: case.id)  # run in discovery order within a shard
+    return bins
+
+
+def result_to_dict(result: TestResult) -> Dict[str, object]:
+    return {
+        "id": result.case.id,
+        "name": result.case.name,
+        "path": str(result.case.path),
+        "status": result.status,
+        "duration": round(result.duration, 3),
+        "error": result.error,
+        "details": result.details,
+    }
+
+
+def result_from_dict(data: Dict[str, object]) -> TestResult:
+    case = TestCase(id=data["id"], name=data["name"], path=Path(data["path"]))
+    return TestResult(case, data["status"], data["duration"], data.get("error"), data.get("details") or {})
+
+
+def write_results(path: Path, results: List[TestResult], *, shard: str = "", wall_clock: float = 0.0) -> None:
+    with open(path, "w") as fh:
+        json.dump({"shard": shard, "wall_clock": round(wall_clock, 3),
+                   "results": [result_to_dict(result) for result in results]}, fh, indent=2)
+
+
+def merge_results(paths: Iterable[Path], shards: int,
+                  cases: Iterable[str]) -> Tuple[List[TestResult], Dict[str, float]]:
+    """All results in case order, plus each shard's wall clock.
+
+    Raises ``ValueError`` when a file is not a shard's, belongs to another
+    split, a shard of ``1..shards`` has no file, or a case of ``cases`` has
+    no result, so a machine that died or never uploaded cannot pass as a
+    green run.
+    """
+    results: Dict[str, TestResult] = {}
+    wall_clocks: Dict[str, float] = {}
+    seen = set()
+    for path in paths:
+        with open(path) as fh:
+            data = json.load(fh)
+        label = data.get("shard") or ""
+        if not label:
+            raise ValueError(f"{path} was not written by run --shard")
+        shard, total = parse_shard(label)
+        if total != shards:
+            raise ValueError(f"{path} is shard {label}, but {shards} shards were expected")
+        seen.add(shard)
+        wall_clocks[label] = data.get("wall_clock", 0.0)
+        for entry in data["results"]:
+            results[entry["id"]] = result_from_dict(entry)
+    problems = []
+    missing_shards = [str(shard) for shard in range(1, shards + 1) if shard not in seen]
+    if missing_shards:
+        problems.append(f"no results for shard(s) {', '.join(missing_shards)} of {shards}")
+    missing_cases = sorted(set(cases) - set(results))
+    if missing_cases:
+        problems.append(f"no result for {', '.join(missing_cases)}")
+    if problems:
+        raise ValueError("; ".join(problems))
+    return [results[case_id] for case_id in sorted(results)], wall_clocks
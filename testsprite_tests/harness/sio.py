@@ -0,0 +1,152 @@
+"""A minimal Socket.IO v4 client for driving ``server.ts`` without a browser.
+
+Speaks Engine.IO v4 over a plain WebSocket (no polling upgrade), answers the
+server's pings, and hands every EVENT packet to waiters registered with
+:meth:`SocketClient.expect`. It deliberately has no reconnection logic: the
+benchmarks decide when and how to reconnect.
+
+Needs the ``websockets`` package (``pip install websockets``).
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .frames import SOCKET_PATH, SocketEvent, parse_packet
+from .session import BASE_URL
+
+try:
+    from websockets.asyncio.client import ClientConnection, connect
+except ImportError:  # pragma: no cover - optional dependency
+    ClientConnection = connect = None
+
+
+class SocketError(RuntimeError):
+    """The server refused the connection or sent a CONNECT_ERROR."""
+
+
+def socket_url(base_url: str = BASE_URL, path: str = SOCKET_PATH) -> str:
+    """WebSocket URL of the Engine.IO endpoint under ``base_url``."""
+    parts = urlsplit(base_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return urlunsplit((scheme, parts.netloc, path.rstrip("/") + "/", "EIO=4&transport=websocket", ""))
+
+
+class SocketClient:
+    """One Socket.IO connection to the default namespace."""
+
+    def __init__(self, base_url: str = BASE_URL, *, cookie: Optional[str] = None, path: str = SOCKET_PATH):
+        if connect is None:
+            raise RuntimeError("harness.sio needs the 'websockets' package: pip install websockets")
+        self.url = socket_url(base_url, path)
+        self.cookie = cookie
+        self.sid: Optional[str] = None
+        self.events: List[SocketEvent] = []
+        self.pings = 0
+        self.keep_events = False
+        self._ws: Optional[ClientConnection] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connected: Optional[asyncio.Future] = None
+        self._waiters: List[Tuple[str, Any, asyncio.Future]] = []
+        self.closed = asyncio.Event()
+
+    async def connect(self, timeout: float = 10.0) -> "SocketClient":
+        """Open the transport and join the default namespace."""
+        headers = {"Cookie": self.cookie} if self.cookie else None
+        self._ws = await asyncio.wait_for(
+            connect(self.url, additional_headers=headers, max_size=None, ping_interval=None),
+            timeout,
+        )
+        self._connected = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read())
+        await asyncio.wait_for(self._connected, timeout)
+        return self
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def abort(self) -> None:
+        """Drop the TCP connection without a close frame, like a lost network."""
+        if self._ws is not None:
+            self._ws.transport.abort()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+    async def __aenter__(self) -> "SocketClient":
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def emit(self, event: str, *args: Any) -> float:
+        """Send an EVENT packet; return ``time.perf_counter()`` at send."""
+        payload = "42" + json.dumps([event, *args], separators=(",", ":"))
+        sent = time.perf_counter()
+        await self._ws.send(payload)
+        return sent
+
+    def expect(self, event: str, match: Optional[Any] = None) -> "asyncio.Future[SocketEvent]":
+        """Future for the next ``event`` whose args satisfy ``match``; create it before acting."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((event, match, future))
+        return future
+
+    async def _read(self) -> None:
+        try:
+            async for message in self._ws:
+                self._handle(message)
+        except Exception as exc:
+            self._fail(exc)
+        finally:
+            self._fail(SocketError("connection closed"))
+            self.closed.set()
+
+    def _handle(self, message: Any) -> None:
+        received = time.perf_counter()
+        if not isinstance(message, str) or not message:
+            return
+        if message == "2":  # Engine.IO ping; the server drops us without a pong
+            self.pings += 1
+            asyncio.ensure_future(self._ws.send("3"))
+            return
+        if message[0] == "0":  # Engine.IO open; join the default namespace
+            asyncio.ensure_future(self._ws.send("40"))
+            return
+        if message.startswith("40"):
+            self.sid = json.loads(message[2:] or "{}").get("sid")
+            if self._connected and not self._connected.done():
+                self._connected.set_result(self.sid)
+            return
+        if message.startswith("44"):
+            error = json.loads(message[2:] or "{}")
+            self._fail(SocketError(error.get("message", "connect_error")))
+            return
+        packet = parse_packet(message)
+        if packet is None:
+            return
+        name, args, ack_id = packet
+        event = SocketEvent(name, args, "received", received, ack_id)
+        if self.keep_events:
+            self.events.append(event)
+        pending = []
+        for wanted, match, future in self._waiters:
+            if future.done():
+                continue
+            if name == wanted and (match is None or match(args)):
+                future.set_result(event)
+            else:
+                pending.append((wanted, match, future))
+        self._waiters = pending
+
+    def _fail(self, exc: BaseException) -> None:
+        if self._connected and not self._connected.done():
+            self._connected.set_exception(exc)
+        for _, _, future in self._waiters:
+            if not future.done():
+                future.set_exception(exc)
+        self._waiters = []
@@ -0,0 +1,246 @@
+"""Heartbeat soak and reconnection storm for the Socket.IO layer.
+
+Every partner in the roster connects, joins its couple room and keeps
+sending ``heartbeat`` (timing each ``heartbeat:ack``). After a warm-up, each
+storm drops a fraction of the sockets at once and reconnects them, which is
+what a rolling deploy or a flaky mobile network does to the server. Per
+storm it reports:
+
+- ``rejoin``: drop until the new socket has ``couple:joined`` back
+- ``disconnect:notify``: drop until the surviving partner hears
+  ``partner:activity`` "disconnected" (the ``disconnect`` handler's latency)
+- ``disconnect:cleanup``: drop until the old socket id leaves
+  ``socket:active_connections`` (only with the in-process Redis stand-in)
+- ``heartbeat:storm`` next to the steady-state ``heartbeat`` latency
+- HSET/HDEL counts on ``socket:active_connections`` and
+  ``socket:couple_rooms``, their sizes afterwards, and couples whose room
+  entry no longer names the sockets that are actually connected
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .couples import BenchConfig, Couple, Partner, arg_field, connect_partner, join
+from .redis_standin import RedisStandIn
+from .sio import SocketClient
+from .stats import Samples
+
+ACTIVE_CONNECTIONS_KEY = b"socket:active_connections"
+COUPLE_ROOMS_KEY = b"socket:couple_rooms"
+ROOM_FIELDS = {"partner_a": "partnerA", "partner_b": "partnerB"}
+
+
+@dataclass
+class SoakConfig(BenchConfig):
+    heartbeat_interval: float = 5.0
+    warmup: float = 10.0
+    storms: int = 1
+    storm_interval: float = 30.0       # steady state between storms
+    drop_fraction: float = 0.25
+    drop_mode: str = "abort"           # "abort" (lost network) or "close" (clean close frame)
+    reconnect_jitter: float = 0.0      # spread reconnects uniformly over this many seconds
+    settle: float = 2.0                # wait after the last rejoin before reading Redis
+    seed: Optional[int] = None
+
+
+@dataclass
+class Member:
+    couple: Couple
+    partner: Partner
+    client: Optional[SocketClient] = None
+    partner_member: Optional["Member"] = None
+    dropped: bool = False
+
+
+@dataclass
+class SoakRun:
+    config: SoakConfig
+    redis: Optional[RedisStandIn] = None
+    samples: Samples = field(default_factory=Samples)
+    phase: str = "heartbeat"
+    stopping: bool = False
+
+    async def heartbeat(self, member: Member) -> None:
+        # Stagger the first beat so thousands of sockets don't beat in lockstep.
+        await asyncio.sleep(random.uniform(0, self.config.heartbeat_interval))
+        while not self.stopping:
+            client = member.client
+            if client is not None and not member.dropped:
+                phase = self.phase
+                ack = client.expect("heartbeat:ack")
+                try:
+                    sent = await client.emit("heartbeat")
+                    self.samples.add(phase, (await asyncio.wait_for(ack, self.config.timeout)).at - sent)
+                except asyncio.TimeoutError:
+                    self.samples.error(phase, "timeout")
+                except Exception as exc:
+                    if not member.dropped:
+                        self.samples.error(phase, type(exc).__name__)
+            await asyncio.sleep(self.config.heartbeat_interval)
+
+    async def connect(self, member: Member, gate: asyncio.Semaphore) -> float:
+        """Connect and join for ``member``; return the ``join:couple`` round trip."""
+        client = await connect_partner(self.config, member.couple, member.partner, gate, self.samples)
+        try:
+            joined = await join(client, member.couple, member.partner, self.config.timeout)
+        except Exception:
+            await client.close()
+            raise
+        member.client = client
+        return joined
+
+    async def storm(self, number: int, members: List[Member], gate: asyncio.Semaphore) -> Dict[str, Any]:
+        config = self.config
+        live = [member for member in members if member.client is not None and not member.dropped]
+        victims = random.sample(live, min(len(live), max(1, round(len(live) * config.drop_fraction))))
+        storm_samples = Samples()
+        if self.redis is not None:
+            self.redis.reset_counters()
+            self.redis.hash_log = []
+        before = self.redis.hash_sizes() if self.redis is not None else {}
+
+        # Surviving partners should hear about the drop from the disconnect handler.
+        notices = {}
+        victim_ids = {id(member) for member in victims}
+        for member in victims:
+            survivor = member.partner_member
+            if survivor and id(survivor) not in victim_ids and survivor.client is not None:
+                notices[id(member)] = survivor.client.expect(
+                    "partner:activity", lambda args: arg_field(args, "activity") == "disconnected")
+
+        old_sids = {}
+        self.phase = "heartbeat:storm"
+        for member in victims:
+            member.dropped = True
+            old_sids[id(member)] = member.client.sid
+        dropped_at = time.perf_counter()
+        await asyncio.gather(*(
+            member.client.abort() if config.drop_mode == "abort" else member.client.close()
+            for member in victims
+        ), return_exceptions=True)
+
+        async def rejoin(member: Member) -> None:
+            if config.reconnect_jitter:
+                await asyncio.sleep(random.uniform(0, config.reconnect_jitter))
+            try:
+                await self.connect(member, gate)
+            except Exception as exc:
+                storm_samples.error("rejoin", type(exc).__name__)
+                member.client = None
+                return
+            storm_samples.add("rejoin", time.perf_counter() - dropped_at)
+            member.dropped = False
+
+        async def notified(member: Member, future: "asyncio.Future") -> None:
+            try:
+                event = await asyncio.wait_for(future, config.timeout)
+            except asyncio.TimeoutError:
+                storm_samples.error("disconnect:notify", "timeout")
+            else:
+                storm_samples.add("disconnect:notify", event.at - dropped_at)
+
+        await asyncio.gather(
+            *(rejoin(member) for member in victims),
+            *(notified(member, notices[id(member)]) for member in victims if id(member) in notices),
+        )
+        await asyncio.sleep(config.settle)
+        self.phase = "heartbeat"
+
+        report: Dict[str, Any] = {
+            "storm": number,
+            "dropped": len(victims),
+            "rejoined": len(storm_samples.values["rejoin"]),
+            "elapsed_s": round(time.perf_counter() - dropped_at, 3),
+        }
+        if self.redis is not None:
+            self._cleanup(storm_samples, victims, old_sids, dropped_at)
+            report["redis"] = self._churn(before, members)
+            self.redis.hash_log = None
+        report["events"] = storm_samples.summary()
+        self.samples.merge(storm_samples)
+        return report
+
+    def _cleanup(self, samples: Samples, victims: List[Member], old_sids: Dict[int, str], dropped_at: float) -> None:
+        removed = {}
+        for at, command, key, fld in self.redis.hash_log:
+            if command == "HDEL" and key == ACTIVE_CONNECTIONS_KEY:
+                removed.setdefault(fld.decode(), at)
+        for member in victims:
+            sid = old_sids[id(member)]
+            if sid in removed:
+                samples.add("disconnect:cleanup", removed[sid] - dropped_at)
+            else:
+                samples.error("disconnect:cleanup", "stale_connection")
+
+    def _churn(self, before: Dict[str, int], members: List[Member]) -> Dict[str, Any]:
+        writes: Counter = Counter()
+        for _, command, key, _ in self.redis.hash_log:
+            writes[f"{command} {key.decode()}"] += 1
+        return {
+            "commands": dict(sorted(self.redis.commands.items())),
+            "hash_writes": dict(sorted(writes.items())),
+            "sizes_before": before,
+            "sizes_after": self.redis.hash_sizes(),
+            "room_mismatches": room_mismatches(self.redis, members),
+        }
+
+
+def room_mismatches(redis: RedisStandIn, members: List[Member]) -> int:
+    """Couples whose ``socket:couple_rooms`` entry disagrees with the live sockets."""
+    rooms = redis.hashes.get(COUPLE_ROOMS_KEY, {})
+    wrong = set()
+    for member in members:
+        raw = rooms.get(member.couple.id.encode())
+        room = json.loads(raw) if raw else {}
+        live = member.client.sid if member.client is not None and not member.dropped else None
+        if room.get(ROOM_FIELDS[member.partner.role]) != live:
+            wrong.add(member.couple.id)
+    return len(wrong)
+
+
+async def run_soak(config: SoakConfig, couples: List[Couple], redis: Optional[RedisStandIn] = None) -> Dict[str, Any]:
+    """Connect every couple, soak with heartbeats, and run ``config.storms`` storms."""
+    if config.seed is not None:
+        random.seed(config.seed)
+    run = SoakRun(config, redis)
+    gate = asyncio.Semaphore(max(1, config.connect_concurrency))
+    members: List[Member] = []
+    for couple in couples:
+        pair = [Member(couple, partner) for partner in couple.partners]
+        pair[0].partner_member, pair[1].partner_member = pair[1], pair[0]
+        members += pair
+
+    async def first_join(member: Member) -> None:
+        try:
+            run.samples.add("join:couple", await run.connect(member, gate))
+        except Exception as exc:
+            run.samples.error("join:couple", type(exc).__name__)
+
+    await asyncio.gather(*(first_join(member) for member in members))
+    connected = [member for member in members if member.client is not None]
+    beats = [asyncio.create_task(run.heartbeat(member)) for member in connected]
+    storms = []
+    try:
+        await asyncio.sleep(config.warmup)
+        for number in range(1, config.storms + 1):
+            storms.append(await run.storm(number, connected, gate))
+            if number < config.storms:
+                await asyncio.sleep(config.storm_interval)
+    finally:
+        run.stopping = True
+        for task in beats:
+            task.cancel()
+        await asyncio.gather(*beats, return_exceptions=True)
+        await asyncio.gather(*(member.client.close() for member in members if member.client), return_exceptions=True)
+
+    return {
+        "sockets": len(members),
+        "connected": len(connected),
+        "storms": storms,
+        "events": run.samples.summary(),
+    }
@@ -0,0 +1,84 @@
+"""Start ``server.ts`` locally against the Redis stand-in for the benchmarks."""
+
+import asyncio
+import os
+import secrets
+import signal
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional, Sequence
+
+from .auth import REPO_DIR
+from .redis_standin import RedisStandIn
+
+SERVER_COMMAND = ("npx", "tsx", "server.ts")
+
+
+@dataclass
+class LocalStack:
+    base_url: str
+    redis: RedisStandIn
+    secret: str
+    process: asyncio.subprocess.Process
+
+
+async def wait_for_port(host: str, port: int, timeout: float, process: Optional[asyncio.subprocess.Process] = None) -> None:
+    """Poll until ``host:port`` accepts connections or ``timeout`` runs out."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        if process is not None and process.returncode is not None:
+            raise RuntimeError(f"server exited with code {process.returncode} before listening")
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if loop.time() > deadline:
+                raise TimeoutError(f"nothing listening on {host}:{port} after {timeout:.0f}s")
+            await asyncio.sleep(0.25)
+            continue
+        writer.close()
+        return
+
+
+@asynccontextmanager
+async def local_stack(
+    command: Sequence[str] = SERVER_COMMAND,
+    *,
+    port: int = 3100,
+    redis_port: int = 0,
+    env: Optional[Dict[str, str]] = None,
+    ready_timeout: float = 180.0,
+    log_path: Optional[str] = None,
+) -> AsyncIterator[LocalStack]:
+    """Run a Redis stand-in and ``server.ts`` wired to it; tear both down on exit.
+
+    ``NEXTAUTH_SECRET`` is taken from the environment or generated, and handed
+    to the server so :mod:`harness.tokens` can mint cookies it accepts.
+    """
+    secret = os.environ.get("NEXTAUTH_SECRET") or secrets.token_hex(32)
+    async with RedisStandIn(port=redis_port) as redis:
+        server_env = {
+            **os.environ,
+            "PORT": str(port),
+            "REDIS_URL": redis.url,
+            "NEXTAUTH_SECRET": secret,
+            **(env or {}),
+        }
+        log = open(log_path, "wb") if log_path else asyncio.subprocess.DEVNULL
+        process = await asyncio.create_subprocess_exec(
+            *command, cwd=str(REPO_DIR), env=server_env,
+            stdout=log, stderr=asyncio.subprocess.STDOUT, start_new_session=True,
+        )
+        try:
+            await wait_for_port("127.0.0.1", port, ready_timeout, process)
+            yield LocalStack(f"http://127.0.0.1:{port}", redis, secret, process)
+        finally:
+            if process.returncode is None:
+                os.killpg(process.pid, signal.SIGTERM)
+                try:
+                    await asyncio.wait_for(process.wait(), 10)
+                except asyncio.TimeoutError:
+                    os.killpg(process.pid, signal.SIGKILL)
+                    await process.wait()
+            if log_path:
+                log.close()
@@ -0,0 +1,84 @@
+"""Latency samples and percentile summaries shared by the benchmarks."""
+
+import bisect
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+# Upper bounds (ms) of the latency histogram buckets: 1-2-5 steps up to 60 s.
+HISTOGRAM_BOUNDS_MS = [base * 10 ** exp for exp in range(0, 5) for base in (1, 2, 5)] + [60000]
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(values: Iterable[float], percentiles: Iterable[float] = PERCENTILES) -> Dict[str, float]:
+    """Count, mean, max and the requested percentiles of ``values`` (seconds in, ms out)."""
+    ordered = sorted(values)
+    summary: Dict[str, float] = {"count": len(ordered)}
+    if not ordered:
+        return summary
+    summary["mean_ms"] = round(sum(ordered) / len(ordered) * 1000, 3)
+    for pct in percentiles:
+        summary[f"p{pct:g}_ms"] = round(percentile(ordered, pct) * 1000, 3)
+    summary["max_ms"] = round(ordered[-1] * 1000, 3)
+    return summary
+
+
+def histogram(values: Iterable[float], bounds_ms: Sequence[float] = HISTOGRAM_BOUNDS_MS) -> Dict[str, int]:
+    """Count ``values`` (seconds) into ``<=N ms`` buckets; non-empty buckets only."""
+    counts = [0] * (len(bounds_ms) + 1)
+    for value in values:
+        counts[bisect.bisect_left(bounds_ms, value * 1000)] += 1
+    labels = [f"<={bound:g}ms" for bound in bounds_ms] + [f">{bounds_ms[-1]:g}ms"]
+    return {label: count for label, count in zip(labels, counts) if count}
+
+
+class Samples:
+    """Latency samples and error counts grouped by a label (event or endpoint)."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, label: str, seconds: float) -> None:
+        self.values[label].append(seconds)
+
+    def error(self, label: str, kind: str) -> None:
+        self.errors[label][kind] += 1
+
+    def merge(self, other: "Samples") -> None:
+        for label, values in other.values.items():
+            self.values[label].extend(values)
+        for label, kinds in other.errors.items():
+            for kind, count in kinds.items():
+                self.errors[label][kind] += count
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        labels = sorted(set(self.values) | set(self.errors))
+        report: Dict[str, Dict[str, object]] = {}
+        for label in labels:
+            entry: Dict[str, object] = dict(summarize(self.values.get(label, [])))
+            if self.errors.get(label):
+                entry["errors"] = dict(self.errors[label])
+            report[label] = entry
+        return report
+
+
+def format_table(report: Dict[str, Dict[str, object]], percentiles: Iterable[float] = PERCENTILES) -> str:
+    """Render :meth:`Samples.summary` output as a fixed-width table."""
+    columns = [f"p{pct:g}_ms" for pct in percentiles]
+    width = max([len(label) for label in report] + [5])
+    lines = [f"{'label':<{width}} {'count':>7} " + " ".join(f"{col:>10}" for col in columns) + f" {'errors':>7}"]
+    for label, entry in report.items():
+        errors = sum(entry.get("errors", {}).values())
+        cells = " ".join(f"{entry.get(col, 0.0):>10.1f}" for col in columns)
+        lines.append(f"{label:<{width}} {entry['count']:>7} {cells} {errors:>7}")
+    return "\n".join(lines)
@@ -0,0 +1,209 @@
+"""Condition-based step helper replacing fixed ``wait_for_timeout`` sleeps.
+
+Every action waits only as long as the app needs: Playwright's actionability
+checks before the click/fill, then optionally the response of one API route
+(``api``), a Socket.IO event the page receives (``ack``), and a registered
+element that must appear (``until``) or disappear (``gone``) for actions
+that only change the UI. Each step has its
+own timeout and all steps of a test draw from one shared time budget.
+
+Each step's phases are timed into :attr:`StepRecord.phases`; under an active
+:mod:`harness.trace` collector the page's requests and Socket.IO frames are
+recorded per step as well, and under an active :mod:`harness.flight` log
+every finished step lands in its ring. Under an active :mod:`harness.render`
+profiler, the steps it selects run inside a DevTools trace.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from .flight import CURRENT_FLIGHT
+from .frames import SocketFrames
+from .lighthouse import CURRENT_STATES
+from .locators import LOCATORS, LocatorRegistry
+from .render import CURRENT_RENDER
+from .trace import CURRENT_TRACE
+
+DEFAULT_STEP_TIMEOUT_MS = 5000
+DEFAULT_BUDGET_MS = int(os.environ.get("TC_STEP_BUDGET_MS", "120000"))
+
+# A registered locator name such as "nav.tasks", or a raw Playwright locator.
+Target = Union[str, async_api.Locator]
+
+
+class BudgetExceeded(AssertionError):
+    """The test spent its whole step budget before finishing."""
+
+
+@dataclass
+class StepRecord:
+    action: str
+    target: str
+    duration: float
+    api: Optional[str] = None
+    ack: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)  # seconds per phase
+    error: Optional[str] = None
+    until: Optional[str] = None
+    gone: Optional[str] = None
+
+
+@dataclass
+class Expect:
+    """What a step waits for once its action is done."""
+
+    api: Optional[str] = None     # path prefix of a response
+    ack: Optional[str] = None     # Socket.IO event received
+    until: Optional[str] = None   # locator name that must become visible
+    gone: Optional[str] = None    # locator name that must become hidden
+
+
+@dataclass
+class Steps:
+    page: async_api.Page
+    step_timeout: int = DEFAULT_STEP_TIMEOUT_MS
+    budget: int = DEFAULT_BUDGET_MS
+    registry: LocatorRegistry = LOCATORS
+    records: List[StepRecord] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._started = time.perf_counter()
+        self.frames = SocketFrames(self.page)
+        self.ui = self.registry.bind(self.page)
+        collector = CURRENT_TRACE.get()
+        self.trace = collector.attach(self.page) if collector is not None else None
+        if self.trace is not None:
+            self.frames.listeners.append(self.trace.socket_event)
+        self.flight = CURRENT_FLIGHT.get()
+        self.render = CURRENT_RENDER.get()
+        self.states = CURRENT_STATES.get()
+
+    @property
+    def remaining(self) -> float:
+        """Milliseconds left in the budget."""
+        return self.budget - (time.perf_counter() - self._started) * 1000
+
+    def _timeout(self, timeout: Optional[int]) -> float:
+        remaining = self.remaining
+        if remaining <= 0:
+            raise BudgetExceeded(f"step budget of {self.budget} ms exhausted after {len(self.records)} steps")
+        return min(timeout or self.step_timeout, remaining)
+
+    async def click(self, target: Target, *, nth: int = 0, api: Optional[str] = None,
+                    ack: Optional[str] = None, until: Optional[str] = None, gone: Optional[str] = None,
+                    timeout: Optional[int] = None) -> None:
+        """Click once ``target`` is actionable, then wait for whichever conditions are given."""
+        await self._step("click", target, nth, lambda locator, t: locator.click(timeout=t),
+                         Expect(api, ack, until, gone), timeout)
+
+    async def fill(self, target: Target, value: str, *, nth: int = 0, api: Optional[str] = None,
+                   ack: Optional[str] = None, until: Optional[str] = None, gone: Optional[str] = None,
+                   timeout: Optional[int] = None) -> None:
+        """Fill ``target`` once it is editable, then wait for whichever conditions are given."""
+        await self._step("fill", target, nth, lambda locator, t: locator.fill(value, timeout=t),
+                         Expect(api, ack, until, gone), timeout)
+
+    @asynccontextmanager
+    async def profile(self, label: str) -> AsyncIterator[None]:
+        """Profile the enclosed block (a reload, a resize) as a render step named ``label``."""
+        if self.render is None or not self.render.wants(label):
+            yield
+            return
+        async with self.render.span(self.page, label, "block"):
+            yield
+
+    async def _step(self, action: str, target: Target, nth: int,
+                    perform: Callable[[async_api.Locator, float], Awaitable[None]],
+                    expect: Expect, timeout: Optional[int]) -> None:
+        label = target if isinstance(target, str) else str(target)
+        if self.render is not None and self.render.wants(label):
+            async with self.render.span(self.page, label, action):
+                await self._run_step(action, target, label, nth, perform, expect, timeout)
+        else:
+            await self._run_step(action, target, label, nth, perform, expect, timeout)
+
+    async def _run_step(self, action: str, target: Target, label: str, nth: int,
+                        perform: Callable[[async_api.Locator, float], Awaitable[None]],
+                        expect: Expect, timeout: Optional[int]) -> None:
+        step_timeout = self._timeout(timeout)
+        started = time.perf_counter()
+        deadline = started + step_timeout / 1000
+        phases: Dict[str, float] = {}
+        if self.states is not None:
+            await self.states.before_step(self.page)
+        traced = self.trace.begin(action, label) if self.trace is not None else None
+
+        def left() -> float:
+            return max(1.0, (deadline - time.perf_counter()) * 1000)
+
+        def mark(phase: str, since: float) -> float:
+            now = time.perf_counter()
+            phases[phase] = now - since
+            return now
+
+        api = expect.api
+        acked = self.frames.expect(expect.ack) if expect.ack else None
+        waiting = ""
+        error: Optional[str] = None
+        try:
+            now = started
+            if isinstance(target, str):
+                locator = (await self.ui.resolve(target, step_timeout)).nth(nth)
+                now = mark("resolve", now)
+            else:
+                locator = target.nth(nth) if nth else target
+            await locator.wait_for(state="visible", timeout=left())
+            now = mark("actionable", now)
+            # Resolved while still on screen; afterwards there is nothing left to resolve.
+            leaving = (await self.ui.resolve(expect.gone, left())).first if expect.gone else None
+            url_before = self.page.url
+            if api:
+                async with self.page.expect_response(
+                    lambda response: urlparse(response.url).path.startswith(api),
+                    timeout=left(),
+                ) as response_info:
+                    await perform(locator, left())
+                    now = mark(action, now)
+                await response_info.value
+                now = mark("response", now)
+            else:
+                await perform(locator, left())
+                now = mark(action, now)
+            if acked is not None:
+                waiting = f"Socket.IO event '{expect.ack}' not received"
+                await asyncio.wait_for(acked, left() / 1000)
+                now = mark("ack", now)
+            if expect.until:
+                await (await self.ui.resolve(expect.until, left())).first.wait_for(state="visible", timeout=left())
+                now = mark("until", now)
+            if leaving is not None:
+                await leaving.wait_for(state="hidden", timeout=left())
+                now = mark("gone", now)
+            if self.page.url != url_before:
+                await self.page.wait_for_load_state("domcontentloaded", timeout=left())
+                mark("navigation", now)
+        except asyncio.TimeoutError:
+            error = f"{waiting} within {step_timeout:.0f} ms"
+            raise async_api.TimeoutError(error) from None
+        except BaseException as exc:
+            error = f"{type(exc).__name__}: {exc}".strip()
+            raise
+        finally:
+            if acked is not None and not acked.done():
+                acked.cancel()
+            record = StepRecord(action, label, time.perf_counter() - started, api, expect.ack, phases, error,
+                                expect.until, expect.gone)
+            self.records.append(record)
+            if traced is not None:
+                self.trace.end(traced, phases, error)
+            if self.flight is not None:
+                await self.flight.step(self.page, action, label, record.duration, error)
+            if self.states is not None and error is None:
+                await self.states.after_step(self.page, action, label)
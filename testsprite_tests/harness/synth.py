@@ -0,0 +1,471 @@
+"""Stream large synthetic datasets into the app database for scale testing.
+
+The seed data is one couple with three tasks. ``python -m harness synth``
+writes as many couples as asked, each with its users, children, tasks,
+Daily Sync entries, rituals, memories, rewards and kids activities spread
+over its history. That shows how ``/api/tasks``, ``/api/memories`` or the
+export routes behave for a couple with years of history.
+
+Couples are generated one at a time and their rows buffered per table. Once
+``batch`` rows are buffered, every table is flushed parents first, so foreign
+keys hold and memory stays flat however many couples are written. SQLite
+gets ``executemany`` inside one transaction per flush, with journaling and
+fsyncs off only for a ``scratch`` file the harness cloned for the run. PostgreSQL gets
+``COPY`` through ``asyncpg`` (``pip install asyncpg``).
+
+Tables and columns come from ``prisma/schema.prisma``. Generated columns
+the schema lacks are an error, so the generator cannot drift from the
+schema unnoticed. Each table is then narrowed to the columns the target
+database actually has, and a required column left without a value stops the
+run before anything is written. Values are stored the way Prisma stores
+them: DateTime as epoch milliseconds in SQLite and ``timestamp(3)`` in
+PostgreSQL, Json as text.
+
+How much history a couple has is the main knob. A ``heavy_share`` of
+couples have the full ``years``. The others are skewed towards recent
+sign-ups, and each couple's activity varies around the per-week ``rates``.
+Ids are ``<prefix>-<couple>-<table><n>``, so ``--start`` lets several
+processes fill disjoint ranges of one PostgreSQL database in parallel.
+Every user's password is ``password123``, as in ``prisma/seed.ts``.
+"""
+
+import json
+import random
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .auth import REPO_DIR
+from .databases import sqlite_path
+from .load import MICRO_OFFERS, MOOD_TAGS
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
+
+SCHEMA_PATH = REPO_DIR / "prisma" / "schema.prisma"
+# bcrypt of "password123", the password prisma/seed.ts gives its users.
+PASSWORD_HASH = "$2b$12$nnziZPKIhIqhjZKARXDfE.2.y2R0OzuVieZvBzIXBTc68hY/bhPte"
+DAY_MS = 86_400_000
+WEEK_MS = 7 * DAY_MS
+SCALAR_TYPES = {"String", "Int", "Float", "Boolean", "DateTime", "Json", "BigInt", "Decimal", "Bytes"}
+
+# Mean rows per couple per week (family_activities: per child per week).
+DEFAULT_RATES = {
+    "tasks": 10.0,
+    "sync_entries": 10.0,
+    "ritual_sessions": 3.0,
+    "memories": 2.0,
+    "family_activities": 2.0,
+}
+
+# Generated columns per table, in row order; parents before children.
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "couples": ("id", "partner_a_name", "partner_b_name", "anniversary_date", "city", "region", "language",
+                "children", "premium_until", "encryption_key", "created_at", "updated_at"),
+    "users": ("id", "couple_id", "email", "password_hash", "name", "partner_role", "is_active", "last_login",
+              "created_at", "updated_at"),
+    "children": ("id", "couple_id", "name", "age", "preferences", "created_at"),
+    "rasa_balance": ("id", "couple_id", "play_percentage", "duty_percentage", "balance_percentage", "updated_at"),
+    "tasks": ("id", "couple_id", "title", "description", "assigned_to", "status", "category", "ai_reasoning",
+              "due_at", "completed_at", "created_at", "updated_at"),
+    "reward_transactions": ("id", "couple_id", "coins_earned", "coins_spent", "activity", "created_at"),
+    "sync_entries": ("id", "couple_id", "partner", "mood_score", "energy_level", "mood_tags", "context_notes",
+                     "created_at"),
+    "ritual_sessions": ("id", "couple_id", "ritual_type", "archetype", "duration_minutes", "completion_data",
+                        "started_at", "completed_at"),
+    "memories": ("id", "couple_id", "type", "content", "title", "description", "date", "tags", "sentiment",
+                 "partners", "is_private", "memory_type", "created_at", "updated_at"),
+    "family_activities": ("id", "child_id", "activity_type", "activity_theme", "completion_data", "completed_at",
+                          "created_at"),
+}
+
+MEN = ["Arjun", "Rohan", "Vikram", "Aditya", "Karthik", "Rahul", "Siddharth", "Nikhil", "Aman", "Varun",
+       "Pranav", "Harsh", "Manish", "Suresh", "Kabir", "Ishaan", "Dev", "Yash", "Abhishek", "Rajesh"]
+WOMEN = ["Priya", "Ananya", "Sneha", "Kavya", "Divya", "Pooja", "Meera", "Neha", "Aishwarya", "Lakshmi",
+         "Shreya", "Riya", "Nandini", "Deepika", "Sanya", "Isha", "Tanvi", "Aditi", "Swati", "Radhika"]
+SURNAMES = ["Sharma", "Iyer", "Reddy", "Patel", "Nair", "Gupta", "Menon", "Rao", "Banerjee", "Kulkarni",
+            "Singh", "Joshi", "Pillai", "Das", "Mehta", "Chatterjee", "Shetty", "Verma", "Naidu", "Desai"]
+KIDS = ["Aarav", "Diya", "Vihaan", "Saanvi", "Advik", "Myra", "Reyansh", "Anika", "Vivaan", "Kiara"]
+CITIES = [("Mumbai", "west-india", "marathi"), ("Pune", "west-india", "marathi"),
+          ("Ahmedabad", "west-india", "gujarati"), ("Delhi", "north-india", "hindi"),
+          ("Gurugram", "north-india", "hindi"), ("Jaipur", "north-india", "hindi"),
+          ("Bengaluru", "south-india", "kannada"), ("Chennai", "south-india", "tamil"),
+          ("Hyderabad", "south-india", "telugu"), ("Kochi", "south-india", "malayalam"),
+          ("Kolkata", "east-india", "bengali"), ("Bhubaneswar", "east-india", "odia")]
+TASK_STATUSES = ["PENDING", "IN_PROGRESS", "COMPLETED", "CANCELLED"]
+TASK_CATEGORIES = ["DAILY", "WEEKLY", "MONTHLY", "SEASONAL"]
+RITUAL_TYPES = ["DAILY_SYNC", "FAIRNESS_RESET", "CONNECTION_RITUAL", "PLAY_ACTIVITY", "BALANCE_PRACTICE"]
+ARCHETYPES = ["RADHA_KRISHNA", "SITA_RAM", "SHIVA_SHAKTI"]
+THEMES = ["krishna", "hanuman", "saraswati", "mythology", "kindness", "storybook"]
+KID_ACTIVITIES = ["emotion", "story", "drawing", "counting", "music", "gratitude"]
+MEMORY_TITLES = ["Sunset at Marine Drive", "Diwali at home", "First day of school", "Chai on the balcony",
+                 "Anniversary dinner", "Monsoon walk", "Sunday dosa breakfast", "Holi with the neighbours",
+                 "Weekend trip to Lonavala", "Grandparents visit"]
+SENTENCES = ["We laughed until the chai went cold.", "The kids fell asleep in the car on the way back.",
+             "It rained the whole evening and nobody minded.", "We promised to do this every month.",
+             "Amma called halfway through and joined on video.", "The traffic was terrible but worth it.",
+             "We finally tried the new place near the station.", "Small moment, but it felt like a reset."]
+TAG_WORDS = ["anniversary", "romantic", "family", "kids", "festival", "travel", "food", "kindness", "rain",
+             "gratitude", "weekend", "home"]
+
+
+def parse_schema(path: Path = SCHEMA_PATH) -> Dict[str, Dict[str, Dict[str, bool]]]:
+    """Table -> column -> ``{"optional", "default", "enum"}`` for the scalar fields of every model."""
+    text = path.read_text()
+    enums = set(re.findall(r"^enum\s+(\w+)\s*\{", text, re.M))
+    tables: Dict[str, Dict[str, Dict[str, bool]]] = {}
+    for name, body in re.findall(r"^model\s+(\w+)\s*\{(.*?)^\}", text, re.M | re.S):
+        mapped = re.search(r'@@map\("([^"]+)"\)', body)
+        columns = {}
+        for line in body.splitlines():
+            match = re.match(r"\s*(\w+)\s+(\w+)(\?|\[\])?(.*)", line.split("//")[0])
+            if not match or match.group(2) not in SCALAR_TYPES | enums or match.group(3) == "[]":
+                continue
+            attributes = match.group(4)
+            columns[match.group(1)] = {
+                "optional": match.group(3) == "?",
+                "default": "@default" in attributes or "@updatedAt" in attributes,
+                "enum": match.group(2) in enums,
+                "datetime": match.group(2) == "DateTime",
+            }
+        tables[mapped.group(1) if mapped else name] = columns
+    return tables
+
+
+def check_against_schema(schema: Dict[str, Dict[str, Dict[str, bool]]]) -> None:
+    """Fail when the generator writes tables or columns the Prisma schema does not have."""
+    problems = []
+    for table, columns in COLUMNS.items():
+        if table not in schema:
+            problems.append(f"table {table}")
+        else:
+            problems.extend(f"{table}.{column}" for column in columns if column not in schema[table])
+    if problems:
+        raise ValueError(f"not in {SCHEMA_PATH.name}: {', '.join(problems)}")
+
+
+@dataclass
+class SynthConfig:
+    couples: int = 1000
+    years: float = 3.0              # history of the oldest couples
+    heavy_share: float = 0.1        # couples with the full history
+    rates: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_RATES))
+    batch: int = 5000               # rows buffered before a flush
+    seed: int = 0
+    start: int = 0                  # index of the first couple, for parallel fills
+    prefix: str = "syn"
+    now_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+
+
+class Generator:
+    """Rows for one couple at a time, as ``(table, tuple)`` in :data:`COLUMNS` order."""
+
+    def __init__(self, config: SynthConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        rng = self.rng
+        # JSON cells are drawn from pools instead of serialized per row.
+        self.mood_tags = [json.dumps(rng.sample(MOOD_TAGS, rng.randint(1, 3))) for _ in range(256)]
+        self.memory_tags = [json.dumps(rng.sample(TAG_WORDS, rng.randint(1, 4))) for _ in range(256)]
+        self.offers = [(title, category) for category, titles in MICRO_OFFERS.items() for title in titles]
+
+    def _count(self, table: str, weeks: float, activity: float) -> int:
+        mean = self.config.rates.get(table, 0.0) * weeks * activity
+        return int(mean + self.rng.random())  # unbiased rounding keeps small means non-zero on average
+
+    def couple(self, index: int) -> Iterator[Tuple[str, tuple]]:
+        config, rng = self.config, self.rng
+        now = config.now_ms
+        full_ms = config.years * 52 * WEEK_MS
+        tenure = full_ms if rng.random() < config.heavy_share else full_ms * rng.random() ** 2
+        tenure = max(tenure, DAY_MS)
+        joined = now - int(tenure)
+        weeks = tenure / WEEK_MS
+        activity = rng.lognormvariate(0, 0.5)
+        ids = f"{config.prefix}-{index:x}-"
+        couple_id = ids + "c"
+        city, region, language = rng.choice(CITIES)
+        surname = rng.choice(SURNAMES)
+        partner_a, partner_b = rng.choice(MEN), rng.choice(WOMEN)
+        kid_count = rng.choices((0, 1, 2, 3), (30, 40, 25, 5))[0]
+        kids = [(f"{ids}k{n}", rng.choice(KIDS), rng.randint(2, 12)) for n in range(kid_count)]
+        anniversary = joined - rng.randint(1, 15 * 52) * WEEK_MS
+        premium = now + rng.randint(1, 365) * DAY_MS if rng.random() < 0.2 else None
+
+        yield "couples", (couple_id, partner_a, partner_b, anniversary, city, region, language,
+                          json.dumps([{"name": name, "age": age} for _, name, age in kids]), premium,
+                          "%032x" % rng.getrandbits(128), joined, now)
+        users = []
+        for role, first in (("partner_a", partner_a), ("partner_b", partner_b)):
+            user_id = f"{ids}u{role[-1]}"
+            users.append(user_id)
+            yield "users", (user_id, couple_id, f"{first.lower()}.{surname.lower()}.{index}@{config.prefix}.example.com",
+                            PASSWORD_HASH, f"{first} {surname}", role, True, now - rng.randint(0, 30) * DAY_MS,
+                            joined, now)
+        for kid_id, name, age in kids:
+            yield "children", (kid_id, couple_id, name, age, '["stories", "drawing"]', joined)
+        play = rng.uniform(20, 50)
+        duty = rng.uniform(20, 80 - play)
+        yield "rasa_balance", (ids + "r", couple_id, round(play, 1), round(duty, 1), round(100 - play - duty, 1), now)
+
+        span = now - joined
+        random_ = rng.random
+        randint = rng.randint
+        choice = rng.choice
+        recent = now - 14 * DAY_MS
+        for n in range(self._count("tasks", weeks, activity)):
+            created = joined + int(random_() * span)
+            title, kind = choice(self.offers)
+            roll = random_()
+            if created < recent:
+                status = "COMPLETED" if roll < 0.85 else "CANCELLED" if roll < 0.9 else "PENDING"
+            else:
+                status = TASK_STATUSES[randint(0, 3)]
+            completed = created + randint(1, 72) * 3_600_000 if status == "COMPLETED" else None
+            task_id = f"{ids}t{n:x}"
+            yield "tasks", (task_id, couple_id, title, f"{kind} micro-offer", choice(("partner_a", "partner_b", "both")),
+                            status, choice(TASK_CATEGORIES), None, created + randint(1, 7) * DAY_MS, completed,
+                            created, completed or created)
+            if completed is not None and roll < 0.7:
+                yield "reward_transactions", (f"{ids}w{n:x}", couple_id, randint(1, 5) * 10, 0,
+                                              f"Completed: {title}", completed)
+        for n in range(self._count("sync_entries", weeks, activity)):
+            yield "sync_entries", (f"{ids}s{n:x}", couple_id, "partner_a" if n % 2 else "partner_b", randint(1, 5),
+                                   randint(1, 10), choice(self.mood_tags), None if random_() < 0.7 else choice(SENTENCES),
+                                   joined + int(random_() * span))
+        for n in range(self._count("ritual_sessions", weeks, activity)):
+            started = joined + int(random_() * span)
+            minutes = randint(5, 45)
+            done = random_() < 0.8
+            yield "ritual_sessions", (f"{ids}i{n:x}", couple_id, choice(RITUAL_TYPES), choice(ARCHETYPES), minutes,
+                                      '{"rating": %d}' % randint(1, 5) if done else None, started,
+                                      started + minutes * 60_000 if done else None)
+        partners = json.dumps(users)
+        for n in range(self._count("memories", weeks, activity)):
+            memory_id = f"{ids}m{n:x}"
+            created = joined + int(random_() * span)
+            kind = rng.choices(("text", "image", "audio", "video"), (60, 25, 10, 5))[0]
+            story = " ".join(rng.sample(SENTENCES, randint(1, 4)))
+            content = story if kind == "text" else f"https://cdn.example.com/memories/{memory_id}.{kind}"
+            yield "memories", (memory_id, couple_id, kind, content, choice(MEMORY_TITLES), story, created,
+                               choice(self.memory_tags), rng.choices(("positive", "neutral", "negative"), (70, 25, 5))[0],
+                               partners, random_() < 0.1, choice(("kindness", "storybook", "general")), created, created)
+        for kid_id, _, _ in kids:
+            for n in range(self._count("family_activities", weeks, activity)):
+                created = joined + int(random_() * span)
+                done = random_() < 0.75
+                yield "family_activities", (f"{kid_id}a{n:x}", kid_id, choice(KID_ACTIVITIES), choice(THEMES),
+                                            '{"stars": %d}' % randint(1, 3) if done else None,
+                                            created + randint(5, 30) * 60_000 if done else None, created)
+
+    def rows(self) -> Iterator[Tuple[str, tuple]]:
+        for index in range(self.config.start, self.config.start + self.config.couples):
+            yield from self.couple(index)
+
+
+def _datetime(ms: Optional[int]) -> Optional[datetime]:
+    return None if ms is None else datetime(1970, 1, 1) + timedelta(milliseconds=ms)
+
+
+class SqliteWriter:
+    """``executemany`` into a SQLite file, one transaction per flush."""
+
+    def __init__(self, path: Path, scratch: bool = False):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        if scratch:
+            # A clone made for this run can be made again; durability is not worth the fsyncs.
+            # Anyone else's file keeps its journal, so a crash mid-flush cannot corrupt it.
+            self.db.execute("PRAGMA journal_mode = OFF")
+            self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute("PRAGMA cache_size = -262144")
+        self._sql: Dict[str, str] = {}
+
+    async def columns(self, table: str) -> Dict[str, bool]:
+        """Column -> whether a row must supply it; empty when the table does not exist."""
+        rows = self.db.execute(f'PRAGMA table_info("{table}")').fetchall()
+        return {name: bool(notnull) and default is None and not pk for _, name, _, notnull, default, pk in rows}
+
+    def converters(self, table: str, columns: Sequence[str]) -> List[Optional[Callable[[Any], Any]]]:
+        return [None] * len(columns)  # epoch milliseconds, 0/1 and JSON text are what Prisma stores
+
+    async def write(self, batches: List[Tuple[str, Sequence[str], List[tuple]]]) -> None:
+        self.db.execute("BEGIN")
+        for table, columns, rows in batches:
+            sql = self._sql.get(table)
+            if sql is None:
+                names = ", ".join(f'"{column}"' for column in columns)
+                sql = self._sql[table] = f'INSERT INTO "{table}" ({names}) VALUES ({", ".join("?" * len(columns))})'
+            self.db.executemany(sql, rows)
+        self.db.execute("COMMIT")
+
+    async def size(self) -> int:
+        return self.path.stat().st_size
+
+    async def close(self) -> None:
+        self.db.close()
+
+
+class PostgresWriter:
+    """``COPY`` into PostgreSQL, one transaction per flush."""
+
+    def __init__(self, url: str, schema: Dict[str, Dict[str, Dict[str, bool]]]):
+        if asyncpg is None:
+            raise RuntimeError("harness.synth needs the 'asyncpg' package for PostgreSQL: pip install asyncpg")
+        self.url = url
+        self.schema = schema
+        self.db = None
+
+    async def open(self) -> "PostgresWriter":
+        self.db = await asyncpg.connect(self.url)
+        return self
+
+    async def columns(self, table: str) -> Dict[str, bool]:
+        rows = await self.db.fetch(
+            "SELECT column_name, is_nullable, column_default FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = $1", table)
+        return {row["column_name"]: row["is_nullable"] == "NO" and row["column_default"] is None for row in rows}
+
+    def converters(self, table: str, columns: Sequence[str]) -> List[Optional[Callable[[Any], Any]]]:
+        fields = self.schema.get(table, {})
+        return [_datetime if fields.get(column, {}).get("datetime") else None for column in columns]
+
+    async def write(self, batches: List[Tuple[str, Sequence[str], List[tuple]]]) -> None:
+        async with self.db.transaction():
+            for table, columns, rows in batches:
+                await self.db.copy_records_to_table(table, records=rows, columns=list(columns))
+
+    async def size(self) -> int:
+        return await self.db.fetchval("SELECT pg_database_size(current_database())")
+
+    async def close(self) -> None:
+        await self.db.close()
+
+
+async def open_writer(database_url: str, schema: Dict[str, Dict[str, Dict[str, bool]]], scratch: bool = False):
+    if database_url.startswith("file:"):
+        return SqliteWriter(sqlite_path(database_url), scratch)
+    if database_url.startswith(("postgres://", "postgresql://")):
+        return await PostgresWriter(database_url, schema).open()
+    raise ValueError(f"cannot write synthetic data to {database_url.split(':', 1)[0]!r} databases")
+
+
+@dataclass
+class _Table:
+    columns: Tuple[str, ...]        # as written
+    keep: Optional[List[int]]       # positions in the generated row, None for all
+    convert: List[Optional[Callable[[Any], Any]]]
+    rows: List[tuple] = field(default_factory=list)
+
+
+async def _plan_tables(writer, schema) -> Tuple[Dict[str, _Table], List[str]]:
+    """Project every generated table onto the target's columns; list what is skipped."""
+    tables: Dict[str, _Table] = {}
+    skipped: List[str] = []
+    for table, generated in COLUMNS.items():
+        actual = await writer.columns(table)
+        if not actual:
+            skipped.append(f"{table} (no such table)")
+            continue
+        missing = [column for column, required in actual.items() if required and column not in generated]
+        if missing:
+            raise RuntimeError(f"{table} requires {', '.join(missing)}, which the generator does not write")
+        keep = [position for position, column in enumerate(generated) if column in actual]
+        columns = tuple(generated[position] for position in keep)
+        dropped = [column for column in generated if column not in actual]
+        if dropped:
+            skipped.append(f"{table}.{','.join(dropped)} (not in the database)")
+        tables[table] = _Table(columns, None if len(keep) == len(generated) else keep,
+                               writer.converters(table, columns))
+    return tables, skipped
+
+
+async def synthesize(config: SynthConfig, database_url: str, *, roster: Optional[TextIO] = None,
+                     dry_run: bool = False, scratch: bool = False,
+                     progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     progress_every: float = 5.0) -> Dict[str, Any]:
+    """Generate ``config.couples`` couples into ``database_url``; returns row counts and throughput.
+
+    ``roster`` receives one ``{"coupleId", "userId", "name", "role"}`` line per
+    user, a ``.jsonl`` roster for :func:`harness.couples.load_roster`.
+    ``dry_run`` generates without writing. ``scratch`` marks a SQLite file
+    made for this run, which is written without a journal.
+    """
+    schema = parse_schema()
+    check_against_schema(schema)
+    writer = None if dry_run else await open_writer(database_url, schema, scratch)
+    try:
+        if writer is not None:
+            tables, skipped = await _plan_tables(writer, schema)
+        else:
+            tables = {table: _Table(columns, None, [None] * len(columns)) for table, columns in COLUMNS.items()}
+            skipped = []
+        counts = {table: 0 for table in COLUMNS}
+        buffered = 0
+        started = last_report = time.perf_counter()
+
+        async def flush() -> None:
+            batches = []
+            for table, plan in tables.items():
+                if plan.rows:
+                    rows = plan.rows
+                    if plan.keep is not None:
+                        rows = [tuple(row[position] for position in plan.keep) for row in rows]
+                    if any(plan.convert):
+                        rows = [tuple(value if fn is None else fn(value) for fn, value in zip(plan.convert, row))
+                                for row in rows]
+                    batches.append((table, plan.columns, rows))
+                    plan.rows = []
+            if writer is not None and batches:
+                await writer.write(batches)
+
+        for table, row in Generator(config).rows():
+            counts[table] += 1
+            plan = tables.get(table)
+            if plan is None:
+                continue
+            plan.rows.append(row)
+            buffered += 1
+            if table == "users" and roster is not None:
+                roster.write(json.dumps({"coupleId": row[1], "userId": row[0], "name": row[4], "role": row[5]}) + "\n")
+            if buffered >= config.batch:
+                await flush()
+                buffered = 0
+                now = time.perf_counter()
+                if progress is not None and now - last_report >= progress_every:
+                    last_report = now
+                    total = sum(counts.values())
+                    progress({"rows": total, "couples": counts["couples"], "rows_per_s": round(total / (now - started))})
+        await flush()
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        return {
+            "database_url": None if dry_run else database_url,
+            "couples": counts["couples"],
+            "rows": total,
+            "tables": counts,
+            "skipped": skipped,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_s": round(total / elapsed) if elapsed else 0,
+            "size_bytes": await writer.size() if writer is not None else None,
+        }
+    finally:
+        if writer is not None:
+            await writer.close()
+
+
+def parse_rates(items: Sequence[str]) -> Dict[str, float]:
+    """``["tasks=20", "memories=0.5"]`` over :data:`DEFAULT_RATES`."""
+    rates = dict(DEFAULT_RATES)
+    for item in items:
+        table, _, value = item.partition("=")
+        if table not in DEFAULT_RATES:
+            raise ValueError(f"no rate for {table!r}; rates exist for {', '.join(DEFAULT_RATES)}")
+        rates[table] = float(value)
+    return rates
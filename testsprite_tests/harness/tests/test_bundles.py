@@ -0,0 +1,101 @@
+from harness.bundles import chunk_key, compare
+
+ORIGIN = "http://localhost:3000"
+
+
+def test_chunk_key_strips_content_hashes():
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/app/page-3f9a1c2be4d5f6a7.js", ORIGIN) == \
+        "/_next/static/chunks/app/page.js"
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/webpack-0a1b2c3d4e5f6789.js", ORIGIN) == \
+        "/_next/static/chunks/webpack.js"
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/main-app.abcdef0123456789.mjs", ORIGIN) == \
+        "/_next/static/chunks/main-app.mjs"
+    # Turbopack-style base64ish ids, 20 characters or more.
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/framework-Xy9_Qz1AbCdEfGhIjKlMnOp.js", ORIGIN) == \
+        "/_next/static/chunks/framework.js"
+
+
+def test_chunk_key_keeps_names_that_only_look_like_hashes():
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/app/layout.js", ORIGIN) == "/_next/static/chunks/app/layout.js"
+    # Too short to be a hash.
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/polyfills-abc123.js", ORIGIN) == \
+        "/_next/static/chunks/polyfills-abc123.js"
+    # Only the part before the extension is a hash.
+    assert chunk_key(f"{ORIGIN}/static/deadbeefcafe/app.js", ORIGIN) == "/static/deadbeefcafe/app.js"
+
+
+def test_chunk_key_replaces_the_build_id():
+    assert chunk_key(f"{ORIGIN}/_next/static/Ab3dEf_gHiJkLmNo/_buildManifest.js", ORIGIN) == \
+        "/_next/static/<build>/_buildManifest.js"
+    assert chunk_key(f"{ORIGIN}/_next/static/development/_ssgManifest.js", ORIGIN) == \
+        "/_next/static/<build>/_ssgManifest.js"
+    # chunks/, css/ and media/ are directories, not build ids.
+    assert chunk_key(f"{ORIGIN}/_next/static/css/app/layout.css", ORIGIN) == "/_next/static/css/app/layout.css"
+
+
+def test_chunk_key_ignores_query_and_prefixes_other_hosts():
+    assert chunk_key(f"{ORIGIN}/_next/static/chunks/app/page-3f9a1c2be4d5f6a7.js?v=1", ORIGIN) == \
+        "/_next/static/chunks/app/page.js"
+    assert chunk_key("https://cdn.example.com/lib/react-0123456789abcdef.js", ORIGIN) == "cdn.example.com/lib/react.js"
+
+
+def route(name="/", ok=True, script=100_000, stylesheet=10_000, chunks=None, hydrated_ms=500.0, **extra):
+    kinds = {"script": script, "stylesheet": stylesheet}
+    return {
+        "route": name,
+        "ok": ok,
+        "hydrated_ms": hydrated_ms,
+        "totals": {kind: {"files": 1, "transferred": size, "decoded": size * 3} for kind, size in kinds.items()},
+        "chunks": chunks if chunks is not None else {"/app.js": {"kind": "script", "transferred": script}},
+        **extra,
+    }
+
+
+def report(*routes):
+    return {"routes": list(routes)}
+
+
+def test_compare_flags_growth_over_both_thresholds():
+    findings = compare(report(route(script=100_000)), report(route(script=110_000)))
+    assert findings == ["/: script 97.7 KiB -> 107.4 KiB transferred (322.3 KiB decoded)",
+                        "/: /app.js 97.7 KiB -> 107.4 KiB"]
+
+
+def test_compare_ignores_growth_under_either_threshold():
+    # Over 5% but under 2 KiB.
+    assert compare(report(route(script=20_000)), report(route(script=21_500))) == []
+    # Over 2 KiB but under 5%.
+    assert compare(report(route(script=1_000_000)), report(route(script=1_040_000))) == []
+    # Shrinking is never a finding.
+    assert compare(report(route(script=100_000)), report(route(script=50_000))) == []
+
+
+def test_compare_thresholds_are_configurable():
+    baseline, current = report(route(script=20_000)), report(route(script=21_500))
+    assert len(compare(baseline, current, min_bytes=1024)) == 2
+    baseline, current = report(route(script=1_000_000)), report(route(script=1_040_000))
+    assert len(compare(baseline, current, bytes_threshold=0.01)) == 2
+
+
+def test_compare_reports_new_chunks_over_min_bytes():
+    old = {"/app.js": {"kind": "script", "transferred": 100_000}}
+    new = {**old, "/big.js": {"kind": "script", "transferred": 4096},
+           "/tiny.js": {"kind": "script", "transferred": 1024}}
+    findings = compare(report(route(chunks=old)), report(route(chunks=new)))
+    assert findings == ["/: new script /big.js 4.0 KiB"]
+
+
+def test_compare_reports_routes_that_stopped_loading_and_skips_new_routes():
+    findings = compare(report(route("/a")), report(route("/a", ok=False, error="net::ERR_ABORTED"), route("/b")))
+    assert findings == ["/a: loaded before, now net::ERR_ABORTED"]
+
+
+def test_compare_hydration_needs_both_the_ratio_and_min_ms():
+    assert compare(report(route(hydrated_ms=500.0)), report(route(hydrated_ms=800.0))) == \
+        ["/: hydrated at 500 ms -> 800 ms"]
+    # 50% slower but only 90 ms.
+    assert compare(report(route(hydrated_ms=180.0)), report(route(hydrated_ms=270.0))) == []
+    # 200 ms slower but only 20%.
+    assert compare(report(route(hydrated_ms=1000.0)), report(route(hydrated_ms=1200.0))) == []
+    # Missing on either side is not compared.
+    assert compare(report(route(hydrated_ms=None)), report(route(hydrated_ms=5000.0))) == []
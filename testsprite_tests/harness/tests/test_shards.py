@@ -0,0 +1,86 @@
+import pytest
+
+from harness import runner
+from harness.shards import merge_results, parse_shard, plan_shards, write_results
+
+
+def case(case_id):
+    return runner.TestCase(case_id, case_id, runner.TESTS_DIR / f"{case_id}_case.py")
+
+
+def result(case_id, status=runner.PASSED, duration=1.0):
+    return runner.TestResult(case(case_id), status, duration)
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_plan_shards_packs_longest_first_onto_the_least_loaded_shard():
+    cases = [case(f"TC00{n}") for n in range(1, 6)]
+    history = {"TC001": [50.0], "TC002": [40.0], "TC003": [30.0], "TC004": [20.0], "TC005": [10.0]}
+    plan = plan_shards(cases, 2, history)
+    assert [[c.id for c in shard.cases] for shard in plan] == [["TC001", "TC004", "TC005"], ["TC002", "TC003"]]
+    assert [shard.seconds for shard in plan] == [80.0, 70.0]
+
+
+def test_plan_shards_uses_the_median_of_history_and_of_known_cases_for_new_ones():
+    cases = [case("TC001"), case("TC002"), case("TC003")]
+    # TC001's one slow retry does not count; TC003 has no history and counts as the median, 10 s.
+    history = {"TC001": [10.0, 10.0, 90.0], "TC002": [10.0]}
+    plan = plan_shards(cases, 3, history)
+    assert sorted(shard.seconds for shard in plan) == [10.0, 10.0, 10.0]
+
+
+def test_plan_shards_covers_every_case_once_and_is_deterministic():
+    cases = [case(f"TC{n:03d}") for n in range(1, 17)]
+    plan = plan_shards(cases, 4, {})
+    ids = [c.id for shard in plan for c in shard.cases]
+    assert sorted(ids) == [c.id for c in cases]
+    assert [[c.id for c in s.cases] for s in plan_shards(list(reversed(cases)), 4, {})] == \
+        [[c.id for c in s.cases] for s in plan]
+
+
+def test_plan_shards_with_more_shards_than_cases_leaves_some_empty():
+    plan = plan_shards([case("TC001")], 3, {})
+    assert [len(shard.cases) for shard in plan] == [1, 0, 0]
+
+
+def write(tmp_path, label, results, wall_clock=1.0):
+    path = tmp_path / f"shard-{label.replace('/', '-')}.json"
+    write_results(path, results, shard=label, wall_clock=wall_clock)
+    return path
+
+
+def test_merge_results_combines_shards_in_case_order(tmp_path):
+    paths = [write(tmp_path, "1/2", [result("TC003"), result("TC001")], 5.0),
+             write(tmp_path, "2/2", [result("TC002", runner.FAILED)], 3.0)]
+    results, wall_clocks = merge_results(paths, 2, ["TC001", "TC002", "TC003"])
+    assert [(r.case.id, r.status) for r in results] == [
+        ("TC001", runner.PASSED), ("TC002", runner.FAILED), ("TC003", runner.PASSED)]
+    assert wall_clocks == {"1/2": 5.0, "2/2": 3.0}
+
+
+def test_merge_results_fails_on_a_missing_shard(tmp_path):
+    paths = [write(tmp_path, "1/3", [result("TC001")]), write(tmp_path, "3/3", [result("TC003")])]
+    with pytest.raises(ValueError, match="shard\\(s\\) 2 of 3"):
+        merge_results(paths, 3, ["TC001", "TC003"])
+
+
+def test_merge_results_fails_on_a_case_without_result(tmp_path):
+    paths = [write(tmp_path, "1/2", [result("TC001")]), write(tmp_path, "2/2", [])]
+    with pytest.raises(ValueError, match="no result for TC002"):
+        merge_results(paths, 2, ["TC001", "TC002"])
+
+
+def test_merge_results_fails_on_files_of_another_split(tmp_path):
+    paths = [write(tmp_path, "1/2", [result("TC001")]), write(tmp_path, "2/3", [result("TC002")])]
+    with pytest.raises(ValueError, match="2/3"):
+        merge_results(paths, 2, ["TC001", "TC002"])
+    unsharded = tmp_path / "all.json"
+    write_results(unsharded, [result("TC001")])
+    with pytest.raises(ValueError, match="run --shard"):
+        merge_results([unsharded], 1, ["TC001"])
@@ -0,0 +1,71 @@
+"""Mint NextAuth v4 session cookies for synthetic users.
+
+The Socket.IO middleware in ``src/lib/socket.ts`` only accepts connections
+carrying a ``next-auth.session-token`` it can decrypt with
+``NEXTAUTH_SECRET``. Logging hundreds of users in through ``/login`` would
+measure NextAuth rather than the socket server, so the benchmarks encrypt the
+token themselves the way ``next-auth/jwt`` ``encode()`` does: a ``dir`` /
+``A256GCM`` JWE keyed with HKDF-SHA256 of the secret.
+
+Needs the ``cryptography`` package (``pip install cryptography``).
+"""
+
+import base64
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+try:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+except ImportError:  # pragma: no cover - optional dependency
+    AESGCM = None
+
+SESSION_COOKIE = "next-auth.session-token"
+SECURE_SESSION_COOKIE = "__Secure-next-auth.session-token"
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # next-auth's default session lifetime
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _derive_key(secret: str, salt: str = "") -> bytes:
+    info = "NextAuth.js Generated Encryption Key" + (f" ({salt})" if salt else "")
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt.encode(), info=info.encode())
+    return hkdf.derive(secret.encode())
+
+
+def encode_session(claims: Dict[str, Any], secret: Optional[str] = None, *,
+                   max_age: int = DEFAULT_MAX_AGE) -> str:
+    """Return a JWE that ``getToken({ req, secret })`` decodes to ``claims``."""
+    if AESGCM is None:
+        raise RuntimeError("harness.tokens needs the 'cryptography' package: pip install cryptography")
+    secret = secret or os.environ.get("NEXTAUTH_SECRET")
+    if not secret:
+        raise RuntimeError("set NEXTAUTH_SECRET to the secret the server under test uses")
+    now = int(time.time())
+    payload = {**claims, "iat": now, "exp": now + max_age, "jti": str(uuid.uuid4())}
+    header = _b64url(json.dumps({"alg": "dir", "enc": "A256GCM"}, separators=(",", ":")).encode())
+    iv = os.urandom(12)
+    sealed = AESGCM(_derive_key(secret)).encrypt(iv, json.dumps(payload).encode(), header.encode("ascii"))
+    ciphertext, tag = sealed[:-16], sealed[-16:]
+    return ".".join([header, "", _b64url(iv), _b64url(ciphertext), _b64url(tag)])
+
+
+def session_cookie(user_id: str, *, name: str = "", couple_id: Optional[str] = None,
+                   role: Optional[str] = None, email: Optional[str] = None, secret: Optional[str] = None,
+                   secure: bool = False) -> str:
+    """``Cookie`` header value that signs a request or socket in as ``user_id``."""
+    claims: Dict[str, Any] = {"sub": user_id, "id": user_id, "name": name}
+    if couple_id:
+        claims["coupleId"] = couple_id
+    if role:
+        claims["role"] = role  # copied onto session.user.role by the jwt/session callbacks
+    if email:
+        claims["email"] = email  # next-auth's default session exposes it as session.user.email
+    cookie = SECURE_SESSION_COOKIE if secure else SESSION_COOKIE
+    return f"{cookie}={encode_session(claims, secret)}"
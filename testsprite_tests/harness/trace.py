@@ -0,0 +1,276 @@
+"""Per-step timing traces: JSON lines per step plus an aggregate summary.
+
+While a :class:`TraceCollector` is active (the runner activates one per case
+and writes it out with ``--trace DIR``), every :class:`harness.steps.Steps`
+created in that case records, for each step, its phase timings (locator resolution, actionability
+wait, the click/fill itself, the awaited API response or Socket.IO ack, and
+any navigation it caused), the network requests the page started and the
+Socket.IO frames it saw.
+
+Requests and frames belong to the step that was running when they started,
+or to the last finished step if none was (background fetches after a
+click); anything before the first step belongs to a synthetic ``load``
+step. ``summary.json`` aggregates the lines by case, step, phase and API
+route, and :func:`compare` diffs two summaries to flag regressions between
+builds. Behind :mod:`harness.proxy`, requests also record the fault they met
+and ``summary.json`` totals the injected delay per route.
+"""
+
+import json
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from .frames import SocketEvent
+from .stats import summarize
+
+STEPS_FILE = "steps.jsonl"
+SUMMARY_FILE = "summary.json"
+# Set by harness.proxy on responses it delayed or replaced.
+FAULT_HEADER = "x-harness-fault"
+FAULT_MS_HEADER = "x-harness-fault-ms"
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|c[a-z0-9]{24,}|[0-9a-f]{24,})$", re.I)
+
+
+def route_of(url: str) -> str:
+    """``/api/tasks/clx123.../complete?x=1`` -> ``/api/tasks/:id/complete``."""
+    path = urlparse(url).path or "/"
+    return "/".join(":id" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+
+
+@dataclass
+class RequestTrace:
+    method: str
+    url: str
+    route: str
+    resource_type: str
+    start_ms: float
+    duration_ms: Optional[float] = None
+    status: Optional[int] = None
+    failure: Optional[str] = None
+    server_ms: Optional[float] = None  # request sent -> first response byte
+    fault: Optional[str] = None        # what harness.proxy injected, if it sat in between
+    fault_ms: Optional[float] = None
+
+
+@dataclass
+class StepTrace:
+    index: int
+    action: str
+    target: str
+    start_ms: float
+    duration_ms: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    url: str = ""
+    error: Optional[str] = None
+    requests: List[RequestTrace] = field(default_factory=list)
+    socket: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class PageTrace:
+    """Network and Socket.IO activity of one page, bucketed into steps."""
+
+    def __init__(self, page: async_api.Page):
+        self.page = page
+        self.origin = time.perf_counter()
+        self.steps: List[StepTrace] = [StepTrace(0, "load", "", 0.0)]
+        self._running: Optional[StepTrace] = None
+        self._pending: Dict[async_api.Request, RequestTrace] = {}
+        page.on("request", self._on_request)
+        page.on("response", self._on_response)
+        page.on("requestfinished", lambda request: self._on_done(request, None))
+        page.on("requestfailed", lambda request: self._on_done(request, request.failure or "failed"))
+
+    def _ms(self, at: Optional[float] = None) -> float:
+        return round(((at if at is not None else time.perf_counter()) - self.origin) * 1000, 3)
+
+    @property
+    def current(self) -> StepTrace:
+        return self._running or self.steps[-1]
+
+    def begin(self, action: str, target: str) -> StepTrace:
+        step = StepTrace(len(self.steps), action, target, self._ms())
+        self.steps.append(step)
+        self._running = step
+        return step
+
+    def end(self, step: StepTrace, phases: Dict[str, float], error: Optional[str] = None) -> None:
+        step.duration_ms = round(self._ms() - step.start_ms, 3)
+        step.phases = {name: round(seconds * 1000, 3) for name, seconds in phases.items()}
+        step.url = self.page.url
+        step.error = error
+        self._running = None
+
+    def socket_event(self, event: SocketEvent) -> None:
+        self.current.socket.append({"name": event.name, "direction": event.direction, "at_ms": self._ms(event.at)})
+
+    def _on_request(self, request: async_api.Request) -> None:
+        trace = RequestTrace(request.method, request.url, route_of(request.url), request.resource_type, self._ms())
+        self._pending[request] = trace
+        self.current.requests.append(trace)
+
+    def _on_response(self, response: async_api.Response) -> None:
+        trace = self._pending.get(response.request)
+        if trace is not None:
+            trace.status = response.status
+            trace.fault = response.headers.get(FAULT_HEADER)
+            if trace.fault:
+                trace.fault_ms = float(response.headers.get(FAULT_MS_HEADER, 0))
+
+    def _on_done(self, request: async_api.Request, failure: Optional[str]) -> None:
+        trace = self._pending.pop(request, None)
+        if trace is not None:
+            trace.duration_ms = round(self._ms() - trace.start_ms, 3)
+            trace.failure = failure
+            timing = request.timing
+            if timing.get("requestStart", -1) >= 0 and timing.get("responseStart", -1) >= 0:
+                trace.server_ms = round(timing["responseStart"] - timing["requestStart"], 3)
+
+
+@dataclass
+class TraceCollector:
+    """Collects the page traces of one case."""
+
+    case: str
+    pages: List[PageTrace] = field(default_factory=list)
+
+    def attach(self, page: async_api.Page) -> PageTrace:
+        trace = PageTrace(page)
+        self.pages.append(trace)
+        return trace
+
+    def lines(self, **extra: Any) -> Iterator[Dict[str, Any]]:
+        for page_no, trace in enumerate(self.pages):
+            for step in trace.steps:
+                if step.action == "load" and not step.requests and not step.socket:
+                    continue
+                yield {"case": self.case, "page": page_no, **extra, **asdict(step)}
+
+
+CURRENT_TRACE: ContextVar[Optional[TraceCollector]] = ContextVar("harness_trace", default=None)
+
+
+@contextmanager
+def collecting(case: str) -> Iterator[TraceCollector]:
+    """Make every ``Steps`` created in this task record into a new collector."""
+    collector = TraceCollector(case)
+    token = CURRENT_TRACE.set(collector)
+    try:
+        yield collector
+    finally:
+        CURRENT_TRACE.reset(token)
+
+
+class TraceWriter:
+    """Append step lines to ``DIR/steps.jsonl`` and build ``DIR/summary.json``."""
+
+    def __init__(self, directory: Path, **run_info: Any):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.run_info = run_info
+        self.lines: List[Dict[str, Any]] = []
+        self.cases: Dict[str, Dict[str, Any]] = {}
+        (self.directory / STEPS_FILE).write_text("")
+
+    def write(self, collector: TraceCollector, status: str, duration: float) -> None:
+        self.cases[collector.case] = {"status": status, "duration_ms": round(duration * 1000, 3)}
+        with open(self.directory / STEPS_FILE, "a") as fh:
+            for line in collector.lines():
+                self.lines.append(line)
+                fh.write(json.dumps(line) + "\n")
+
+    def close(self) -> Dict[str, Any]:
+        summary = {"run": self.run_info, **summarize_lines(self.lines, self.cases)}
+        with open(self.directory / SUMMARY_FILE, "w") as fh:
+            json.dump(summary, fh, indent=2)
+        return summary
+
+
+def summarize_lines(lines: List[Dict[str, Any]], cases: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Aggregate step lines by case, step, phase, API route and Socket.IO event."""
+    case_steps: Dict[str, float] = defaultdict(float)
+    step_times: Dict[str, List[float]] = defaultdict(list)
+    phases: Dict[str, float] = defaultdict(float)
+    routes: Dict[str, List[float]] = defaultdict(list)
+    route_errors: Dict[str, int] = defaultdict(int)
+    resources: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "total_ms": 0.0})
+    socket_events: Dict[str, int] = defaultdict(int)
+    faults: Dict[str, Dict[str, float]] = defaultdict(lambda: {"requests": 0, "injected_ms": 0.0})
+
+    for line in lines:
+        case_steps[line["case"]] += line["duration_ms"]
+        if line["action"] != "load":
+            step_times[f"{line['action']} {line['target']}"].append(line["duration_ms"] / 1000)
+        for name, ms in line["phases"].items():
+            phases[name] += ms
+        for request in line["requests"]:
+            if request.get("fault"):
+                bucket = faults[f"{request['method']} {request['route']}"]
+                bucket["requests"] += 1
+                bucket["injected_ms"] = round(bucket["injected_ms"] + (request.get("fault_ms") or 0.0), 3)
+            if request["route"].startswith("/api/"):
+                key = f"{request['method']} {request['route']}"
+                if request["duration_ms"] is not None:
+                    routes[key].append(request["duration_ms"] / 1000)
+                if request["failure"] or (request["status"] or 0) >= 400:
+                    route_errors[key] += 1
+            else:
+                bucket = resources[request["resource_type"]]
+                bucket["count"] += 1
+                bucket["total_ms"] = round(bucket["total_ms"] + (request["duration_ms"] or 0.0), 3)
+        for event in line["socket"]:
+            socket_events[f"{event['direction']} {event['name']}"] += 1
+
+    def by_total(table: Dict[str, List[float]]) -> Dict[str, Dict[str, Any]]:
+        rows = {key: {**summarize(values), "total_ms": round(sum(values) * 1000, 3)} for key, values in table.items()}
+        return dict(sorted(rows.items(), key=lambda item: -item[1]["total_ms"]))
+
+    api = by_total(routes)
+    for key, count in route_errors.items():
+        api.setdefault(key, {"count": 0, "total_ms": 0.0})["errors"] = count
+
+    case_rows = {}
+    for case, total in sorted(case_steps.items(), key=lambda item: -item[1]):
+        case_rows[case] = {**(cases or {}).get(case, {}), "step_ms": round(total, 3)}
+    return {
+        "cases": case_rows,
+        "steps": by_total(step_times),
+        "phases_ms": {name: round(ms, 3) for name, ms in sorted(phases.items(), key=lambda item: -item[1])},
+        "api_routes": api,
+        "resources": dict(resources),
+        "socket_events": dict(sorted(socket_events.items())),
+        "faults": dict(sorted(faults.items(), key=lambda item: -item[1]["injected_ms"])),
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, threshold: float = 0.2,
+            min_ms: float = 50.0) -> List[str]:
+    """Lines describing cases and API routes that got slower by more than ``threshold``.
+
+    Differences under ``min_ms`` are ignored so that noise on fast steps does
+    not flag a regression.
+    """
+    findings = []
+
+    def check(kind: str, name: str, before: float, after: float) -> None:
+        if after - before >= min_ms and after > before * (1 + threshold):
+            findings.append(f"{kind:<5} {name}: {before:.0f} ms -> {after:.0f} ms (+{(after / before - 1) * 100 if before else 100:.0f}%)")
+
+    for case, row in current.get("cases", {}).items():
+        old = baseline.get("cases", {}).get(case)
+        if old:
+            check("case", case, old.get("duration_ms", old["step_ms"]), row.get("duration_ms", row["step_ms"]))
+    for route, row in current.get("api_routes", {}).items():
+        old = baseline.get("api_routes", {}).get(route)
+        if old and "p95_ms" in old and "p95_ms" in row:
+            check("route", f"{route} p95", old["p95_ms"], row["p95_ms"])
+    return findings